@@ -0,0 +1,60 @@
+#This file, bench_ats_engine.py, benchmarks the vectorized ATS engine 
+#(VectorStore.ats_score_matrix) against calling _calculate_ats_score for every pair.
+#To run this file, ensure you are in the project root:
+#python benchmarks/bench_ats_engine.py --resumes 1000 --jobs 100
+import argparse
+import random
+import sys
+import time
+sys.path.append('.')
+import numpy as np
+from src.database.job_analyzer import JobRequirements
+from src.database.vector_store import VectorStore
+
+SKILLS = ['python', 'java', 'sql', 'aws', 'docker', 'kubernetes', 'react', 'spark',
+          'terraform', 'pytorch', 'tensorflow', 'postgresql', 'redis', 'kafka', 'go',
+          'javascript', 'google cloud', 'node.js', 'c++', 'machine learning']
+TITLES = ['Backend Engineer', 'Data Engineer', 'ML Engineer', 'Frontend Developer',
+          'Platform Engineer', 'Data Scientist', 'Full Stack Developer']
+FILLER = ['built', 'scalable', 'services', 'with', 'team', 'led', 'migration', 'of',
+          'pipelines', 'using', 'improved', 'latency', 'by', 'designed', 'and', 'the']
+
+def make_jobs(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [JobRequirements(
+        required_skills=rng.sample(SKILLS, 5), preferred_skills=rng.sample(SKILLS, 2),
+        experience_years=None, experience_level='not specified', education_requirements=[],
+        certifications=[], responsibilities=[], company_info={}, salary_range=None,
+        job_title=rng.choice(TITLES), industry='technology'
+    ) for _ in range(n)]
+
+def make_resumes(n: int, words: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [' '.join([rng.choice(TITLES)] + [rng.choice(SKILLS) if rng.random() < 0.1 else rng.choice(FILLER)
+                                             for _ in range(words)]) for _ in range(n)]
+
+def run(n_resumes: int, n_jobs: int, words: int, loop_sample: int) -> None:
+    store = VectorStore(model_name='hashing', cache_dir=None, skill_matrix_dir=None)
+    jobs, resumes = make_jobs(n_jobs), make_resumes(n_resumes, words)
+    started = time.perf_counter()
+    matrix = store.ats_score_matrix(resumes, jobs)
+    vectorized = time.perf_counter() - started
+    #the pairwise loop is timed on a sample of resumes and scaled up
+    sample = resumes[:loop_sample]
+    started = time.perf_counter()
+    looped = np.array([[store._calculate_ats_score(resume, job) for job in jobs] for resume in sample])
+    per_pair = (time.perf_counter() - started) / (len(sample) * n_jobs)
+    pairs = n_resumes * n_jobs
+    print(f"{n_resumes} resumes x {n_jobs} jobs ({pairs} pairs, ~{words} words per resume)")
+    print(f"pairwise loop: {per_pair * pairs:.2f}s (estimated from {len(sample)} resumes)")
+    print(f"vectorized:    {vectorized:.2f}s  speed-up {per_pair * pairs / vectorized:.0f}x")
+    print(f"max |difference| on the sample: {np.abs(matrix[:len(sample)] - looped).max():.2e}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vectorized ATS scoring benchmark")
+    parser.add_argument('--resumes', type=int, default=1000)
+    parser.add_argument('--jobs', type=int, default=100)
+    parser.add_argument('--words', type=int, default=400)
+    parser.add_argument('--loop-sample', type=int, default=100)
+    args = parser.parse_args()
+    run(args.resumes, args.jobs, args.words, args.loop_sample)
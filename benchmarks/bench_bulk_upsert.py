@@ -0,0 +1,47 @@
+#This file, bench_bulk_upsert.py, benchmarks VectorStore.upsert_documents 
+#(bulk ingest throughput, first ingest vs. re-ingest of unchanged documents).
+#To run this file, ensure you are in the project root:
+#python benchmarks/bench_bulk_upsert.py --documents 20000 --chunk-sizes 32,256,2048
+#note: uses the offline "hashing" encoder by default so no model download is needed;
+#pass --model all-MiniLM-L6-v2 to measure the neural encoder instead
+import argparse
+import random
+import sys
+sys.path.append('.')
+from src.database.vector_store import VectorStore
+
+SKILLS = ['python', 'java', 'sql', 'aws', 'docker', 'kubernetes', 'react', 'spark',
+          'terraform', 'pytorch', 'tensorflow', 'postgresql', 'redis', 'kafka', 'go']
+VERBS = ['built', 'designed', 'maintained', 'scaled', 'migrated', 'optimized', 'led']
+
+def make_documents(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    documents = []
+    for i in range(n):
+        text = (f"{rng.choice(VERBS)} {rng.choice(['services', 'pipelines', 'dashboards', 'models'])} "
+                f"using {', '.join(rng.sample(SKILLS, 3))} for team {i}")
+        documents.append({
+            'id': VectorStore.make_item_id('resume_section', 'experience', f"resume-{i}"),
+            'text': text,
+            'metadata': {'type': 'resume_section', 'section': 'experience', 'resume_id': f"resume-{i}"}
+        })
+    return documents
+
+def run(n_documents: int, chunk_sizes, model_name: str, backend: str) -> None:
+    documents = make_documents(n_documents)
+    print(f"{'chunk':>7} {'pass':>10} {'inserted':>9} {'skipped':>8} {'seconds':>8} {'docs/s':>10}")
+    for chunk_size in chunk_sizes:
+        store = VectorStore(model_name=model_name, cache_dir=None, index_backend=backend)
+        for label in ('ingest', 're-ingest'):
+            stats = store.upsert_documents(documents, chunk_size=chunk_size)
+            print(f"{chunk_size:>7} {label:>10} {stats['inserted']:>9} {stats['skipped']:>8} "
+                  f"{stats['seconds']:>8.2f} {stats['docs_per_second']:>10.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk upsert throughput benchmark")
+    parser.add_argument('--documents', type=int, default=20000)
+    parser.add_argument('--chunk-sizes', default='32,256,2048')
+    parser.add_argument('--model', default='hashing')
+    parser.add_argument('--backend', default='flat')
+    args = parser.parse_args()
+    run(args.documents, [int(size) for size in args.chunk_sizes.split(',')], args.model, args.backend)
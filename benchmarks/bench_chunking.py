@@ -0,0 +1,69 @@
+#This file, bench_chunking.py, benchmarks length-bucketed chunked encoding 
+#(VectorStore.embed_sections) against encoding whole sections in caller order.
+#To run this file, ensure you are in the project root:
+#python benchmarks/bench_chunking.py --model all-MiniLM-L6-v2 --resumes 200
+#note: padding only costs time in transformer encoders. With the default offline "hashing" 
+#encoder the timings are padding-agnostic, so compare the padded-token counts, which is 
+#the work a transformer would do (useful tokens / padded tokens = padding efficiency)
+import argparse
+import random
+import sys
+import time
+sys.path.append('.')
+import numpy as np
+from src.database.vector_store import VectorStore
+from src.models.chunking import length_sorted_batches, padded_tokens
+
+WORDS = ['built', 'scalable', 'services', 'python', 'aws', 'team', 'led', 'migration', 'data',
+         'pipelines', 'using', 'improved', 'latency', 'designed', 'kubernetes', 'customers']
+
+def make_sections(n_resumes: int, seed: int = 0):
+    """Per resume: one long experience section and several short bullets/sections."""
+    rng = random.Random(seed)
+    sentence = lambda: ' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + '.'
+    sections = []
+    for _ in range(n_resumes):
+        sections.append(' '.join(sentence() for _ in range(rng.randint(20, 40)))) #experience
+        sections.extend(sentence() for _ in range(rng.randint(4, 8))) #summary, skills, awards...
+    return sections
+
+def run(n_resumes: int, model_name: str, batch_size: int) -> None:
+    sections = make_sections(n_resumes)
+    store = VectorStore(model_name=model_name, cache_dir=None, skill_matrix_dir=None)
+    encoder = store.embedding_model
+    window = encoder.max_tokens or 256
+    lengths = [encoder.count_tokens(section) for section in sections]
+    total_tokens = sum(lengths)
+    #baseline: whole sections in caller order; tokens past the window are truncated
+    caller_order = [np.arange(start, min(start + batch_size, len(sections)))
+                    for start in range(0, len(sections), batch_size)]
+    truncated = [min(length, window) for length in lengths]
+    started = time.perf_counter()
+    for batch in caller_order:
+        encoder.encode([sections[i] for i in batch], batch_size=batch_size)
+    baseline_seconds = time.perf_counter() - started
+    baseline_padded = padded_tokens(truncated, caller_order)
+    #chunked + length-bucketed (fresh store so the embedding cache does not help)
+    store = VectorStore(model_name=model_name, cache_dir=None, skill_matrix_dir=None)
+    store._embedding_model = encoder
+    started = time.perf_counter()
+    store.embed_sections(sections, max_tokens=window, batch_size=batch_size)
+    chunked_seconds = time.perf_counter() - started
+    stats = store.get_metrics()['chunking']
+    print(f"{len(sections)} sections, {total_tokens} tokens, window {window}, batch {batch_size}")
+    print(f"{'mode':>18} {'tokens kept':>12} {'padded tokens':>14} {'efficiency':>11} {'seconds':>8} {'tokens/s':>10}")
+    for label, kept, padded, seconds in (
+        ('caller order', sum(truncated), baseline_padded, baseline_seconds),
+        ('chunked+bucketed', stats['tokens'], stats['padded_tokens'], chunked_seconds)
+    ):
+        print(f"{label:>18} {kept:>12} {padded:>14} {kept / padded:>11.2f} {seconds:>8.2f} {kept / seconds:>10.0f}")
+    print(f"padding-based tokens/s gain (useful tokens per padded token): "
+          f"{(stats['tokens'] / stats['padded_tokens']) / (sum(truncated) / baseline_padded):.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chunked, length-bucketed section encoding benchmark")
+    parser.add_argument('--resumes', type=int, default=200)
+    parser.add_argument('--model', default='hashing')
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+    run(args.resumes, args.model, args.batch_size)
@@ -0,0 +1,72 @@
+#This file, bench_near_duplicates.py, benchmarks reuse on feeds with reposted documents:
+#VectorStore.analyze_job vs analyze_job_description for every posting (only exact reposts are
+#reused; an edited repost is analyzed again), and VectorStore.embed_resumes vs generate_embeddings
+#for resumes that come back with small edits. The saving is the skipped work minus the MinHash
+#cost (~0.4 ms per document here), so it grows with the model: small for the hashing encoder,
+#large for a sentence-transformers model.
+#To run this file, ensure you are in the project root:
+#python benchmarks/bench_near_duplicates.py --postings 2000 --repost-rate 0.4 --model all-MiniLM-L6-v2
+import argparse
+import random
+import sys
+import time
+sys.path.append('.')
+from src.database.vector_store import VectorStore
+
+SKILLS = ['Python', 'Java', 'SQL', 'AWS', 'Docker', 'Kubernetes', 'React', 'Spark',
+          'Terraform', 'PyTorch', 'PostgreSQL', 'Redis', 'Go', 'JavaScript', 'Node.js']
+TITLES = ['Backend Engineer', 'Data Engineer', 'ML Engineer', 'Frontend Developer', 'Platform Engineer']
+FILLER = ['build', 'scalable', 'services', 'with', 'our', 'team', 'own', 'pipelines', 'using',
+          'improve', 'latency', 'design', 'and', 'the', 'customers', 'product', 'roadmap', 'data']
+
+def make_posting(rng: random.Random) -> str:
+    body = ' '.join(rng.choice(FILLER) for _ in range(150))
+    return (f"{rng.choice(['Senior', 'Junior', ''])} {rng.choice(TITLES)}. "
+            f"Required: {rng.randint(1, 8)}+ years of {', '.join(rng.sample(SKILLS, 4))}. "
+            f"Preferred: {', '.join(rng.sample(SKILLS, 2))}. {body}")
+
+def make_feed(n: int, repost_rate: float, seed: int = 0):
+    rng = random.Random(seed)
+    feed = []
+    for _ in range(n):
+        if feed and rng.random() < repost_rate / 2:
+            feed.append(rng.choice(feed)) #an exact repost
+        elif feed and rng.random() < repost_rate:
+            #an edited repost: same posting with a changed location / date line
+            feed.append(rng.choice(feed) + f" Location: office {rng.randint(1, 50)}. Posted {rng.randint(1, 28)} days ago.")
+        else:
+            feed.append(make_posting(rng))
+    return feed
+
+def timed(function, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        function(item)
+    return time.perf_counter() - started
+
+def run(n_postings: int, repost_rate: float, model: str) -> None:
+    feed = make_feed(n_postings, repost_rate)
+    plain = VectorStore(model_name=model, cache_dir=None, skill_matrix_dir=None, near_duplicate_threshold=None)
+    dedup = VectorStore(model_name=model, cache_dir=None, skill_matrix_dir=None)
+    plain_seconds = timed(plain.analyze_job, feed)
+    dedup_seconds = timed(dedup.analyze_job, feed)
+    stats = dedup.job_duplicates.get_stats()
+    print(f"{n_postings} postings, repost rate {repost_rate:.0%}, model {model}")
+    print(f"analyze every posting:     {plain_seconds:.2f}s")
+    print(f"with exact repost reuse:   {dedup_seconds:.2f}s  speed-up {plain_seconds / dedup_seconds:.1f}x")
+    print(f"reused {stats['exact_hits']} analyses")
+    #the same feed as resumes, embedded one at a time as they arrive
+    plain_seconds = timed(lambda text: plain.generate_embeddings([text]), feed)
+    dedup_seconds = timed(lambda text: dedup.embed_resumes([text]), feed)
+    stats = dedup.resume_duplicates.get_stats()
+    print(f"embed every resume:        {plain_seconds:.2f}s")
+    print(f"with near-duplicate reuse: {dedup_seconds:.2f}s  speed-up {plain_seconds / dedup_seconds:.1f}x")
+    print(f"reused {stats['duplicates']} embeddings")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Near-duplicate job posting reuse benchmark")
+    parser.add_argument('--postings', type=int, default=2000)
+    parser.add_argument('--repost-rate', type=float, default=0.4)
+    parser.add_argument('--model', default='hashing')
+    args = parser.parse_args()
+    run(args.postings, args.repost_rate, args.model)
@@ -0,0 +1,62 @@
+#This file, bench_recommend_jobs.py, benchmarks VectorStore.recommend_jobs 
+#(candidate mode: one resume against a catalogue of job postings).
+#To run this file, ensure you are in the project root:
+#python benchmarks/bench_recommend_jobs.py --jobs 50000 --queries 20
+#note: uses the offline "hashing" encoder by default so no model download is needed;
+#building the index (embedding every posting) is timed separately from the queries
+import argparse
+import random
+import sys
+import time
+sys.path.append('.')
+from src.database.job_analyzer import JobRequirements
+from src.database.vector_store import VectorStore
+
+SKILLS = ['python', 'java', 'sql', 'aws', 'docker', 'kubernetes', 'react', 'spark',
+          'terraform', 'pytorch', 'tensorflow', 'postgresql', 'redis', 'kafka', 'go',
+          'javascript', 'typescript', 'azure', 'gcp', 'django', 'flask', 'mongodb']
+TITLES = ['Backend Engineer', 'Data Engineer', 'ML Engineer', 'Frontend Developer',
+          'Platform Engineer', 'Data Scientist', 'Full Stack Developer']
+LEVELS = ['entry', 'mid', 'senior', 'executive', 'not specified']
+
+def make_jobs(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(n):
+        skills = rng.sample(SKILLS, 6)
+        jobs.append(JobRequirements(
+            required_skills=skills[:4], preferred_skills=skills[4:],
+            experience_years=rng.choice([None, 1, 2, 3, 5, 8]), experience_level=rng.choice(LEVELS),
+            education_requirements=[], certifications=[], responsibilities=[], company_info={},
+            salary_range=None, job_title=rng.choice(TITLES), industry='technology'
+        ))
+    return jobs
+
+def make_resumes(n: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [f"{rng.choice(TITLES)} with {rng.randint(1, 12)} years of experience using "
+            f"{', '.join(rng.sample(SKILLS, 5))}." for _ in range(n)]
+
+def run(n_jobs: int, n_queries: int, k: int, model_name: str) -> None:
+    store = VectorStore(model_name=model_name, cache_dir=None)
+    jobs = make_jobs(n_jobs)
+    started = time.perf_counter()
+    index = store.build_job_index(jobs)
+    print(f"built index of {n_jobs} jobs in {time.perf_counter() - started:.1f}s")
+    latencies = []
+    for resume in make_resumes(n_queries):
+        started = time.perf_counter()
+        store.recommend_jobs(resume, index, k=k)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    print(f"recommend_jobs k={k}: median {latencies[len(latencies) // 2]:.1f} ms, "
+          f"max {latencies[-1]:.1f} ms over {n_queries} resumes")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Candidate mode (recommend_jobs) latency benchmark")
+    parser.add_argument('--jobs', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--model', default='hashing')
+    args = parser.parse_args()
+    run(args.jobs, args.queries, args.k, args.model)
@@ -0,0 +1,42 @@
+#This file, bench_sharded_embedding.py, measures the scaling of sharded multi-process 
+#embedding (sharded_embedding.embed_sharded) over 1, 2, 4, 8 and 16 workers.
+#To run this file, ensure you are in the project root:
+#python benchmarks/bench_sharded_embedding.py --model all-MiniLM-L6-v2 --texts 50000
+#note: efficiency = speed-up / workers; startup (spawning + model loads) is reported 
+#separately because it is paid once per run, not per text
+import argparse
+import os
+import random
+import sys
+import tempfile
+sys.path.append('.')
+from src.database.sharded_embedding import embed_sharded
+
+WORDS = ['built', 'scalable', 'services', 'python', 'aws', 'team', 'led', 'migration', 'data',
+         'pipelines', 'using', 'improved', 'latency', 'designed', 'kubernetes', 'customers']
+
+def run(n_texts: int, model_name: str, worker_counts, shard_size: int) -> None:
+    rng = random.Random(0)
+    texts = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 40))) for _ in range(n_texts)]
+    print(f"{n_texts} texts, model {model_name}, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'threads':>8} {'startup s':>10} {'encode s':>9} {'texts/s':>9} {'speed-up':>9} {'efficiency':>11}")
+    baseline = None
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in worker_counts:
+            stats = {}
+            embed_sharded(texts, model_name, os.path.join(directory, f'out_{workers}.npy'),
+                          workers=workers, shard_size=shard_size, stats=stats)
+            baseline = baseline or stats['texts_per_second']
+            speed_up = stats['texts_per_second'] / baseline
+            print(f"{workers:>8} {stats['threads_per_worker']:>8} {stats['startup_seconds']:>10.1f} "
+                  f"{stats['encode_seconds']:>9.2f} {stats['texts_per_second']:>9.0f} "
+                  f"{speed_up:>9.2f} {speed_up / workers * worker_counts[0]:>11.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sharded multi-process embedding scaling benchmark")
+    parser.add_argument('--texts', type=int, default=50000)
+    parser.add_argument('--model', default='hashing')
+    parser.add_argument('--workers', default='1,2,4,8,16')
+    parser.add_argument('--shard-size', type=int, default=512)
+    args = parser.parse_args()
+    run(args.texts, args.model, [int(count) for count in args.workers.split(',')], args.shard_size)
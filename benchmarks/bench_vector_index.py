@@ -0,0 +1,71 @@
+#This file, bench_vector_index.py, benchmarks recall and latency of the IVF 
+#index in src/database/vector_index.py against exact (flat) search.
+#To run this file, ensure you are in the project root:
+#python benchmarks/bench_vector_index.py --sizes 10000,100000,1000000
+#note: vectors are synthetic clustered unit vectors (no embedding model needed)
+import argparse
+import sys
+import time
+sys.path.append('.')
+import numpy as np
+from src.database.vector_index import FlatIndex, IVFIndex
+from src.models.embeddings import l2_normalize
+
+def make_vectors(n: int, dim: int, n_queries: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(10, n // 200), dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, len(centers), size=n)]
+    vectors += 1.0 * rng.normal(size=(n, dim)).astype(np.float32)
+    queries = centers[rng.integers(0, len(centers), size=n_queries)]
+    queries = queries + 1.0 * rng.normal(size=(n_queries, dim)).astype(np.float32)
+    return l2_normalize(vectors), l2_normalize(queries)
+
+def timed_search(index, queries, k, **kwargs):
+    start = time.perf_counter()
+    results = [index.search(query.reshape(1, -1), k, **kwargs)[0] for query in queries]
+    elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    return results, elapsed_ms
+
+def recall_at_k(approximate, exact) -> float:
+    return float(np.mean([
+        len({i for i, _ in a} & {i for i, _ in e}) / max(1, len(e)) for a, e in zip(approximate, exact)
+    ]))
+
+def run(sizes, dim, n_queries, k, nprobes, storage_dtype) -> None:
+    print(f"{'vectors':>10} {'method':>14} {'build s':>9} {'ms/query':>9} {'recall@' + str(k):>10}")
+    for n in sizes:
+        vectors, queries = make_vectors(n, dim, n_queries)
+        ids = [str(i) for i in range(n)]
+        start = time.perf_counter()
+        flat = FlatIndex(storage_dtype=storage_dtype)
+        flat.add(ids, vectors)
+        flat_build = time.perf_counter() - start
+        exact, flat_ms = timed_search(flat, queries, k)
+        print(f"{n:>10} {'flat (exact)':>14} {flat_build:>9.2f} {flat_ms:>9.3f} {1.0:>10.3f}")
+        start = time.perf_counter()
+        ivf = IVFIndex(storage_dtype=storage_dtype, min_train_size=min(n, 2000))
+        ivf.add(ids, vectors)
+        ivf_build = time.perf_counter() - start
+        for nprobe in nprobes:
+            approximate, ivf_ms = timed_search(ivf, queries, k, nprobe=nprobe)
+            label = f"ivf nprobe={nprobe}"
+            print(f"{n:>10} {label:>14} {ivf_build:>9.2f} {ivf_ms:>9.3f} "
+                  f"{recall_at_k(approximate, exact):>10.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="IVF vs exact search benchmark")
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    parser.add_argument('--dim', type=int, default=384) #all-MiniLM-L6-v2 dimension
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--nprobe', default='4,8,16,32')
+    parser.add_argument('--storage-dtype', default='float32')
+    args = parser.parse_args()
+    run(
+        sizes=[int(size) for size in args.sizes.split(',')],
+        dim=args.dim,
+        n_queries=args.queries,
+        k=args.k,
+        nprobes=[int(nprobe) for nprobe in args.nprobe.split(',')],
+        storage_dtype=args.storage_dtype
+    )
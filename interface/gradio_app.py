@@ -0,0 +1,239 @@
+"""
+gradio_app.py
+Gradio web interface: upload a resume PDF, paste a job description, and watch
+the analysis fill in stage by stage.
+
+analyze_resume_stream is a generator that yields a snapshot of the results
+after every stage, and Gradio streams each yield to the page (a generator
+event handler), so the user sees the first stage after the time of the first
+stage instead of the time of the whole analysis. Stages, in order of how soon
+they can finish:
+1. extraction: PDFExtractor stats (pages, characters)
+2. sections: TextProcessor + SectionParser
+3. ats: keyword ATS score (lexical, no model call)
+4. skills: skill matches and overall score (VectorStore.match_resume_to_job,
+   the first stage that uses the embedding model)
+5. recommendations: match recommendations plus best practices from the
+   knowledge base
+
+The embedding model and the knowledge base are warmed up in the background
+when the app starts, so the first request does not pay for loading them.
+gradio itself is only imported by build_interface, which keeps the
+generator usable (and testable) without it.
+
+To run this file, ensure you are in the project root:
+python -m interface.gradio_app --model all-MiniLM-L6-v2
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from src.database.knowledge_base import KnowledgeBase
+from src.database.vector_store import VectorStore, get_vector_store
+from src.parser.pdf_extractor import PDFExtractor
+from src.parser.section_parser import SectionParser
+from src.parser.text_processor import TextProcessor
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('extraction', 'sections', 'ats', 'skills', 'recommendations')
+#budget for the hybrid knowledge base query; the dense part is skipped when it would not fit
+BEST_PRACTICES_BUDGET_MS = 200.0
+
+pdf_extractor = PDFExtractor()
+text_processor = TextProcessor()
+section_parser = SectionParser()
+
+
+def empty_state() -> Dict[str, Any]:
+    """What the page shows before any stage has finished."""
+    return {
+        'stage': None,
+        'status': 'Waiting for a resume...',
+        'extraction': None,
+        'sections': None,
+        'ats_score': None,
+        'overall_score': None,
+        'skill_matches': None,
+        'recommendations': None,
+        'error': None,
+        'stage_seconds': {}
+    }
+
+
+def _read_upload(resume_file: Union[str, bytes, Any]) -> Dict[str, Any]:
+    """PDFExtractor result for a Gradio upload: a file path, raw bytes or a file object."""
+    if isinstance(resume_file, bytes):
+        return pdf_extractor.extract_from_bytes(resume_file)
+    path = resume_file if isinstance(resume_file, str) else getattr(resume_file, 'name', '')
+    with open(path, 'rb') as file:
+        return pdf_extractor.extract_from_bytes(file.read(), os.path.basename(path))
+
+
+def skill_match_rows(match: Any) -> List[List[Any]]:
+    """Table rows (skill, requirement, match type, similarity, resume skill) of a ResumeJobMatch."""
+    rows = [[result.skill, result.job_requirement, result.match_type, round(float(result.similarity_score), 2),
+             result.resume_text] for result in match.matching_skills]
+    rows += [[skill, 'required', 'missing', 0.0, ''] for skill in match.missing_skills]
+    return rows
+
+
+def format_recommendations(recommendations: List[str], best_practices: List[str]) -> str:
+    """Markdown for the recommendations panel."""
+    lines = [f"- {recommendation}" for recommendation in recommendations] or ["- No changes needed."]
+    if best_practices:
+        lines += ['', '**Best practices**', ''] + [f"- {practice}" for practice in best_practices]
+    return '\n'.join(lines)
+
+
+def analyze_resume_stream(
+    resume_file: Union[str, bytes, Any],
+    job_description: str,
+    vector_store: Optional[VectorStore] = None,
+    knowledge_base: Optional[KnowledgeBase] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze a resume against a job description, yielding the state after each stage.
+    Args:
+    resume_file: uploaded PDF (path, bytes or file object)
+    job_description: job description text
+    vector_store: VectorStore to use (default: the shared one, see get_vector_store)
+    knowledge_base: optional KnowledgeBase for best practices
+    Returns: iterator of state dicts (see empty_state), one per finished stage; every one
+    holds all results so far. A run that cannot go on ends with stage 'failed' and an error
+    """
+    state = empty_state()
+    store = vector_store or get_vector_store()
+
+    def snapshot() -> Dict[str, Any]:
+        #stage_seconds is copied too, so a later stage does not change an earlier snapshot
+        return {**state, 'stage_seconds': dict(state['stage_seconds'])}
+
+    def finish(stage: str, started: float, status: str) -> Dict[str, Any]:
+        state['stage'] = stage
+        state['status'] = status
+        state['stage_seconds'][stage] = time.perf_counter() - started
+        return snapshot()
+
+    def fail(message: str) -> Dict[str, Any]:
+        state['stage'], state['status'], state['error'] = 'failed', f"Analysis stopped: {message}", message
+        return snapshot()
+
+    if resume_file is None:
+        yield fail('please upload a resume PDF')
+        return
+    #stage 1: extraction
+    started = time.perf_counter()
+    try:
+        extraction = _read_upload(resume_file)
+    except OSError as e: #e.x. the uploaded temp file is already gone
+        logger.error(f"Error reading the upload: {str(e)}")
+        yield fail(f"could not open the uploaded file ({str(e)})")
+        return
+    state['extraction'] = {key: value for key, value in extraction.items() if key not in ('full_text', 'page_texts')}
+    if extraction['extraction_status'] != 'success':
+        yield fail(f"could not read the PDF ({extraction.get('error', 'unknown error')})")
+        return
+    yield finish('extraction', started, f"Extracted {extraction['page_count']} pages. Finding sections...")
+    #stage 2: cleaning + sections
+    started = time.perf_counter()
+    processed = text_processor.process_text(extraction['full_text'])
+    if processed['processing_status'] != 'success':
+        yield fail(f"could not process the text ({processed.get('error', 'unknown error')})")
+        return
+    resume_text = processed['cleaned_text']
+    parsed = section_parser.parse_sections(resume_text)
+    state['sections'] = {name: section.content for name, section in parsed.get('sections', {}).items()}
+    yield finish('sections', started, f"Found {len(state['sections'])} sections. Scoring ATS keywords...")
+    if not job_description or not job_description.strip():
+        yield fail('please paste a job description to match against')
+        return
+    #stage 3: ATS score (keywords only)
+    started = time.perf_counter()
+    job_requirements = store.analyze_job(job_description)
+    state['ats_score'] = round(float(store.ats_score_matrix([resume_text], [job_requirements])[0, 0]), 3)
+    yield finish('ats', started, "ATS score ready. Matching skills...")
+    #stage 4: skill matching (embedding model)
+    started = time.perf_counter()
+    match = store.match_resume_to_job(resume_text, job_requirements)
+    state['overall_score'] = round(float(match.overall_match_score), 3)
+    state['skill_matches'] = skill_match_rows(match)
+    yield finish('skills', started, "Skills matched. Writing recommendations...")
+    #stage 5: recommendations + knowledge base
+    started = time.perf_counter()
+    best_practices: List[str] = []
+    if knowledge_base is not None:
+        #the skill names alone rarely appear in the best practices, the words around them do
+        query = f"missing skills {' '.join(match.missing_skills)}" if match.missing_skills else resume_text[:500]
+        try:
+            best_practices = knowledge_base.get_best_practices(query, k=3, budget_ms=BEST_PRACTICES_BUDGET_MS)
+        except Exception as e:
+            logger.error(f"Error retrieving best practices: {str(e)}")
+    state['recommendations'] = format_recommendations(match.recommendations, best_practices)
+    yield finish('recommendations', started, 'Done.')
+
+
+def warm_up(vector_store: VectorStore, knowledge_base: Optional[KnowledgeBase]) -> threading.Thread:
+    """Load the embedding model (and embed the knowledge base) in the background."""
+    def _warm_up():
+        try:
+            if knowledge_base is not None:
+                knowledge_base.warm_up() #loads the model too
+            else:
+                vector_store.generate_embeddings(["warm up"])
+        except Exception as e:
+            logger.error(f"Error warming up: {str(e)}")
+    thread = threading.Thread(target=_warm_up, name='gradio-warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+def build_interface(vector_store: Optional[VectorStore] = None, knowledge_base: Optional[KnowledgeBase] = None):
+    """The Gradio Blocks app; every panel updates as soon as its stage finishes."""
+    import gradio as gr
+    store = vector_store or get_vector_store()
+
+    def on_analyze(resume_file, job_description):
+        #a generator event handler: Gradio pushes every yield to the page
+        for state in analyze_resume_stream(resume_file, job_description, store, knowledge_base):
+            yield (state['status'], state['extraction'], state['sections'], state['ats_score'],
+                   state['overall_score'], state['skill_matches'], state['recommendations'])
+
+    with gr.Blocks(title="Resume Booster") as app:
+        gr.Markdown("# Resume Booster\nUpload a resume and paste a job description.")
+        with gr.Row():
+            resume_file = gr.File(label="Resume (PDF)", file_types=['.pdf'], type='filepath')
+            job_description = gr.Textbox(label="Job description", lines=12)
+        analyze_button = gr.Button("Analyze", variant='primary')
+        status = gr.Markdown()
+        with gr.Row():
+            ats_score = gr.Number(label="ATS score")
+            overall_score = gr.Number(label="Overall match")
+        with gr.Row():
+            extraction = gr.JSON(label="Extraction")
+            sections = gr.JSON(label="Sections")
+        skill_matches = gr.Dataframe(
+            headers=['Skill', 'Requirement', 'Match', 'Similarity', 'Resume skill'], label="Skill matches"
+        )
+        recommendations = gr.Markdown(label="Recommendations")
+        analyze_button.click(
+            on_analyze, inputs=[resume_file, job_description],
+            outputs=[status, extraction, sections, ats_score, overall_score, skill_matches, recommendations]
+        )
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resume Booster web interface")
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--port', type=int, default=7860)
+    parser.add_argument('--share', action='store_true')
+    args = parser.parse_args()
+    store = get_vector_store(args.model)
+    knowledge_base = KnowledgeBase.load_or_build(store)
+    warm_up(store, knowledge_base)
+    #queue() is what lets generator handlers stream their updates
+    build_interface(store, knowledge_base).queue().launch(server_port=args.port, share=args.share)
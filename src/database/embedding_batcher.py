@@ -0,0 +1,187 @@
+"""
+embedding_batcher.py
+Dynamic micro-batching in front of VectorStore.generate_embeddings.
+
+Many concurrent callers (Gradio sessions, worker threads or asyncio tasks)
+each ask for embeddings of a handful of strings. Encoding every small request
+separately wastes most of the time on per-call overhead, and parallel encode
+calls fight over the same CPU cores. The EmbeddingBatcher queues requests,
+and a single worker thread merges them into one batch until either
+max_batch_size texts are collected or max_wait_ms has passed since the first
+queued request, runs one encode for the batch and hands every caller its
+own slice of the result.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class _EmbeddingRequest:
+    """One caller's texts plus the future its embeddings are delivered through."""
+    __slots__ = ('texts', 'future', 'enqueued_at')
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+class EmbeddingBatcher:
+    """Merge concurrent embedding requests into batched encode calls."""
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Args:
+        encode_fn: function that embeds a list of texts (one row per text)
+        max_batch_size: stop collecting once a batch holds this many texts
+        max_wait_ms: max time the first request of a batch waits for company
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: "queue.Queue[Optional[_EmbeddingRequest]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, float] = {
+            'requests': 0,
+            'batches': 0,
+            'texts': 0,
+            'total_queue_wait_ms': 0.0,
+            'total_encode_ms': 0.0,
+            'errors': 0
+        }
+
+    def configure(self, max_batch_size: Optional[int] = None, max_wait_ms: Optional[float] = None) -> None:
+        """Change the batching settings; applies from the next batch on."""
+        if max_batch_size is not None:
+            self.max_batch_size = max_batch_size
+        if max_wait_ms is not None:
+            self.max_wait_ms = max_wait_ms
+
+    def is_worker_thread(self) -> bool:
+        """True when called from the batcher's own worker thread."""
+        return threading.current_thread() is self._worker
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            with self._start_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(
+                        target=self._run, name="embedding-batcher", daemon=True
+                    )
+                    self._worker.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue texts for embedding; the returned future resolves to their embeddings."""
+        request = _EmbeddingRequest(list(texts))
+        if not request.texts:
+            request.future.set_result(np.array([]))
+            return request.future
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future
+
+    def encode(self, texts: List[str], timeout: Optional[float] = None) -> np.ndarray:
+        """Blocking helper for threads: submit and wait for the result."""
+        return self.submit(texts).result(timeout=timeout)
+
+    async def encode_async(self, texts: List[str]) -> np.ndarray:
+        """Awaitable helper for coroutines (does not block the event loop)."""
+        return await asyncio.wrap_future(self.submit(texts))
+
+    def _collect_batch(self, first: _EmbeddingRequest) -> List[_EmbeddingRequest]:
+        """Gather requests until the batch is full or the first one's deadline passes."""
+        batch = [first]
+        size = len(first.texts)
+        deadline = first.enqueued_at + self.max_wait_ms / 1000.0
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None: #shutdown sentinel: finish this batch first
+                self._queue.put(None)
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self) -> None:
+        """Worker loop: one encode call per collected batch."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect_batch(first)
+            texts = [text for request in batch for text in request.texts]
+            started = time.perf_counter()
+            try:
+                embeddings = self.encode_fn(texts)
+                if len(embeddings) != len(texts):
+                    raise RuntimeError(f"Encoder returned {len(embeddings)} rows for {len(texts)} texts")
+                offset = 0
+                for request in batch:
+                    request.future.set_result(embeddings[offset:offset + len(request.texts)])
+                    offset += len(request.texts)
+                failed = False
+            except Exception as e:
+                logger.error(f"Error encoding batch of {len(texts)} texts: {str(e)}")
+                for request in batch:
+                    request.future.set_exception(e)
+                failed = True
+            finished = time.perf_counter()
+            with self._stats_lock:
+                self.stats['requests'] += len(batch)
+                self.stats['batches'] += 1
+                self.stats['texts'] += len(texts)
+                self.stats['total_queue_wait_ms'] += sum(
+                    (started - request.enqueued_at) * 1000 for request in batch
+                )
+                self.stats['total_encode_ms'] += (finished - started) * 1000
+                self.stats['errors'] += int(failed)
+
+    def _after_fork(self) -> None:
+        """
+        The parent's worker thread does not exist in a forked child, and its queue and
+        locks may be in any state: start over with empty ones (the worker restarts lazily).
+        """
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters, averages and the current settings."""
+        with self._stats_lock:
+            stats: Dict[str, Any] = dict(self.stats)
+        batches = max(1, stats['batches'])
+        requests = max(1, stats['requests'])
+        stats['avg_batch_texts'] = stats['texts'] / batches
+        stats['avg_requests_per_batch'] = stats['requests'] / batches
+        stats['avg_queue_wait_ms'] = stats['total_queue_wait_ms'] / requests
+        stats['avg_encode_ms'] = stats['total_encode_ms'] / batches
+        stats['queue_depth'] = self._queue.qsize()
+        stats['max_batch_size'] = self.max_batch_size
+        stats['max_wait_ms'] = self.max_wait_ms
+        return stats
+
+    def close(self) -> None:
+        """Stop the worker after the requests already queued are served."""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        self._worker = None
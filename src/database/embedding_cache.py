@@ -0,0 +1,341 @@
+"""
+embedding_cache.py
+Two-level cache for text embeddings, used by VectorStore.generate_embeddings.
+
+Level 1: a bounded in-memory LRU (OrderedDict) of recently used vectors.
+Level 2: an optional persistent store on disk, made of
+- vectors.<dtype>: an append-only matrix (one row per cached text), read
+  through np.memmap so lookups only touch the pages they need. Rows are
+  float32 by default, or float16 / int8 (see quantization.py) to cut disk
+  and page-cache use by 2x / ~4x
+- scales.float32: one scale per row, only for int8 storage
+- index.tsv: an append-only "<key>\t<row>" file mapping text hashes to rows
+- meta.json: model name, embedding dimension and storage dtype
+
+Several processes (forked workers, or separate workers sharing cache_dir)
+can use one store. Appends hold an exclusive flock on store.lock and take
+their row numbers from the size of the vector file, not from a per-process
+counter, and a lookup miss first reads the index lines other processes have
+appended since (see _refresh).
+
+Keys are sha1 hashes of (model name, normalized text), so the same string
+embedded by two different models never collides, and trivial whitespace
+differences ("  python " vs "python") share one entry.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError: #Windows: no cross-process lock, one writer process per store
+    fcntl = None
+
+import numpy as np
+
+from src.database.quantization import QUANTIZATION_MODES, STORAGE_DTYPES, quantize, dequantize
+
+logger = logging.getLogger(__name__)
+
+class EmbeddingCache:
+    """Bounded LRU + memory-mapped persistent cache of embeddings for one model."""
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: Optional[str] = None,
+        max_memory_items: int = 10000,
+        storage_dtype: str = 'float32'
+    ):
+        """
+        Args:
+        model_name: name of the embedding model (part of every key)
+        cache_dir: root directory for the persistent store; None = memory only
+        max_memory_items: size bound of the in-memory LRU (0 disables it)
+        storage_dtype: 'float32', 'float16' or 'int8' for the persistent store. An 
+        existing store keeps the dtype it was created with.
+        """
+        if storage_dtype not in QUANTIZATION_MODES: 
+            raise ValueError(f"Unknown storage dtype: {storage_dtype}")
+        self.storage_dtype = storage_dtype
+        self.model_name = model_name
+        self.max_memory_items = max_memory_items
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            'hits': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0
+        }
+        #persistent store state
+        self.store_dir: Optional[str] = None
+        self.dim: Optional[int] = None
+        self._disk_index: Dict[str, int] = {}
+        self._disk_rows = 0
+        self._index_offset = 0 #bytes of index.tsv read so far
+        self._matrix: Optional[np.memmap] = None
+        self._scales: Optional[np.memmap] = None
+        if cache_dir:
+            #one sub-directory per model (model names can contain '/')
+            safe_name = re.sub(r'[^\w.-]+', '_', model_name)
+            self.store_dir = os.path.join(cache_dir, safe_name)
+            self._open_store()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text before hashing (unicode form + collapsed whitespace)."""
+        text = unicodedata.normalize('NFKC', text)
+        return re.sub(r'\s+', ' ', text).strip()
+
+    def make_key(self, text: str) -> str:
+        """Cache key for a text: sha1 of (model name, normalized text)."""
+        payload = f"{self.model_name}\x00{self.normalize_text(text)}"
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock on the persistent store, shared by every process using it."""
+        with open(os.path.join(self.store_dir, 'store.lock'), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read_meta(self) -> None:
+        meta_path = os.path.join(self.store_dir, 'meta.json')
+        if self.dim is not None or not os.path.exists(meta_path):
+            return
+        with open(meta_path, 'r', encoding='utf-8') as meta_file:
+            meta = json.load(meta_file)
+        self.dim = int(meta['dim'])
+        stored_dtype = meta.get('storage_dtype', 'float32')
+        if stored_dtype != self.storage_dtype: 
+            logger.warning(f"Embedding cache at {self.store_dir} uses {stored_dtype}; "
+                           f"ignoring requested {self.storage_dtype}")
+            self.storage_dtype = stored_dtype
+
+    def _complete_rows(self) -> int:
+        """Rows fully written to every row file (a torn write at the end is ignored)."""
+        complete_rows = None
+        for path, row_bytes in self._row_files():
+            rows = os.path.getsize(path) // row_bytes if os.path.exists(path) else 0
+            complete_rows = rows if complete_rows is None else min(complete_rows, rows)
+        return complete_rows or 0
+
+    def _open_store(self) -> None:
+        """Load the persistent index and memory-map the vector matrix."""
+        os.makedirs(self.store_dir, exist_ok=True)
+        with self._file_lock():
+            self._read_meta()
+            if self.dim is None:
+                return
+            #only safe under the lock: another process's append is never mid-write here
+            complete_rows = self._complete_rows()
+            for path, row_bytes in self._row_files():
+                if os.path.exists(path) and os.path.getsize(path) != complete_rows * row_bytes:
+                    #drop partially written trailing rows so future appends stay aligned
+                    with open(path, 'r+b') as row_file:
+                        row_file.truncate(complete_rows * row_bytes)
+            self._read_index_tail()
+        logger.info(f"Opened embedding cache at {self.store_dir} ({len(self._disk_index)} vectors)")
+
+    def _read_index_tail(self) -> bool:
+        """
+        Read index.tsv lines appended since the last call (by any process) and remap.
+        An index line is only written after its row, so every complete line points at a
+        complete row; a line still being written (no newline yet) is left for next time.
+        Returns: True if new entries were found
+        """
+        index_path = os.path.join(self.store_dir, 'index.tsv')
+        if self.dim is None or not os.path.exists(index_path) \
+                or os.path.getsize(index_path) <= self._index_offset:
+            return False
+        with open(index_path, 'rb') as index_file:
+            index_file.seek(self._index_offset)
+            data = index_file.read()
+        complete = data[:data.rfind(b'\n') + 1]
+        self._index_offset += len(complete)
+        complete_rows = self._complete_rows()
+        found = False
+        for line in complete.decode('utf-8').splitlines():
+            parts = line.split('\t')
+            if len(parts) != 2:
+                continue
+            row = int(parts[1])
+            if row < complete_rows:
+                self._disk_index[parts[0]] = row
+                found = True
+        if complete_rows != self._disk_rows:
+            self._disk_rows = complete_rows
+            self._remap()
+        return found
+
+    def _refresh(self) -> bool:
+        """Pick up vectors other processes stored since we last looked (call with self._lock)."""
+        if not self.store_dir:
+            return False
+        self._read_meta()
+        return self._read_index_tail()
+
+    def _row_files(self) -> List[Tuple[str, int]]:
+        """(path, bytes per row) of every append-only file in the persistent store."""
+        dtype = np.dtype(STORAGE_DTYPES[self.storage_dtype])
+        files = [(os.path.join(self.store_dir, f'vectors.{self.storage_dtype}'), dtype.itemsize * self.dim)]
+        if self.storage_dtype == 'int8':
+            files.append((os.path.join(self.store_dir, 'scales.float32'), 4))
+        return files
+
+    def _remap(self) -> None:
+        """(Re)create the read-only memory maps over the rows written so far."""
+        if self._disk_rows == 0 or self.dim is None:
+            self._matrix = None
+            self._scales = None
+            return
+        self._matrix = np.memmap(
+            self._row_files()[0][0], dtype=STORAGE_DTYPES[self.storage_dtype],
+            mode='r', shape=(self._disk_rows, self.dim)
+        )
+        if self.storage_dtype == 'int8':
+            self._scales = np.memmap(
+                self._row_files()[1][0], dtype=np.float32, mode='r', shape=(self._disk_rows,)
+            )
+
+    def _read_row(self, row: int) -> np.ndarray:
+        """Copy one row out of the memory map as float32 (dequantized if needed)."""
+        scales = self._scales[row:row + 1] if self._scales is not None else None
+        return dequantize(self._matrix[row:row + 1], scales, self.storage_dtype)[0]
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Insert into the LRU, evicting the least recently used entry if full."""
+        if self.max_memory_items <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def lookup(self, texts: List[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Look up a batch of texts.
+        Returns: (found, missing) where found maps positions in texts to vectors and
+        missing lists the positions that have to be encoded.
+        """
+        found: Dict[int, np.ndarray] = {}
+        missing: List[int] = []
+        with self._lock:
+            keys = [self.make_key(text) for text in texts]
+            if any(key not in self._memory and key not in self._disk_index for key in keys):
+                self._refresh() #another process may have stored them
+            for position, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                elif key in self._disk_index:
+                    #copy the row out of the memory map so callers never hold a view
+                    vector = self._read_row(self._disk_index[key])
+                    self._remember(key, vector)
+                    self.stats['disk_hits'] += 1
+                if vector is None:
+                    missing.append(position)
+                    self.stats['misses'] += 1
+                else:
+                    found[position] = vector
+                    self.stats['hits'] += 1
+        return found, missing
+
+    def store(self, texts: List[str], vectors: np.ndarray) -> np.ndarray:
+        """
+        Add newly encoded vectors (one row per text) to both cache levels.
+        Returns: the vectors as the cache will serve them. With a float16/int8 store these
+        are rounded to the stored precision, so a text gets the same vector (and the same
+        scores) from the encoder, the LRU, the disk, or another process.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(texts) == 0:
+            return vectors
+        if self.store_dir and self.storage_dtype != 'float32':
+            codes, scales = quantize(vectors, self.storage_dtype)
+            vectors = dequantize(codes, scales, self.storage_dtype)
+        with self._lock:
+            new_rows: List[np.ndarray] = []
+            new_keys: List[str] = []
+            seen = set()
+            for text, vector in zip(texts, vectors):
+                key = self.make_key(text)
+                self._remember(key, vector)
+                if self.store_dir and key not in self._disk_index and key not in seen:
+                    seen.add(key)
+                    new_keys.append(key)
+                    new_rows.append(vector)
+            if new_rows:
+                self._append_to_disk(new_keys, np.vstack(new_rows))
+        return vectors
+
+    def _append_to_disk(self, keys: List[str], rows: np.ndarray) -> None:
+        """
+        Append (quantized) rows to the vector file, then their keys to index.tsv. Runs under
+        the store's file lock; row numbers come from the vector file's size at that point,
+        so appends from other processes are never overwritten or mislabeled.
+        """
+        with self._file_lock():
+            self._read_meta()
+            if self.dim is None:
+                self.dim = int(rows.shape[1])
+                with open(os.path.join(self.store_dir, 'meta.json'), 'w', encoding='utf-8') as meta_file:
+                    json.dump({
+                        'model_name': self.model_name,
+                        'dim': self.dim,
+                        'storage_dtype': self.storage_dtype
+                    }, meta_file)
+            elif rows.shape[1] != self.dim:
+                logger.error(f"Embedding dimension changed ({rows.shape[1]} != {self.dim}); not persisting")
+                return
+            #skip what another process stored in the meantime
+            self._read_index_tail()
+            new = [position for position, key in enumerate(keys) if key not in self._disk_index]
+            if not new:
+                return
+            keys = [keys[position] for position in new]
+            codes, scales = quantize(rows[new], self.storage_dtype)
+            first_row = self._complete_rows()
+            row_files = self._row_files()
+            for (path, row_bytes), data in zip(row_files, [codes, scales]):
+                with open(path, 'ab') as row_file:
+                    row_file.truncate(first_row * row_bytes) #a torn row left by a crashed writer
+                    row_file.write(np.ascontiguousarray(data).tobytes())
+            with open(os.path.join(self.store_dir, 'index.tsv'), 'a', encoding='utf-8') as index_file:
+                index_file.write(''.join(f"{key}\t{first_row + offset}\n" for offset, key in enumerate(keys)))
+            self._read_index_tail()
+
+    def _after_fork(self) -> None:
+        """
+        Reset state a forked child must not inherit: the lock (another thread may have held
+        it at fork time) and the view of the persistent store, which is re-read so the child
+        sees what was appended after the parent last looked. Appends stay safe (see
+        _append_to_disk).
+        """
+        self._lock = threading.Lock()
+        if self.store_dir:
+            try:
+                self._refresh()
+            except Exception as e:
+                logger.error(f"Error reopening embedding cache after fork: {str(e)}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Hit/miss counters plus current sizes of both levels."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_items'] = len(self._memory)
+            stats['disk_items'] = len(self._disk_index)
+        return stats
@@ -1,6 +1,7 @@
 import re 
 import logging
 from typing import Dict, List, Set, Any, Optional
+from src.utils.helpers import KeywordAutomaton, expand_keyword_pattern, score_distribution
 
 logger = logging.getLogger(__name__)
 class JobRequirements: 
@@ -17,10 +18,12 @@ class JobRequirements:
         company_info: Dict[str, str], 
         salary_range: Optional[str],
         job_title: str,
-        industry: str
+        industry: str,
+        industry_scores: Optional[Dict[str, float]] = None,
+        experience_level_scores: Optional[Dict[str, float]] = None
     ):
         self.required_skills = required_skills
-        self.preferreed_skills = preferred_skills
+        self.preferred_skills = preferred_skills
         self.experience_years = experience_years
         self.experience_level = experience_level
         self.education_requirements = education_requirements
@@ -30,6 +33,9 @@ class JobRequirements:
         self.salary_range = salary_range
         self.job_title = job_title
         self.industry = industry
+        #normalized keyword-hit distributions behind industry / experience_level
+        self.industry_scores = industry_scores or {}
+        self.experience_level_scores = experience_level_scores or {}
 
 class JobAnalyzer: 
     """Extract and analyze requirements from job descriptions"""
@@ -56,13 +62,30 @@ class JobAnalyzer:
                 r'\b(?:jenkins|circleci|travis|ci/cd)\b'
             ]
         }
-        #Experience level indicators
+        #Experience level indicators. These are literal keywords (not regexes) because 
+        #_clean_job_text already lowercases the text and collapses whitespace to single 
+        #spaces, so they can all be counted in one pass by the keyword automaton below.
         self.experience_indicators: Dict[str, List[str]] = {
-            'entry': [r'entry\s+level', r'junior', r'0-2\s+years', r'new\s+grad', r'recent\s+graduate'],
-            'mid': [r'mid\s+level', r'2-5\s+years', r'3-6\s+years', r'intermediate'],
-            'senior': [r'senior', r'5\+\s+years', r'6\+\s+years', r'7\+\s+years', r'lead', r'principal'],
-            'executive': [r'director', r'vp', r'vice\s+president', r'c-level', r'chief', r'head\s+of']
+            'entry': ['entry level', 'junior', '0-2 years', 'new grad', 'recent graduate'],
+            'mid': ['mid level', '2-5 years', '3-6 years', 'intermediate'],
+            'senior': ['senior', '5+ years', '6+ years', '7+ years', 'lead', 'principal'],
+            'executive': ['director', 'vp', 'vice president', 'c-level', 'chief', 'head of']
         }
+        #Industry indicators (substring keywords, same semantics as `keyword in text`)
+        self.industry_keywords: Dict[str, List[str]] = {
+            'technology': ['software', 'tech', 'saas', 'platform', 'digital'],
+            'finance': ['bank', 'financial', 'fintech', 'investment', 'trading'],
+            'healthcare': ['health', 'medical', 'hospital', 'pharmaceutical'],
+            'education': ['education', 'university', 'school', 'learning'],
+            'retail': ['retail', 'e-commerce', 'shopping', 'consumer'],
+            'consulting': ['consulting', 'advisory', 'strategy']
+        }
+        #Single automaton over both label groups: one scan of the posting counts hits 
+        #for every industry and every experience level at the same time.
+        self.label_automaton = KeywordAutomaton({
+            'industry': self.industry_keywords,
+            'experience_level': self.experience_indicators
+        })
         #Education patterns: 
         self.education_patterns: List[str] = [
             r"bachelor[']?s?\s+(?:degree\s+)?(?:in\s+)?([a-zA-Z\s]+)",
@@ -93,12 +116,14 @@ class JobAnalyzer:
             company_info = self._extract_company_info(cleaned_text)
             required_skills = self._extract_required_skills(cleaned_text)
             preferred_skills = self._extract_preferred_skills(cleaned_text)
-            experience_info = self._extract_experience_requirements(cleaned_text)
+            #one keyword scan scores every industry and experience level together
+            label_counts = self.label_automaton.count(cleaned_text)
+            experience_info = self._extract_experience_requirements(cleaned_text, label_counts)
             education_reqs = self._extract_education_requirements(cleaned_text)
             certifications = self._extract_certifications(cleaned_text)
-            responsibilities = self._extract_responsibilities(cleaned_text)
+            responsibilities = self._extract_job_responsibilities(cleaned_text)
             salary_range = self._extract_salary_range(cleaned_text)
-            industry = self._extract_industry(cleaned_text)
+            industry_info = self._extract_industry(cleaned_text, label_counts)
 
             requirements = JobRequirements(
                 job_title=job_title,
@@ -111,7 +136,9 @@ class JobAnalyzer:
                 certifications=certifications,
                 responsibilities=responsibilities,
                 salary_range=salary_range,
-                industry=industry
+                industry=industry_info['label'],
+                industry_scores=industry_info['scores'],
+                experience_level_scores=experience_info['level_scores']
             )
             logger.info(f"Successfully analyzed job description for {job_title}.")
             return requirements
@@ -199,7 +226,7 @@ class JobAnalyzer:
             text, re.IGNORECASE | re.DOTALL
         )
         for section in preferred_sections: 
-            skills = set._extract_skills_from_text(section)
+            skills = self._extract_skills_from_text(section)
             preferred_skills.update(skills)
 
         return list(preferred_skills)
@@ -214,9 +241,26 @@ class JobAnalyzer:
                     skills.add(match.lower())
         return skills
     
-    def _extract_experience_requirements(self, text: str) -> Dict[str, Any]: 
-        """Extract experience level and years required"""
-        experience_info = {'years': None, 'level': 'unknown'}
+    def get_skill_taxonomy(self) -> List[str]: 
+        """Every skill name the skill patterns can produce (sorted, lowercase)."""
+        skills = set()
+        for patterns in self.tech_skills_patterns.values(): 
+            for pattern in patterns: 
+                skills.update(expand_keyword_pattern(pattern))
+        return sorted(skills)
+
+    def _extract_experience_requirements(
+        self, text: str, label_counts: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> Dict[str, Any]: 
+        """
+        Extract experience level and years required.
+        Args: 
+        text: cleaned job description text
+        label_counts: output of self.label_automaton.count(text); computed here if not given
+        Returns: {'years', 'level', 'level_scores'} where level_scores is the normalized 
+        keyword-hit distribution over all experience levels
+        """
+        experience_info = {'years': None, 'level': 'unknown', 'level_scores': {}}
         #Extract years of experience
         yoe_patterns = [
             r'(\d+)\+?\s+years?\s+(?:of\s+)?experience',
@@ -231,14 +275,13 @@ class JobAnalyzer:
                 #note: 
                 #"break" => exit the loop entirely 
                 #"continue" => skip this iteration and keep looping
-        #Determine experience level
-        for level, patterns in self.experience_indicators.items(): 
-            for pattern in patterns: 
-                if re.search(pattern, text, re.IGNORECASE): 
-                    experience_info['level'] = level
-                    break
-            if experience_info['level'] != 'unknown': 
-                break
+        #Determine experience level: the level with the most keyword hits wins 
+        #(ties go to the earlier level in self.experience_indicators)
+        if label_counts is None: 
+            label_counts = self.label_automaton.count(text)
+        level_info = score_distribution(label_counts['experience_level'], 'unknown')
+        experience_info['level'] = level_info['label']
+        experience_info['level_scores'] = level_info['scores']
         return experience_info
     
     def _extract_education_requirements(self, text: str) -> List[str]: 
@@ -291,21 +334,17 @@ class JobAnalyzer:
             #groups 1+ match the capturing groups (the parts inside parentheses)
         return None #default if no salary listed/found
     
-    def _extract_industry(self, text: str) -> str: 
-        """Determine industry from job description"""
-        industry_keywords: Dict[str, List[str]] = {
-            'technology': ['software', 'tech', 'saas', 'platform', 'digital'],
-            'finance': ['bank', 'financial', 'fintech', 'investment', 'trading'],
-            'healthcare': ['health', 'medical', 'hospital', 'pharmaceutical'],
-            'education': ['education', 'university', 'school', 'learning'],
-            'retail': ['retail', 'e-commerce', 'shopping', 'consumer'],
-            'consulting': ['consulting', 'advisory', 'strategy']
-        }
-        for industry, keywords in industry_keywords.items(): 
-            for keyword in keywords: 
-                if keyword in text: 
-                    return industry
-        return 'technology' #default fallback if no industry found
+    def _extract_industry(
+        self, text: str, label_counts: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> Dict[str, Any]: 
+        """
+        Determine industry from job description.
+        Returns: {'label': top industry, 'scores': normalized hit distribution per industry}
+        """
+        if label_counts is None: 
+            label_counts = self.label_automaton.count(text)
+        #default fallback is 'technology' if no industry keyword is found
+        return score_distribution(label_counts['industry'], 'technology')
     
     def get_requirements_summary(self, requirements: JobRequirements) -> str: 
         """Generate a human-readable summary of job requirements. """
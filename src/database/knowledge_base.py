@@ -0,0 +1,804 @@
+"""
+knowledge_base.py
+Resume best-practice retrieval for the RAG step (recommendations, rewrites).
+
+The knowledge base is a hybrid retriever over short best-practice documents:
+- lexical: BM25 over an inverted index. Postings are stored as compact
+  arrays (CSR layout): term_offsets[t]:term_offsets[t + 1] indexes the slices
+  of posting_docs (int32 document ids) and posting_tfs (term frequencies)
+  for term t, so a query only touches the postings of its own terms
+- dense: cosine similarity between the query embedding and the document
+  embeddings, both produced by VectorStore.generate_embeddings (so the
+  embedding cache is shared). Document embeddings are computed on the first
+  dense query, never for lexical-only use
+- hybrid: the two rankings merged with reciprocal-rank fusion (RRF),
+  score = sum over rankings of 1 / (rrf_k + rank)
+
+Queries can carry a latency budget: the lexical ranking is computed first
+(sub-millisecond), and the dense path only runs if its expected cost (a
+running average of past dense queries; a cold model counts as too slow)
+fits in what is left of the budget. Otherwise the lexical ranking is
+returned on its own and the query is reported as degraded.
+
+Documents live in data/knowledge_base (.md / .txt files, or .jsonl with one
+{'id', 'text', 'metadata'} per line). Instead of chunking and embedding them
+in every worker at startup, an offline build writes a versioned snapshot:
+<snapshot dir>/<snapshot id>/ holds chunks.json, vocabulary.json, the BM25
+arrays and embeddings.npy, plus manifest.json (format version, model name,
+content hash of the source documents, chunk size and a sha256 per file),
+and <snapshot dir>/CURRENT names the active snapshot. Workers memory-map the
+arrays read-only, so they share one copy of the pages through the OS page
+cache. A snapshot whose format, model, chunk size or content hash no longer
+matches is rejected (StaleSnapshotError).
+
+Documents can be added, updated and deleted without a rebuild: writes go to
+small delta segments and tombstone the old chunks, searches merge all
+segments, and a background compaction folds the deltas back into the base
+(see KnowledgeBase).
+
+Build it ahead of time from the project root, e.x.:
+python -m src.database.knowledge_base --model all-MiniLM-L6-v2
+"""
+import argparse
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.models.chunking import chunk_text
+from src.models.embeddings import l2_normalize
+from src.models.scoring import ats_tokenize
+from src.parser.text_processor import TextProcessor
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ('hybrid', 'lexical', 'dense')
+
+DEFAULT_KB_SOURCE_DIR = "./data/knowledge_base"
+DEFAULT_KB_SNAPSHOT_DIR = "./data/processed/knowledge_base"
+SNAPSHOT_FORMAT_VERSION = 2
+#BM25 arrays saved as one .npy file each, so they can be memory-mapped
+BM25_ARRAYS = ('term_offsets', 'posting_docs', 'posting_tfs', 'doc_lengths', 'idf')
+
+#stop words are dropped from documents and queries before BM25
+STOPWORDS = frozenset(TextProcessor().resume_stopwords) | {'a', 'an', 'it', 'its', 'your', 'you'}
+
+#built-in best practices, used when no documents are given
+DEFAULT_BEST_PRACTICES: List[Dict[str, Any]] = [
+    {'id': 'quantify-impact', 'text': "Quantify impact in bullet points with numbers, percentages or "
+     "money, e.x. 'cut API latency by 40%' instead of 'improved performance'.", 'metadata': {'topic': 'bullets'}},
+    {'id': 'action-verbs', 'text': "Start every bullet point with a strong action verb such as built, "
+     "led, designed, migrated or automated.", 'metadata': {'topic': 'bullets'}},
+    {'id': 'mirror-keywords', 'text': "Mirror the exact keywords and skill names from the job description "
+     "so applicant tracking systems (ATS) can match them.", 'metadata': {'topic': 'ats'}},
+    {'id': 'job-title', 'text': "Include the exact job title from the posting in your summary or "
+     "headline; many ATS filters search for it.", 'metadata': {'topic': 'ats'}},
+    {'id': 'simple-format', 'text': "Use a simple single-column layout without tables, text boxes or "
+     "images so ATS parsers read every section.", 'metadata': {'topic': 'ats'}},
+    {'id': 'skills-section', 'text': "Keep a dedicated skills section grouped by category (languages, "
+     "frameworks, cloud, databases) and only list skills you can discuss.", 'metadata': {'topic': 'skills'}},
+    {'id': 'skills-in-context', 'text': "Show skills in context: mention the technology inside the "
+     "experience bullet where you used it, not only in the skills list.", 'metadata': {'topic': 'skills'}},
+    {'id': 'summary', 'text': "Open with a two to three line professional summary tailored to the role, "
+     "naming your seniority, domain and strongest skills.", 'metadata': {'topic': 'summary'}},
+    {'id': 'length', 'text': "Keep the resume to one page for under ten years of experience and two pages "
+     "at most for senior roles.", 'metadata': {'topic': 'format'}},
+    {'id': 'reverse-chronological', 'text': "List experience in reverse chronological order with company, "
+     "title and start and end dates for every role.", 'metadata': {'topic': 'experience'}},
+    {'id': 'seniority-signals', 'text': "For senior and lead roles highlight ownership, mentoring, "
+     "architecture decisions and cross-team leadership.", 'metadata': {'topic': 'experience'}},
+    {'id': 'projects', 'text': "Entry level candidates should add projects, internships and hackathons "
+     "with links to GitHub repositories or live demos.", 'metadata': {'topic': 'experience'}},
+    {'id': 'certifications', 'text': "List relevant certifications (AWS, Azure, GCP, PMP) with the year "
+     "earned when the posting asks for them.", 'metadata': {'topic': 'education'}},
+    {'id': 'education', 'text': "Put education after experience unless you are a recent graduate; include "
+     "degree, school and graduation year.", 'metadata': {'topic': 'education'}},
+    {'id': 'proofread', 'text': "Proofread for typos and keep tense consistent: past tense for previous "
+     "roles and present tense for your current role.", 'metadata': {'topic': 'format'}},
+    {'id': 'contact', 'text': "Put your name, email, phone, city and LinkedIn or GitHub profile at the "
+     "top; leave out a photo and full street address.", 'metadata': {'topic': 'format'}}
+]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase tokens (c++, c#, node.js kept whole) without stop words."""
+    return [token for token in ats_tokenize(text) if token not in STOPWORDS]
+
+
+class StaleSnapshotError(ValueError):
+    """The saved snapshot does not match the current documents, model or format."""
+
+
+def load_documents(directory: str = DEFAULT_KB_SOURCE_DIR) -> List[Dict[str, Any]]:
+    """
+    Read best-practice documents from a directory (sorted by path, so ids are stable).
+    .md / .txt files become one document each (id = path without extension);
+    .jsonl files hold one {'id', 'text', 'metadata'} document per line.
+    """
+    documents: List[Dict[str, Any]] = []
+    for path in sorted(glob.glob(os.path.join(directory, '**', '*'), recursive=True)):
+        relative = os.path.relpath(path, directory).replace(os.sep, '/')
+        extension = os.path.splitext(path)[1].lower()
+        if extension in ('.md', '.txt'):
+            with open(path, 'r', encoding='utf-8') as document_file:
+                text = document_file.read().strip()
+            if text:
+                documents.append({'id': os.path.splitext(relative)[0], 'text': text,
+                                  'metadata': {'source': relative}})
+        elif extension == '.jsonl':
+            with open(path, 'r', encoding='utf-8') as document_file:
+                for line in document_file:
+                    if line.strip():
+                        document = json.loads(line)
+                        document.setdefault('metadata', {})['source'] = relative
+                        documents.append(document)
+    return documents
+
+
+def chunk_documents(documents: List[Dict[str, Any]], max_tokens: int = 128) -> List[Dict[str, Any]]:
+    """
+    Split long documents into sentence-aligned chunks of at most max_tokens.
+    A document that fits keeps its id; otherwise the chunks are '<id>#0', '<id>#1', ...
+    Every chunk records its document's id in metadata['document_id'].
+    """
+    chunks: List[Dict[str, Any]] = []
+    for document in documents:
+        pieces = chunk_text(document['text'], max_tokens) or [document['text']]
+        for number, piece in enumerate(pieces):
+            metadata = dict(document.get('metadata', {}), document_id=document['id'])
+            chunk_id = document['id'] if len(pieces) == 1 else f"{document['id']}#{number}"
+            chunks.append({'id': chunk_id, 'text': piece, 'metadata': metadata})
+    return chunks
+
+
+def document_hash(document: Dict[str, Any]) -> str:
+    """Fingerprint of one document's text and metadata."""
+    return hashlib.sha256(json.dumps([document['text'], document.get('metadata', {})],
+                                     sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def hashes_digest(document_hashes: Dict[str, str]) -> str:
+    """Combine per-document hashes (id -> hash) into one order-independent content hash."""
+    digest = hashlib.sha256()
+    for document_id in sorted(document_hashes):
+        digest.update(f"{document_id}\0{document_hashes[document_id]}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def content_hash(documents: List[Dict[str, Any]]) -> str:
+    """Fingerprint of the source documents (ids, texts and metadata, order-independent)."""
+    return hashes_digest({document['id']: document_hash(document) for document in documents})
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as snapshot_file:
+        for block in iter(lambda: snapshot_file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index with CSR posting arrays."""
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: Dict[str, int] = {}
+        self.term_offsets = np.zeros(1, dtype=np.int64)
+        self.posting_docs = np.zeros(0, dtype=np.int32)
+        self.posting_tfs = np.zeros(0, dtype=np.float32)
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+        self.idf = np.zeros(0, dtype=np.float32)
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.doc_lengths)
+
+    @classmethod
+    def build(cls, texts: List[str], k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        index = cls(k1, b)
+        postings: Dict[int, Dict[int, int]] = {} #term id -> {doc id: term frequency}
+        doc_lengths = []
+        for doc_id, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_lengths.append(len(tokens))
+            for token in tokens:
+                term_id = index.vocabulary.setdefault(token, len(index.vocabulary))
+                term_postings = postings.setdefault(term_id, {})
+                term_postings[doc_id] = term_postings.get(doc_id, 0) + 1
+        counts = np.array([len(postings[term_id]) for term_id in range(len(index.vocabulary))], dtype=np.int64)
+        index.term_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        index.posting_docs = np.zeros(int(counts.sum()), dtype=np.int32)
+        index.posting_tfs = np.zeros(int(counts.sum()), dtype=np.float32)
+        for term_id in range(len(index.vocabulary)):
+            start = index.term_offsets[term_id]
+            docs = sorted(postings[term_id])
+            index.posting_docs[start:start + len(docs)] = docs
+            index.posting_tfs[start:start + len(docs)] = [postings[term_id][doc] for doc in docs]
+        index.doc_lengths = np.array(doc_lengths, dtype=np.float32)
+        #BM25 idf with the +1 that keeps it positive for very common terms
+        index.idf = np.log(1.0 + (len(texts) - counts + 0.5) / (counts + 0.5)).astype(np.float32)
+        return index
+
+    def save(self, path: str) -> List[str]:
+        """Write one .npy file per array plus vocabulary.json; returns the file names."""
+        names = []
+        for name in BM25_ARRAYS:
+            np.save(os.path.join(path, f'{name}.npy'), getattr(self, name))
+            names.append(f'{name}.npy')
+        with open(os.path.join(path, 'vocabulary.json'), 'w', encoding='utf-8') as vocabulary_file:
+            json.dump({'k1': self.k1, 'b': self.b, 'terms': list(self.vocabulary)}, vocabulary_file)
+        return names + ['vocabulary.json']
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        """Load a saved index with its arrays memory-mapped read-only."""
+        with open(os.path.join(path, 'vocabulary.json'), 'r', encoding='utf-8') as vocabulary_file:
+            saved = json.load(vocabulary_file)
+        index = cls(saved['k1'], saved['b'])
+        index.vocabulary = {term: term_id for term_id, term in enumerate(saved['terms'])}
+        for name in BM25_ARRAYS:
+            setattr(index, name, np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r'))
+        return index
+
+    def postings(self, token: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(document ids, term frequencies) of one term (empty arrays for unknown terms)."""
+        term_id = self.vocabulary.get(token)
+        if term_id is None:
+            return self.posting_docs[:0], self.posting_tfs[:0]
+        start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+        return self.posting_docs[start:end], self.posting_tfs[start:end]
+
+    def term_scores(self, docs: np.ndarray, tfs: np.ndarray, idf: float, average_length: float) -> np.ndarray:
+        """BM25 contribution of one term to each of its posting documents."""
+        norm = self.k1 * (1.0 - self.b + self.b * self.doc_lengths[docs] / average_length)
+        return idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for the query (0 for documents without query terms)."""
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        if self.n_docs == 0:
+            return scores
+        average_length = max(float(self.doc_lengths.mean()), 1.0)
+        for token in tokenize(query):
+            term_id = self.vocabulary.get(token)
+            if term_id is None:
+                continue
+            docs, tfs = self.postings(token)
+            #every doc appears once per term's postings, so plain fancy-index += is safe
+            scores[docs] += self.term_scores(docs, tfs, self.idf[term_id], average_length)
+        return scores
+
+
+def rank(scores: np.ndarray, k: int, mask: Optional[np.ndarray] = None) -> List[int]:
+    """Indexes of the k highest scores, best first (ties by index), among rows where mask is True."""
+    candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(scores))
+    if len(candidates) == 0 or k <= 0:
+        return []
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+    return [int(i) for i in candidates[np.lexsort((candidates, -scores[candidates]))]]
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], rrf_k: int = 60) -> Dict[int, float]:
+    """RRF score per document: sum over rankings of 1 / (rrf_k + rank), rank starting at 1."""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for position, doc_id in enumerate(ranking):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (rrf_k + position + 1)
+    return fused
+
+
+class Segment:
+    """
+    A block of chunks with its own BM25 index and embeddings. Segments are never
+    modified in place: deleting a chunk swaps in a new live mask (False = tombstone),
+    so a search that already picked up the old mask keeps a consistent view.
+    """
+    def __init__(
+        self,
+        documents: List[Dict[str, Any]],
+        bm25: Optional[BM25Index] = None,
+        embeddings: Optional[np.ndarray] = None
+    ):
+        self.documents = documents
+        self.bm25 = bm25 if bm25 is not None else BM25Index.build([document['text'] for document in documents])
+        self.embeddings = embeddings #(len(documents), dim), L2-normalized, None until embedded
+        self.live = np.ones(len(documents), dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+
+def source_id(chunk: Dict[str, Any]) -> str:
+    """Id of the document a chunk came from (the chunk's own id if it was not split)."""
+    return chunk.get('metadata', {}).get('document_id', chunk['id'])
+
+
+class KnowledgeBase:
+    """
+    Hybrid BM25 + dense retriever over resume best-practice documents.
+
+    The index is a base segment plus delta segments. add_documents / delete_documents
+    only write a small delta segment and tombstone the document's old chunks;
+    searches merge every segment with BM25 statistics computed over the live chunks,
+    so results match a full rebuild. compact() (run in the background once
+    max_deltas segments pile up) folds the deltas and tombstones into a new base.
+    """
+    def __init__(
+        self,
+        documents: Optional[List[Dict[str, Any]]] = None,
+        vector_store: Any = None,
+        rrf_k: int = 60,
+        candidates: int = 50,
+        bm25: Optional[BM25Index] = None,
+        embeddings: Optional[np.ndarray] = None,
+        max_deltas: int = 8
+    ):
+        """
+        Args:
+        documents: [{'id', 'text', 'metadata'}] (default: DEFAULT_BEST_PRACTICES)
+        vector_store: VectorStore used for the dense path (None = lexical only)
+        rrf_k: reciprocal-rank fusion constant (60 is the usual choice)
+        candidates: how deep each ranking goes before fusion
+        bm25, embeddings: prebuilt index and document embeddings (e.x. from a snapshot)
+        max_deltas: start a background compaction once this many delta segments exist
+        (0 = only compact when compact() is called)
+        """
+        documents = list(documents if documents is not None else DEFAULT_BEST_PRACTICES)
+        self.vector_store = vector_store
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+        self.max_deltas = max_deltas
+        self.base = Segment(documents, bm25, embeddings)
+        self.deltas: List[Segment] = []
+        #source document id -> [(segment, row)] of its live chunks, for tombstoning
+        self._chunk_rows: Dict[str, List[Tuple[Segment, int]]] = {}
+        self._index_rows([self.base])
+        #what the documents were built from (id -> hash), recorded in snapshot manifests
+        self.document_hashes: Dict[str, str] = {}
+        for document in documents:
+            self.document_hashes[source_id(document)] = document_hash(document)
+        self.max_tokens: Optional[int] = None
+        self.snapshot: Optional[Dict[str, Any]] = None #manifest, when loaded from a snapshot
+        #writers and the compaction swap hold this lock; searches only take it to copy references
+        self._lock = threading.RLock()
+        self._compaction: Optional[threading.Thread] = None
+        self.update_stats: Dict[str, int] = {'added': 0, 'deleted': 0, 'compactions': 0}
+        #running average of dense query cost (ms), used to honour latency budgets
+        self.dense_ms_estimate: Optional[float] = None
+        self.last_query_stats: Dict[str, Any] = {}
+
+    @property
+    def bm25(self) -> BM25Index:
+        """The base segment's lexical index."""
+        return self.base.bm25
+
+    @property
+    def embeddings(self) -> Optional[np.ndarray]:
+        """The base segment's document embeddings."""
+        return self.base.embeddings
+
+    @property
+    def source_hash(self) -> str:
+        return hashes_digest(self.document_hashes)
+
+    @property
+    def documents(self) -> List[Dict[str, Any]]:
+        """Live chunks of every segment, in index order."""
+        return [document for segment in self._segments()
+                for document, live in zip(segment.documents, segment.live) if live]
+
+    def __len__(self) -> int:
+        return sum(int(segment.live.sum()) for segment in self._segments())
+
+    def _segments(self) -> List[Segment]:
+        with self._lock:
+            return [self.base] + self.deltas
+
+    def _index_rows(self, segments: List[Segment]) -> None:
+        for segment in segments:
+            for row in np.flatnonzero(segment.live):
+                self._chunk_rows.setdefault(source_id(segment.documents[row]), []).append((segment, int(row)))
+
+    def build_dense(self) -> None:
+        """Embed every segment that has no embeddings yet (done on the first dense query if not called earlier)."""
+        if self.vector_store is None:
+            raise ValueError("The dense path needs a vector_store")
+        for segment in self._segments():
+            if segment.embeddings is None:
+                segment.embeddings = self._embed(segment.documents)
+
+    def _embed(self, documents: List[Dict[str, Any]]) -> np.ndarray:
+        return l2_normalize(self.vector_store.generate_embeddings([document['text'] for document in documents]))
+
+    def warm_up(self) -> None:
+        """
+        Load the model, embed the documents and time one dense query, so budgeted
+        hybrid queries can use the dense path from the start (call once at startup).
+        """
+        self.search("resume", k=1, mode='dense')
+
+    def _dense_ready(self) -> bool:
+        """True when a dense query would not have to load the model or embed the documents."""
+        return self.vector_store is not None and self.vector_store._embedding_model is not None \
+            and all(segment.embeddings is not None for segment in self._segments())
+
+    def _lexical_scores(self, query: str, segments: List[Segment], lives: List[np.ndarray]) -> np.ndarray:
+        """
+        BM25 over all segments at once, with document frequencies, document count and
+        average length taken from the live chunks only (the scores of a full rebuild).
+        """
+        offsets = np.cumsum([0] + [len(segment) for segment in segments])
+        scores = np.zeros(offsets[-1], dtype=np.float32)
+        n_live = sum(int(live.sum()) for live in lives)
+        if n_live == 0:
+            return scores
+        total_length = sum(float(segment.bm25.doc_lengths[live].sum()) for segment, live in zip(segments, lives))
+        average_length = max(total_length / n_live, 1.0)
+        for token in tokenize(query):
+            matches = []
+            for number, (segment, live) in enumerate(zip(segments, lives)):
+                docs, tfs = segment.bm25.postings(token)
+                keep = live[docs]
+                if keep.any():
+                    matches.append((number, docs[keep], tfs[keep]))
+            df = sum(len(docs) for _, docs, _ in matches)
+            if df == 0:
+                continue
+            idf = np.float32(np.log(1.0 + (n_live - df + 0.5) / (df + 0.5)))
+            for number, docs, tfs in matches:
+                scores[offsets[number] + docs] += segments[number].bm25.term_scores(docs, tfs, idf, average_length)
+        return scores
+
+    def _dense_scores(self, query: str, segments: List[Segment]) -> np.ndarray:
+        if any(segment.embeddings is None for segment in segments):
+            self.build_dense()
+        query_vector = l2_normalize(self.vector_store.generate_embeddings([query]))[0]
+        return np.concatenate([np.asarray(segment.embeddings) @ query_vector for segment in segments])
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        mode: str = 'hybrid',
+        budget_ms: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve the k best documents for a query.
+        Args:
+        query: free text, e.x. a missing skill or a resume weakness
+        k: number of documents to return
+        mode: 'hybrid' (BM25 + dense, RRF), 'lexical' (BM25 only, never touches the
+        embedding model) or 'dense'
+        budget_ms: latency budget for hybrid queries; the dense path is skipped when it
+        is not expected to fit (see last_query_stats['degraded'])
+        Returns: [{'id', 'text', 'metadata', 'score', 'lexical_rank', 'dense_rank'}], best first
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}. Expected one of {SEARCH_MODES}")
+        started = time.perf_counter()
+        stats: Dict[str, Any] = {'mode': mode, 'degraded': False, 'lexical_ms': 0.0, 'dense_ms': 0.0}
+        with self._lock:
+            segments = [self.base] + self.deltas
+            lives = [segment.live for segment in segments]
+        live = np.concatenate(lives)
+        rankings: Dict[str, List[int]] = {}
+        if mode in ('hybrid', 'lexical'):
+            lexical = self._lexical_scores(query, segments, lives)
+            rankings['lexical'] = rank(lexical, self.candidates, live & (lexical > 0))
+            stats['lexical_ms'] = (time.perf_counter() - started) * 1000
+        run_dense = mode == 'dense' or (mode == 'hybrid' and self.vector_store is not None)
+        if run_dense and mode == 'hybrid' and budget_ms is not None:
+            remaining = budget_ms - (time.perf_counter() - started) * 1000
+            expected = self.dense_ms_estimate if self._dense_ready() else None
+            if expected is None or expected > remaining:
+                run_dense = False
+                stats['degraded'] = True
+        if run_dense:
+            dense_started = time.perf_counter()
+            try:
+                rankings['dense'] = rank(self._dense_scores(query, segments), self.candidates, live)
+                dense_ms = (time.perf_counter() - dense_started) * 1000
+                stats['dense_ms'] = dense_ms
+                self.dense_ms_estimate = dense_ms if self.dense_ms_estimate is None \
+                    else 0.8 * self.dense_ms_estimate + 0.2 * dense_ms
+            except Exception as e:
+                logger.error(f"Error in dense knowledge base search, using lexical results: {str(e)}")
+                stats['degraded'] = True
+        #with a single ranking RRF keeps its order, and scores stay comparable across modes
+        fused = reciprocal_rank_fusion(list(rankings.values()), self.rrf_k)
+        ordered = sorted(fused, key=lambda doc_id: (-fused[doc_id], doc_id))[:k]
+        positions = {name: {doc_id: position + 1 for position, doc_id in enumerate(ranking)}
+                     for name, ranking in rankings.items()}
+        offsets = np.cumsum([0] + [len(segment) for segment in segments])
+        documents = {}
+        for doc_id in ordered:
+            number = int(np.searchsorted(offsets, doc_id, side='right')) - 1
+            documents[doc_id] = segments[number].documents[doc_id - offsets[number]]
+        results = [{
+            'id': documents[doc_id]['id'],
+            'text': documents[doc_id]['text'],
+            'metadata': documents[doc_id].get('metadata', {}),
+            'score': fused[doc_id],
+            'lexical_rank': positions.get('lexical', {}).get(doc_id),
+            'dense_rank': positions.get('dense', {}).get(doc_id)
+        } for doc_id in ordered]
+        stats['total_ms'] = (time.perf_counter() - started) * 1000
+        stats['used'] = sorted(rankings)
+        stats['segments'] = len(segments)
+        self.last_query_stats = stats
+        return results
+
+    def get_best_practices(self, query: str, k: int = 3, **kwargs: Any) -> List[str]:
+        """Texts of the k best documents, ready to be put into a prompt."""
+        return [result['text'] for result in self.search(query, k=k, **kwargs)]
+
+    def _tombstone(self, document_ids: List[str]) -> int:
+        """Mark the live chunks of these documents deleted (caller holds the lock)."""
+        rows_by_segment: Dict[int, Tuple[Segment, List[int]]] = {}
+        for document_id in document_ids:
+            for segment, row in self._chunk_rows.pop(document_id, []):
+                rows_by_segment.setdefault(id(segment), (segment, []))[1].append(row)
+        deleted = 0
+        for segment, rows in rows_by_segment.values():
+            live = segment.live.copy() #copy-on-write, see Segment
+            live[rows] = False
+            segment.live = live
+            deleted += len(rows)
+        return deleted
+
+    def add_documents(self, documents: List[Dict[str, Any]]) -> None:
+        """
+        Add documents, or update them if their id already exists: the old chunks are
+        tombstoned and the new ones go to a fresh delta segment (chunked like the base,
+        and embedded right away if the base already is, so the dense path stays warm).
+        """
+        if not documents:
+            return
+        chunks = chunk_documents(documents, self.max_tokens) if self.max_tokens else list(documents)
+        segment = Segment(chunks, BM25Index.build([chunk['text'] for chunk in chunks], self.bm25.k1, self.bm25.b))
+        if self.base.embeddings is not None and self.vector_store is not None:
+            segment.embeddings = self._embed(chunks)
+        with self._lock:
+            self._tombstone([document['id'] for document in documents])
+            self.deltas.append(segment)
+            self._index_rows([segment])
+            for document in documents:
+                self.document_hashes[document['id']] = document_hash(document)
+            self.update_stats['added'] += len(documents)
+        self._maybe_compact()
+
+    def delete_documents(self, document_ids: List[str]) -> int:
+        """Tombstone every chunk of these documents; returns the number of chunks removed."""
+        with self._lock:
+            deleted = self._tombstone(list(document_ids))
+            for document_id in document_ids:
+                self.document_hashes.pop(document_id, None)
+            self.update_stats['deleted'] += len(document_ids)
+        self._maybe_compact()
+        return deleted
+
+    def sync(self, documents: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Bring the knowledge base in line with the current source documents (e.x.
+        load_documents() after the content team edited data/knowledge_base): only new or
+        changed documents are re-indexed and missing ones are deleted.
+        """
+        current = {document['id']: document for document in documents}
+        changed = [document for document_id, document in current.items()
+                   if self.document_hashes.get(document_id) != document_hash(document)]
+        removed = [document_id for document_id in self.document_hashes if document_id not in current]
+        self.add_documents(changed)
+        self.delete_documents(removed)
+        return {'changed': len(changed), 'removed': len(removed)}
+
+    def _maybe_compact(self) -> None:
+        if self.max_deltas and len(self.deltas) >= self.max_deltas:
+            self.compact_in_background()
+
+    def compact_in_background(self) -> threading.Thread:
+        """Start compact() on a daemon thread (or return the one already running)."""
+        with self._lock:
+            if self._compaction is None or not self._compaction.is_alive():
+                self._compaction = threading.Thread(target=self.compact, name="kb-compaction", daemon=True)
+                self._compaction.start()
+            return self._compaction
+
+    def compact(self) -> None:
+        """
+        Fold the delta segments and tombstones into a new base segment. The new index is
+        built without holding the lock, so searches and writes carry on; writes that land
+        meanwhile (new deltas, new tombstones) are carried over when the base is swapped.
+        """
+        try:
+            with self._lock:
+                segments = [self.base] + self.deltas
+                lives = [segment.live for segment in segments]
+            if len(segments) == 1 and lives[0].all():
+                return
+            kept = [(segment, row) for segment, live in zip(segments, lives) for row in np.flatnonzero(live)]
+            chunks = [segment.documents[row] for segment, row in kept]
+            embeddings = None
+            if all(segment.embeddings is not None for segment in segments) and kept:
+                embeddings = np.vstack([np.asarray(segment.embeddings)[live] for segment, live in zip(segments, lives)])
+            base = Segment(chunks, BM25Index.build([chunk['text'] for chunk in chunks],
+                                                   self.base.bm25.k1, self.base.bm25.b), embeddings)
+            with self._lock:
+                #chunks tombstoned while the new base was being built
+                new_rows = {(id(segment), int(row)): position for position, (segment, row) in enumerate(kept)}
+                live = base.live.copy()
+                for segment, old_live in zip(segments, lives):
+                    if segment.live is not old_live:
+                        for row in np.flatnonzero(old_live & ~segment.live):
+                            live[new_rows[(id(segment), int(row))]] = False
+                base.live = live
+                self.base = base
+                self.deltas = self.deltas[len(segments) - 1:]
+                self._chunk_rows = {}
+                self._index_rows([self.base] + self.deltas)
+                self.update_stats['compactions'] += 1
+        except Exception as e:
+            logger.error(f"Error compacting knowledge base: {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Segment, tombstone and update counters."""
+        segments = self._segments()
+        stats: Dict[str, Any] = dict(self.update_stats)
+        stats['delta_segments'] = len(segments) - 1
+        stats['live_chunks'] = sum(int(segment.live.sum()) for segment in segments)
+        stats['tombstones'] = sum(int((~segment.live).sum()) for segment in segments)
+        stats['compacting'] = self._compaction is not None and self._compaction.is_alive()
+        return stats
+
+    @classmethod
+    def from_documents(
+        cls,
+        documents: List[Dict[str, Any]],
+        vector_store: Any = None,
+        max_tokens: int = 128,
+        **kwargs: Any
+    ) -> "KnowledgeBase":
+        """Chunk source documents (see chunk_documents) and index the chunks."""
+        knowledge_base = cls(chunk_documents(documents, max_tokens), vector_store, **kwargs)
+        knowledge_base.document_hashes = {document['id']: document_hash(document) for document in documents}
+        knowledge_base.max_tokens = max_tokens
+        return knowledge_base
+
+    def save_snapshot(self, root: str = DEFAULT_KB_SNAPSHOT_DIR) -> str:
+        """
+        Write a versioned snapshot under root and make it the CURRENT one. Pending deltas
+        are compacted and the documents embedded first (if a vector_store is set).
+        Returns the snapshot directory.
+        """
+        if self.deltas or not self.base.live.all():
+            self.compact()
+        if self.embeddings is None and self.vector_store is not None:
+            self.build_dense()
+        model_name = getattr(self.vector_store, 'model_name', None)
+        model_slug = re.sub(r'[^\w.-]+', '_', model_name or 'lexical')
+        snapshot_id = f"v{SNAPSHOT_FORMAT_VERSION}-{self.source_hash[:12]}-{model_slug}-{int(time.time() * 1000)}"
+        path = os.path.join(root, snapshot_id)
+        os.makedirs(path, exist_ok=True)
+        files = self.bm25.save(path)
+        with open(os.path.join(path, 'chunks.json'), 'w', encoding='utf-8') as chunks_file:
+            json.dump(self.documents, chunks_file)
+        files.append('chunks.json')
+        if self.embeddings is not None:
+            np.save(os.path.join(path, 'embeddings.npy'), np.ascontiguousarray(self.embeddings, dtype=np.float32))
+            files.append('embeddings.npy')
+        manifest = {
+            'format_version': SNAPSHOT_FORMAT_VERSION,
+            'snapshot_id': snapshot_id,
+            'model_name': model_name,
+            'dim': int(self.embeddings.shape[1]) if self.embeddings is not None else 0,
+            'content_hash': self.source_hash,
+            'document_hashes': self.document_hashes,
+            'max_tokens': self.max_tokens,
+            'chunks': len(self.documents),
+            'built_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'files': {name: file_sha256(os.path.join(path, name)) for name in files}
+        }
+        #manifest last (it marks a complete snapshot), then switch CURRENT with an atomic rename
+        with open(os.path.join(path, 'manifest.json'), 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        with open(os.path.join(root, 'CURRENT.tmp'), 'w', encoding='utf-8') as current_file:
+            current_file.write(snapshot_id)
+        os.replace(os.path.join(root, 'CURRENT.tmp'), os.path.join(root, 'CURRENT'))
+        return path
+
+    @classmethod
+    def load_snapshot(
+        cls,
+        root: str = DEFAULT_KB_SNAPSHOT_DIR,
+        vector_store: Any = None,
+        documents: Optional[List[Dict[str, Any]]] = None,
+        max_tokens: Optional[int] = None,
+        verify: bool = True,
+        **kwargs: Any
+    ) -> "KnowledgeBase":
+        """
+        Load the CURRENT snapshot under root with its arrays memory-mapped read-only.
+        Args:
+        vector_store: must use the model the snapshot was embedded with
+        documents: current source documents; their content hash must match the manifest
+        max_tokens: expected chunk size (None = not checked)
+        verify: check every file against its sha256 in the manifest
+        Raises StaleSnapshotError on any mismatch, FileNotFoundError if there is no snapshot.
+        """
+        with open(os.path.join(root, 'CURRENT'), 'r', encoding='utf-8') as current_file:
+            path = os.path.join(root, current_file.read().strip())
+        with open(os.path.join(path, 'manifest.json'), 'r', encoding='utf-8') as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+            raise StaleSnapshotError(f"Snapshot format {manifest.get('format_version')} is not {SNAPSHOT_FORMAT_VERSION}")
+        model_name = getattr(vector_store, 'model_name', None)
+        if model_name is not None and manifest['model_name'] not in (None, model_name):
+            raise StaleSnapshotError(f"Snapshot was embedded with {manifest['model_name']}, not {model_name}")
+        if documents is not None and manifest['content_hash'] != content_hash(documents):
+            raise StaleSnapshotError("Snapshot content hash does not match the source documents")
+        if max_tokens is not None and manifest['max_tokens'] != max_tokens:
+            raise StaleSnapshotError(f"Snapshot chunk size {manifest['max_tokens']} is not {max_tokens}")
+        if verify:
+            for name, expected in manifest['files'].items():
+                if file_sha256(os.path.join(path, name)) != expected:
+                    raise StaleSnapshotError(f"Snapshot file {name} does not match its manifest hash")
+        with open(os.path.join(path, 'chunks.json'), 'r', encoding='utf-8') as chunks_file:
+            chunks = json.load(chunks_file)
+        embeddings = None
+        if 'embeddings.npy' in manifest['files']:
+            embeddings = np.load(os.path.join(path, 'embeddings.npy'), mmap_mode='r')
+        knowledge_base = cls(chunks, vector_store, bm25=BM25Index.load(path), embeddings=embeddings, **kwargs)
+        knowledge_base.document_hashes = manifest['document_hashes']
+        knowledge_base.max_tokens = manifest['max_tokens']
+        knowledge_base.snapshot = manifest
+        return knowledge_base
+
+    @classmethod
+    def load_or_build(
+        cls,
+        vector_store: Any = None,
+        source_dir: str = DEFAULT_KB_SOURCE_DIR,
+        snapshot_dir: str = DEFAULT_KB_SNAPSHOT_DIR,
+        max_tokens: int = 128,
+        **kwargs: Any
+    ) -> "KnowledgeBase":
+        """
+        Startup path for workers: the snapshot if it is fresh, otherwise build in memory
+        (without writing, so workers never race on the snapshot directory; run the
+        offline build to refresh it). Falls back to DEFAULT_BEST_PRACTICES when the
+        source directory is empty or missing.
+        """
+        documents = load_documents(source_dir) or DEFAULT_BEST_PRACTICES
+        try:
+            return cls.load_snapshot(snapshot_dir, vector_store, documents, max_tokens, **kwargs)
+        except FileNotFoundError:
+            logger.info(f"No knowledge base snapshot in {snapshot_dir}, building in memory")
+        except StaleSnapshotError as e:
+            logger.warning(f"Knowledge base snapshot in {snapshot_dir} is stale, building in memory: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error loading knowledge base snapshot from {snapshot_dir}: {str(e)}")
+        return cls.from_documents(documents, vector_store, max_tokens, **kwargs)
+
+
+if __name__ == "__main__":
+    import sys
+    sys.path.append('.')
+    from src.database.vector_store import VectorStore
+    parser = argparse.ArgumentParser(description="Build a knowledge base snapshot")
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--source', default=DEFAULT_KB_SOURCE_DIR)
+    parser.add_argument('--out', default=DEFAULT_KB_SNAPSHOT_DIR)
+    parser.add_argument('--max-tokens', type=int, default=128)
+    args = parser.parse_args()
+    source_documents = load_documents(args.source) or DEFAULT_BEST_PRACTICES
+    built = KnowledgeBase.from_documents(source_documents, VectorStore(model_name=args.model), args.max_tokens)
+    snapshot_path = built.save_snapshot(args.out)
+    print(f"{len(source_documents)} documents -> {len(built)} chunks for {args.model} in {snapshot_path}")
@@ -0,0 +1,234 @@
+"""
+match_cache.py
+Cache of complete resume-job match results (VectorStore.match_resume_to_job).
+
+The same resume-job pair is scored again and again (page refreshes, several
+recruiters opening the same candidate). A cached result skips skill
+extraction, semantic matching, ATS scoring and recommendations entirely.
+
+Keys are a sha256 of (resume text hash, job hash, model name, scoring
+version): the job hash covers every field of the JobRequirements object, and
+SCORING_VERSION (scoring.py) is bumped whenever scores are computed
+differently, so a stale formula is never served. Results are stored as JSON
+(ResumeJobMatch.to_dict), which also means every hit returns a fresh object
+that callers are free to modify.
+
+Entries expire after ttl_seconds, and the least recently used ones are
+evicted past max_items. Backends:
+- 'memory': an OrderedDict LRU, private to the process
+- 'sqlite': a local SQLite file (WAL mode), shared by every worker process
+  on the host
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from src.database.schemas import ResumeJobMatch
+from src.models.scoring import SCORING_VERSION
+from src.utils.helpers import json_default
+
+logger = logging.getLogger(__name__)
+
+MATCH_CACHE_BACKENDS = ('memory', 'sqlite')
+DEFAULT_MATCH_CACHE_PATH = "./data/processed/match_cache.sqlite"
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def job_hash(job_requirements: Any) -> str:
+    """Hash of every field of a JobRequirements object."""
+    fields = vars(job_requirements) if hasattr(job_requirements, '__dict__') else repr(job_requirements)
+    return text_hash(json.dumps(fields, sort_keys=True, default=json_default))
+
+
+def match_cache_key(resume_text: str, job_requirements: Any, model_name: str,
+                    scoring_version: Any = SCORING_VERSION) -> str:
+    parts = [text_hash(resume_text), job_hash(job_requirements), model_name, str(scoring_version)]
+    return text_hash('\n'.join(parts))
+
+
+class MemoryBackend:
+    """In-process LRU of (stored at, JSON value)."""
+    def __init__(self, max_items: int):
+        self.max_items = max_items
+        self._items: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, min_stored_at: float) -> Optional[str]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            if entry[0] < min_stored_at: #expired
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, value: str, stored_at: float) -> int:
+        """Store a value; returns the number of entries evicted."""
+        with self._lock:
+            self._items[key] = (stored_at, value)
+            self._items.move_to_end(key)
+            evicted = 0
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SQLiteBackend:
+    """
+    Entries in a local SQLite file, shared across processes. Every process (and
+    thread) opens its own connection; a row's last access time drives LRU eviction.
+    """
+    def __init__(self, path: str, max_items: int):
+        self.path = path
+        self.max_items = max_items
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS match_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS match_cache_accessed ON match_cache (accessed_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        #a connection must not be used across a fork, so reconnect when the pid changes
+        if getattr(self._local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=10.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return self._local.connection
+
+    def get(self, key: str, min_stored_at: float) -> Optional[str]:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT value, stored_at FROM match_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < min_stored_at:
+                connection.execute("DELETE FROM match_cache WHERE key = ?", (key,))
+                return None
+            connection.execute("UPDATE match_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def put(self, key: str, value: str, stored_at: float) -> int:
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO match_cache (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, stored_at, stored_at)
+            )
+            count = connection.execute("SELECT COUNT(*) FROM match_cache").fetchone()[0]
+            if count <= self.max_items:
+                return 0
+            connection.execute(
+                "DELETE FROM match_cache WHERE key IN "
+                "(SELECT key FROM match_cache ORDER BY accessed_at LIMIT ?)", (count - self.max_items,)
+            )
+            return count - self.max_items
+
+    def clear(self) -> None:
+        with self._connection() as connection:
+            connection.execute("DELETE FROM match_cache")
+
+    def _after_fork(self) -> None:
+        #the parent's connections must not be used; _connection also checks the pid
+        self._local = threading.local()
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM match_cache").fetchone()[0]
+
+
+class MatchCache:
+    """TTL + size bounded cache of ResumeJobMatch results."""
+    def __init__(
+        self,
+        backend: str = 'memory',
+        path: Optional[str] = None,
+        ttl_seconds: float = 3600.0,
+        max_items: int = 10000
+    ):
+        """
+        Args:
+        backend: 'memory' (per process) or 'sqlite' (a file shared by worker processes)
+        path: SQLite file (default DEFAULT_MATCH_CACHE_PATH)
+        ttl_seconds: how long a result stays valid
+        max_items: entries kept before the least recently used are evicted
+        """
+        if backend not in MATCH_CACHE_BACKENDS:
+            raise ValueError(f"Unknown match cache backend: {backend}. Expected one of {MATCH_CACHE_BACKENDS}")
+        self.backend_name = backend
+        self.ttl_seconds = ttl_seconds
+        self.backend = MemoryBackend(max_items) if backend == 'memory' \
+            else SQLiteBackend(path or DEFAULT_MATCH_CACHE_PATH, max_items)
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'errors': 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def get(self, key: str) -> Optional[ResumeJobMatch]:
+        """The cached result for a key (see match_cache_key), or None if missing or expired."""
+        try:
+            value = self.backend.get(key, time.time() - self.ttl_seconds)
+        except Exception as e:
+            logger.error(f"Error reading match cache: {str(e)}")
+            self._count('errors')
+            value = None
+        if value is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return ResumeJobMatch.from_dict(json.loads(value))
+
+    def put(self, key: str, result: ResumeJobMatch) -> None:
+        try:
+            value = json.dumps(result.to_dict(), default=json_default)
+            self._count('evictions', self.backend.put(key, value, time.time()))
+            self._count('stores')
+        except Exception as e:
+            logger.error(f"Error writing match cache: {str(e)}")
+            self._count('errors')
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def _after_fork(self) -> None:
+        """Fresh locks (and connections) in a forked child."""
+        self._stats_lock = threading.Lock()
+        self.backend._after_fork()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats: Dict[str, Any] = dict(self.stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['backend'] = self.backend_name
+        stats['size'] = len(self.backend)
+        stats['ttl_seconds'] = self.ttl_seconds
+        return stats
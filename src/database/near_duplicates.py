@@ -0,0 +1,178 @@
+"""
+near_duplicates.py
+MinHash signatures and an LSH index for finding near-duplicate documents.
+
+Job feeds repost the same posting with small edits, and the same resume comes
+back with a changed line or two. Comparing a new document against every
+earlier one is O(n); MinHash + LSH makes it sub-linear:
+- a document is reduced to its set of word shingles (TextProcessor.get_shingles)
+- MinHash: num_perm hash functions (multiply-shift hashing of the crc32 of
+  each shingle), keeping the minimum per function. Two signatures agree in a
+  position with probability equal to the Jaccard similarity of the shingle sets
+- LSH: the signature is cut into `bands` bands of `rows` values; documents
+  sharing any whole band land in the same bucket and become candidates. A pair
+  with Jaccard similarity s is a candidate with probability 1 - (1 - s^rows)^bands,
+  a steep S-curve around (1 / bands)^(1 / rows) (~0.71 for 16 x 8)
+- candidates are confirmed by their estimated similarity before being reported
+
+NearDuplicateIndex stores one value per document (e.x. the JobRequirements
+and embedding computed for it), so a near-duplicate can reuse that work
+instead of recomputing it.
+"""
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.parser.text_processor import TextProcessor
+
+MAX_HASH = np.uint32(0xFFFFFFFF)
+
+
+class MinHasher:
+    """num_perm MinHash functions of the form ((a * x + b) mod 2^64) >> 32."""
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        generator = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        #a must be odd for multiply-shift hashing
+        self.a = generator.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = generator.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: Iterable[str]) -> np.ndarray:
+        """(num_perm,) uint32 signature; an empty shingle set gives all MAX_HASH."""
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64)
+        if len(hashes) == 0:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint32)
+        #uint64 arithmetic wraps around, which is the mod 2^64
+        with np.errstate(over='ignore'):
+            permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) >> np.uint64(32)
+        return permuted.min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def similarity(left: np.ndarray, right: np.ndarray) -> float:
+        """Estimated Jaccard similarity: the fraction of positions where the signatures agree."""
+        return float(np.mean(left == right))
+
+
+class LSHIndex:
+    """Banded LSH over MinHash signatures: key lookup by shared bands."""
+    def __init__(self, num_perm: int = 128, bands: int = 16):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[bytes, Set[Any]]] = [{} for _ in range(bands)]
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def insert(self, key: Any, signature: np.ndarray) -> None:
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, set()).add(key)
+
+    def remove(self, key: Any, signature: np.ndarray) -> None:
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del buckets[band_key]
+
+    def candidates(self, signature: np.ndarray) -> Set[Any]:
+        """Keys sharing at least one band with the signature."""
+        found: Set[Any] = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            found |= buckets.get(band_key, set())
+        return found
+
+
+class NearDuplicateIndex:
+    """
+    Remembers documents (with one value each) and finds earlier near-duplicates of
+    new ones. Thread-safe; the oldest documents are evicted past max_items.
+    """
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 3,
+        max_items: int = 100000
+    ):
+        """
+        Args:
+        threshold: min estimated Jaccard similarity of the shingle sets to count as a duplicate
+        num_perm / bands: MinHash signature length and LSH band count
+        shingle_size: words per shingle
+        max_items: documents kept before the oldest are evicted
+        """
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.max_items = max_items
+        self.hasher = MinHasher(num_perm)
+        self.lsh = LSHIndex(num_perm, bands)
+        self.text_processor = TextProcessor()
+        self._entries: "OrderedDict[Any, Tuple[np.ndarray, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {'lookups': 0, 'duplicates': 0, 'candidates': 0, 'added': 0,
+                                      'exact_hits': 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def signature(self, text: str) -> np.ndarray:
+        return self.hasher.signature(self.text_processor.get_shingles(text, self.shingle_size))
+
+    def find(self, text: str, signature: Optional[np.ndarray] = None) -> Optional[Tuple[Any, float, Any]]:
+        """
+        Best earlier near-duplicate of a text as (key, estimated similarity, value),
+        or None. Pass a precomputed signature to skip shingling the text again.
+        """
+        signature = self.signature(text) if signature is None else signature
+        best: Optional[Tuple[Any, float, Any]] = None
+        with self._lock:
+            self.stats['lookups'] += 1
+            candidates = self.lsh.candidates(signature)
+            self.stats['candidates'] += len(candidates)
+            for key in candidates:
+                candidate_signature, value = self._entries[key]
+                similarity = MinHasher.similarity(signature, candidate_signature)
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (key, similarity, value)
+            if best is not None:
+                self.stats['duplicates'] += 1
+        return best
+
+    def get(self, key: Any) -> Any:
+        """Value stored under exactly this key (e.x. the hash of the same text), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.stats['exact_hits'] += 1
+        return None if entry is None else entry[1]
+
+    def add(self, key: Any, text: str, value: Any = None, signature: Optional[np.ndarray] = None) -> None:
+        """Remember a document under key (replacing an earlier one with the same key)."""
+        signature = self.signature(text) if signature is None else signature
+        with self._lock:
+            if key in self._entries:
+                self.lsh.remove(key, self._entries.pop(key)[0])
+            self._entries[key] = (signature, value)
+            self.lsh.insert(key, signature)
+            self.stats['added'] += 1
+            while len(self._entries) > self.max_items:
+                old_key, (old_signature, _) = self._entries.popitem(last=False)
+                self.lsh.remove(old_key, old_signature)
+
+    def _after_fork(self) -> None:
+        """A lock held by another thread at fork time would stay locked forever in the child."""
+        self._lock = threading.Lock()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.stats)
+        stats['items'] = len(self._entries)
+        stats['avg_candidates'] = stats['candidates'] / max(1, stats['lookups'])
+        return stats
@@ -0,0 +1,161 @@
+"""
+quantization.py
+Compact storage for embeddings: float16 or per-vector-scaled int8.
+
+float16 halves the memory/disk footprint of float32 embeddings. int8 cuts it
+roughly by 4: every vector is stored as int8 codes plus one float32 scale
+(max(|x|) / 127), so a vector is approximately codes * scale.
+
+Searches run on the compact codes, and the best candidates can then be
+rescored with full-precision vectors (e.x. re-encoded texts or a float32
+matrix kept on disk) so the final top-k ranking matches exact search.
+rerank() does the rescoring for QuantizedVectors and for the Flat/IVF
+indexes in vector_index.py.
+"""
+from typing import Callable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.models.embeddings import l2_normalize, top_k_per_row
+
+QUANTIZATION_MODES = ('float32', 'float16', 'int8')
+
+#file suffix and numpy dtype used for each storage mode
+STORAGE_DTYPES = {
+    'float32': np.float32,
+    'float16': np.float16,
+    'int8': np.int8
+}
+
+
+def quantize(vectors: np.ndarray, mode: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Convert float vectors to the given storage mode.
+    Returns: (codes, scales). scales is None except for int8, where it holds one
+    float32 scale per vector.
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode: {mode}. Expected one of {QUANTIZATION_MODES}")
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    if mode == 'float32':
+        return vectors.copy(), None
+    if mode == 'float16':
+        return vectors.astype(np.float16), None
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize(codes: np.ndarray, scales: Optional[np.ndarray], mode: str) -> np.ndarray:
+    """Inverse of quantize (up to rounding error); always returns float32."""
+    if mode == 'int8':
+        return codes.astype(np.float32) * np.asarray(scales, dtype=np.float32)[:, None]
+    return np.array(codes, dtype=np.float32) #always a copy (codes may be a memmap view)
+
+
+FullPrecisionSource = Union[np.ndarray, Callable[[np.ndarray], np.ndarray]]
+
+
+def rerank(
+    queries: np.ndarray,
+    candidates: List[np.ndarray],
+    full_precision: FullPrecisionSource,
+    k: int
+) -> List[List[Tuple[int, float]]]:
+    """
+    Rescore the candidate rows of every query with full-precision vectors.
+    Args:
+    queries: (n_queries, dim) L2-normalized query vectors
+    candidates: per query, the row indexes found by the approximate search
+    full_precision: float32 vectors by row (e.x. an np.memmap), or a callable mapping
+    row indexes to float32 vectors
+    k: number of results per query
+    Returns: per query, a list of (row index, exact cosine score) sorted best first
+    """
+    results: List[List[Tuple[int, float]]] = []
+    for query, rows in zip(queries, candidates):
+        rows = np.sort(np.asarray(rows, dtype=np.int64)) #sequential reads from a memory map
+        if rows.size == 0:
+            results.append([])
+            continue
+        if callable(full_precision):
+            exact_vectors = full_precision(rows)
+        else:
+            exact_vectors = np.asarray(full_precision[rows], dtype=np.float32)
+        exact = l2_normalize(exact_vectors) @ query
+        order = np.argsort(-exact, kind='stable')[:k]
+        results.append([(int(rows[i]), float(exact[i])) for i in order])
+    return results
+
+
+class QuantizedVectors:
+    """
+    An append-only set of L2-normalized vectors stored in a compact dtype,
+    searchable by cosine similarity with optional full-precision rescoring.
+    """
+    def __init__(self, dim: int, mode: str = 'int8'):
+        if mode not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization mode: {mode}. Expected one of {QUANTIZATION_MODES}")
+        self.dim = dim
+        self.mode = mode
+        self.codes = np.zeros((0, dim), dtype=STORAGE_DTYPES[mode])
+        self.scales = np.zeros(0, dtype=np.float32) if mode == 'int8' else None
+
+    def __len__(self) -> int:
+        return self.codes.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the stored codes (and scales)."""
+        total = self.codes.nbytes
+        if self.scales is not None:
+            total += self.scales.nbytes
+        return total
+
+    def add(self, vectors: np.ndarray) -> None:
+        """Normalize, quantize and append vectors."""
+        codes, scales = quantize(l2_normalize(vectors), self.mode)
+        self.codes = np.vstack([self.codes, codes])
+        if self.scales is not None:
+            self.scales = np.concatenate([self.scales, scales])
+
+    def approximate_scores(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine scores of full-precision queries against the compact vectors."""
+        queries = l2_normalize(queries)
+        if self.mode == 'int8':
+            #(q . codes) * scale == q . (codes * scale): one scale multiply per vector
+            return (queries @ self.codes.T.astype(np.float32)) * self.scales[None, :]
+        return queries @ self.codes.T.astype(np.float32)
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        full_precision: Optional[FullPrecisionSource] = None,
+        rerank_factor: int = 4
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Top-k search for every query.
+        Args:
+        queries: (n_queries, dim) full-precision query vectors
+        k: number of results per query
+        full_precision: float32 vectors in the same row order (e.x. an np.memmap),
+        or a callable mapping row indexes to float32 vectors. If given, the best
+        k * rerank_factor approximate candidates are rescored exactly.
+        rerank_factor: how many extra candidates to rescore per result
+        Returns: per query, a list of (row index, cosine score) sorted best first
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        if len(self) == 0:
+            return [[] for _ in range(queries.shape[0])]
+        approximate = self.approximate_scores(queries)
+        if full_precision is None:
+            return top_k_per_row(approximate, k)
+        candidates = top_k_per_row(approximate, k * max(1, rerank_factor))
+        rows = [np.array([index for index, _ in hits], dtype=np.int64) for hits in candidates]
+        return rerank(l2_normalize(queries), rows, full_precision, k)
@@ -0,0 +1,335 @@
+"""
+schemas.py
+Result types for resume-job matching.
+
+MatchResult and ResumeJobMatch describe one resume-job pair. For bulk runs
+(thousands of resumes x hundreds of jobs) building those objects for every
+pair means millions of small allocations, so BatchMatchResults stores a whole
+batch column-wise (struct of arrays):
+- one NumPy array per per-pair field (scores, ratios, experience numbers)
+- ragged per-pair lists (skill entries, resume skills, recommendations) as one
+  flat array plus an offsets array (pair i owns offsets[i]:offsets[i + 1])
+- every string (skill names, recommendations, levels) stored once in a string
+  table and referenced by int32 ids
+
+results[i] lazily rebuilds the usual ResumeJobMatch for row i. A batch
+serializes to a compact binary file (an .npz archive of the arrays, with the
+string table as UTF-8 JSON bytes; no pickle).
+"""
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from src.models.scoring import EXPERIENCE_LEVELS
+
+
+class MatchResult: 
+    """Data class for storing match results."""
+    __slots__ = ('skill', 'similarity_score', 'resume_text', 'job_requirement', 'match_type')
+
+    def __init__(
+        self, 
+        skill: str, 
+        similarity_score: float, 
+        resume_text: str, 
+        job_requirement: str, 
+        match_type: str #'exact', 'semantic', 'partial'
+    ):
+        self.skill = skill
+        self.similarity_score = similarity_score
+        self.resume_text = resume_text
+        self.job_requirement = job_requirement
+        self.match_type = match_type
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MatchResult":
+        return cls(**data)
+
+class ResumeJobMatch: 
+    """Comprehensive matching results between resume and job."""
+    __slots__ = ('overall_match_score', 'skills_analysis', 'experience_match', 'missing_skills',
+                 'matching_skills', 'recommendations', 'ats_score')
+
+    def __init__(
+        self,
+        overall_match_score: float,
+        skills_analysis: Dict[str, Any],
+        experience_match: Dict[str, Any],
+        missing_skills: List[str],
+        matching_skills: List[MatchResult],
+        recommendations: List[str],
+        ats_score: float
+    ):
+        self.overall_match_score = overall_match_score
+        self.skills_analysis = skills_analysis
+        self.experience_match = experience_match
+        self.missing_skills = missing_skills
+        self.matching_skills = matching_skills
+        self.recommendations = recommendations
+        self.ats_score = ats_score
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dicts / lists / numbers only (JSON-serializable, e.x. for MatchCache)."""
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['matching_skills'] = [match.to_dict() for match in self.matching_skills]
+        data['skills_analysis'] = dict(self.skills_analysis)
+        if 'matching_skills' in self.skills_analysis:
+            data['skills_analysis']['matching_skills'] = [
+                match.to_dict() for match in self.skills_analysis['matching_skills']
+            ]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResumeJobMatch":
+        data = dict(data)
+        data['matching_skills'] = [MatchResult.from_dict(match) for match in data['matching_skills']]
+        data['skills_analysis'] = dict(data['skills_analysis'])
+        if 'matching_skills' in data['skills_analysis']:
+            data['skills_analysis']['matching_skills'] = [
+                MatchResult.from_dict(match) for match in data['skills_analysis']['matching_skills']
+            ]
+        return cls(**data)
+
+#codes used in the skill entry columns
+MATCH_TYPES = ('exact', 'semantic', 'partial', 'missing')
+REQUIREMENTS = ('required', 'preferred')
+
+#per-pair columns and their dtypes (scores are stored as float32)
+PAIR_COLUMNS: Dict[str, Any] = {
+    'resume_index': np.int32,
+    'job_index': np.int32,
+    'valid': np.bool_, #False for the empty result returned when matching failed
+    'overall_match_score': np.float32,
+    'ats_score': np.float32,
+    'skills_score': np.float32,
+    'semantic_similarity': np.float32,
+    'required_match_ratio': np.float32,
+    'preferred_match_ratio': np.float32,
+    'experience_score': np.float32,
+    'resume_years': np.float32,
+    'required_years': np.float32, #-1 = not specified
+    'resume_level': np.int8, #rank in EXPERIENCE_LEVELS
+    'required_level': np.int32, #string id
+    'meets_years_requirement': np.bool_,
+    'meets_level_requirement': np.bool_
+}
+#ragged columns: name -> (offsets column, value columns and dtypes)
+RAGGED_COLUMNS: Dict[str, Dict[str, Any]] = {
+    'skill': { #every job skill, in job order: matched or missing
+        'skill_name': np.int32, #string id
+        'skill_requirement': np.int8, #index in REQUIREMENTS
+        'skill_match_type': np.int8, #index in MATCH_TYPES
+        'skill_resume_text': np.int32, #string id of the matching resume skill, -1 if missing
+        'skill_similarity': np.float32
+    },
+    'resume_skill': {'resume_skill': np.int32},
+    'recommendation': {'recommendation': np.int32}
+}
+
+
+class BatchMatchResults:
+    """Columnar (struct of arrays) results of matching many resume-job pairs."""
+    def __init__(self, columns: Dict[str, np.ndarray], strings: List[str]):
+        self.columns = columns
+        self.strings = strings
+
+    def __len__(self) -> int:
+        return len(self.columns['overall_match_score'])
+
+    def __getitem__(self, row: int) -> ResumeJobMatch:
+        return self.row(row)
+
+    def __iter__(self) -> Iterator[ResumeJobMatch]:
+        for row in range(len(self)):
+            yield self.row(row)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the arrays (the string table not included)."""
+        return sum(array.nbytes for array in self.columns.values())
+
+    def _ragged(self, name: str, row: int) -> slice:
+        offsets = self.columns[f'{name}_offsets']
+        return slice(int(offsets[row]), int(offsets[row + 1]))
+
+    def row(self, row: int) -> ResumeJobMatch:
+        """Rebuild the ResumeJobMatch of one pair (a lazy view; nothing is cached)."""
+        if row < 0:
+            row += len(self)
+        columns, strings = self.columns, self.strings
+        recommendations = [strings[i] for i in columns['recommendation'][self._ragged('recommendation', row)]]
+        if not columns['valid'][row]:
+            return ResumeJobMatch(0.0, {}, {}, [], [], recommendations, 0.0)
+        skills = self._ragged('skill', row)
+        matching_skills: List[MatchResult] = []
+        groups: Dict[str, List[str]] = {'required': [], 'preferred': [], 'missing_required': [],
+                                        'missing_preferred': []}
+        for name, requirement, match_type, resume_text, similarity in zip(
+            columns['skill_name'][skills], columns['skill_requirement'][skills],
+            columns['skill_match_type'][skills], columns['skill_resume_text'][skills],
+            columns['skill_similarity'][skills]
+        ):
+            skill, requirement = strings[name], REQUIREMENTS[requirement]
+            groups[requirement].append(skill)
+            if MATCH_TYPES[match_type] == 'missing':
+                groups[f'missing_{requirement}'].append(skill)
+            else:
+                matching_skills.append(MatchResult(
+                    skill, float(similarity), strings[resume_text], requirement, MATCH_TYPES[match_type]
+                ))
+        missing_skills = groups['missing_required'] + groups['missing_preferred']
+        skills_analysis = {
+            'required_skills': groups['required'],
+            'preferred_skills': groups['preferred'],
+            'resume_skills': [strings[i] for i in columns['resume_skill'][self._ragged('resume_skill', row)]],
+            'matching_skills': matching_skills,
+            'missing_skills': missing_skills,
+            'missing_required_skills': groups['missing_required'],
+            'missing_preferred_skills': groups['missing_preferred'],
+            'required_match_ratio': float(columns['required_match_ratio'][row]),
+            'preferred_match_ratio': float(columns['preferred_match_ratio'][row]),
+            'skills_score': float(columns['skills_score'][row]),
+            'semantic_similarity': float(columns['semantic_similarity'][row])
+        }
+        required_years = float(columns['required_years'][row])
+        experience_match = {
+            'resume_years': float(columns['resume_years'][row]),
+            'required_years': None if required_years < 0 else int(required_years),
+            'resume_level': EXPERIENCE_LEVELS[int(columns['resume_level'][row])],
+            'required_level': strings[int(columns['required_level'][row])],
+            'meets_years_requirement': bool(columns['meets_years_requirement'][row]),
+            'meets_level_requirement': bool(columns['meets_level_requirement'][row]),
+            'experience_score': float(columns['experience_score'][row])
+        }
+        return ResumeJobMatch(
+            overall_match_score=float(columns['overall_match_score'][row]),
+            skills_analysis=skills_analysis,
+            experience_match=experience_match,
+            missing_skills=missing_skills,
+            matching_skills=matching_skills,
+            recommendations=recommendations,
+            ats_score=float(columns['ats_score'][row])
+        )
+
+    def to_bytes(self, compress: bool = True) -> bytes:
+        """Serialize to an .npz archive (arrays + UTF-8 JSON string table)."""
+        buffer = io.BytesIO()
+        strings = np.frombuffer(json.dumps(self.strings).encode('utf-8'), dtype=np.uint8)
+        save = np.savez_compressed if compress else np.savez
+        save(buffer, __strings__=strings, **self.columns)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BatchMatchResults":
+        with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+            columns = {name: archive[name] for name in archive.files if name != '__strings__'}
+            strings = json.loads(archive['__strings__'].tobytes().decode('utf-8'))
+        return cls(columns, strings)
+
+    def save(self, path: str, compress: bool = True) -> None:
+        """Write the batch to a binary file (e.x. 'batch_run.npz')."""
+        with open(path, 'wb') as output_file:
+            output_file.write(self.to_bytes(compress))
+
+    @classmethod
+    def load(cls, path: str) -> "BatchMatchResults":
+        with open(path, 'rb') as input_file:
+            return cls.from_bytes(input_file.read())
+
+
+class BatchMatchBuilder:
+    """Appends ResumeJobMatch results to growing columns; build() returns BatchMatchResults."""
+    def __init__(self):
+        self._values: Dict[str, list] = {name: [] for name in PAIR_COLUMNS}
+        for name, ragged_columns in RAGGED_COLUMNS.items():
+            self._values[f'{name}_offsets'] = [0]
+            for column in ragged_columns:
+                self._values[column] = []
+        self._strings: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._values['overall_match_score'])
+
+    def _string_id(self, text: Optional[str]) -> int:
+        if text is None:
+            return -1
+        if text not in self._strings:
+            self._strings[text] = len(self._strings)
+        return self._strings[text]
+
+    def _close_ragged(self) -> None:
+        for name, ragged_columns in RAGGED_COLUMNS.items():
+            first_column = next(iter(ragged_columns))
+            self._values[f'{name}_offsets'].append(len(self._values[first_column]))
+
+    def add(self, match: ResumeJobMatch, resume_index: int = -1, job_index: int = -1) -> None:
+        """Append one pair's result (the object itself is not kept)."""
+        self.add_analysis(match.skills_analysis, match.experience_match, match.overall_match_score,
+                          match.ats_score, match.recommendations, resume_index, job_index)
+
+    def add_analysis(self, analysis: Dict[str, Any], experience: Dict[str, Any], overall_match_score: float,
+                     ats_score: float, recommendations: List[str], resume_index: int = -1,
+                     job_index: int = -1) -> None:
+        """
+        Append one pair from the parts of a ResumeJobMatch (the skills analysis and experience
+        match dicts of VectorStore), so a batch never has to build the object.
+        Empty dicts mean the match failed (see BatchMatchResults.row).
+        """
+        values = self._values
+        valid = bool(analysis) and bool(experience)
+        values['resume_index'].append(resume_index)
+        values['job_index'].append(job_index)
+        values['valid'].append(valid)
+        values['overall_match_score'].append(overall_match_score)
+        values['ats_score'].append(ats_score)
+        values['recommendation'].extend(self._string_id(text) for text in recommendations)
+        if not valid:
+            for name in ('skills_score', 'semantic_similarity', 'required_match_ratio',
+                         'preferred_match_ratio', 'experience_score', 'resume_years'):
+                values[name].append(0.0)
+            values['required_years'].append(-1)
+            values['resume_level'].append(0)
+            values['required_level'].append(self._string_id(''))
+            values['meets_years_requirement'].append(False)
+            values['meets_level_requirement'].append(False)
+            self._close_ragged()
+            return
+        for name in ('skills_score', 'semantic_similarity', 'required_match_ratio', 'preferred_match_ratio'):
+            values[name].append(analysis[name])
+        values['experience_score'].append(experience['experience_score'])
+        values['resume_years'].append(experience['resume_years'])
+        required_years = experience['required_years']
+        values['required_years'].append(-1 if required_years is None else required_years)
+        values['resume_level'].append(EXPERIENCE_LEVELS.index(experience['resume_level']))
+        values['required_level'].append(self._string_id(experience['required_level']))
+        values['meets_years_requirement'].append(experience['meets_years_requirement'])
+        values['meets_level_requirement'].append(experience['meets_level_requirement'])
+        matched = {(result.skill, result.job_requirement): result for result in analysis['matching_skills']}
+        for requirement in REQUIREMENTS:
+            for skill in analysis[f'{requirement}_skills']:
+                result = matched.get((skill, requirement))
+                values['skill_name'].append(self._string_id(skill))
+                values['skill_requirement'].append(REQUIREMENTS.index(requirement))
+                if result is None:
+                    values['skill_match_type'].append(MATCH_TYPES.index('missing'))
+                    values['skill_resume_text'].append(-1)
+                    values['skill_similarity'].append(0.0)
+                else:
+                    values['skill_match_type'].append(MATCH_TYPES.index(result.match_type))
+                    values['skill_resume_text'].append(self._string_id(result.resume_text))
+                    values['skill_similarity'].append(result.similarity_score)
+        values['resume_skill'].extend(self._string_id(skill) for skill in analysis['resume_skills'])
+        self._close_ragged()
+
+    def build(self) -> BatchMatchResults:
+        dtypes: Dict[str, Any] = dict(PAIR_COLUMNS)
+        for name, ragged_columns in RAGGED_COLUMNS.items():
+            dtypes[f'{name}_offsets'] = np.int64
+            dtypes.update(ragged_columns)
+        columns = {name: np.array(values, dtype=dtypes[name]) for name, values in self._values.items()}
+        return BatchMatchResults(columns, list(self._strings))
@@ -0,0 +1,131 @@
+"""
+sharded_embedding.py
+Multi-process embedding of large offline corpora.
+
+One encode call does not keep a many-core box busy, and several encode calls
+in one process fight over the same intra-op thread pool. embed_sharded
+splits the texts into shards and hands them to a pool of worker processes:
+- every worker loads the model once (pool initializer) and pins its
+  intra-op thread count (OMP/MKL/OpenBLAS env vars, plus torch.set_num_threads
+  when torch is used), so workers x threads does not oversubscribe the cores
+- every worker writes its shard's rows straight into one shared output
+  matrix, a memory-mapped .npy file, so no embeddings travel back through
+  pipes and the result never has to fit in RAM
+
+Workers are started with the 'spawn' method: forking a process that already
+holds a loaded model (and its threads) is unsafe.
+"""
+import logging
+import multiprocessing
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+#environment variables read by the BLAS / OpenMP thread pools at import time
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS')
+
+#per-worker state, set by _init_worker
+_worker_encoder: Any = None
+_worker_output: Optional[np.ndarray] = None
+
+
+def _init_worker(model_name: str, threads: int) -> None:
+    """Pool initializer: pin threads and load the encoder once per worker process."""
+    global _worker_encoder
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    from src.models.embeddings import SentenceTransformerEncoder, get_encoder
+    _worker_encoder = get_encoder(model_name)
+    if isinstance(_worker_encoder, SentenceTransformerEncoder):
+        import torch
+        torch.set_num_threads(threads)
+
+
+def _worker_dim(_: int) -> int:
+    """Embedding dimension, probed from a worker so the parent never loads the model."""
+    return int(_worker_encoder.encode(["probe"]).shape[1])
+
+
+def _encode_shard(task: Tuple[str, int, List[str]]) -> Tuple[int, int, float]:
+    """Encode one shard and write it into rows start:start + len(texts) of the output."""
+    global _worker_output
+    output_path, start, texts = task
+    if _worker_output is None:
+        _worker_output = np.load(output_path, mmap_mode='r+')
+    started = time.perf_counter()
+    _worker_output[start:start + len(texts)] = _worker_encoder.encode(texts)
+    return start, len(texts), time.perf_counter() - started
+
+
+def default_threads_per_worker(workers: int) -> int:
+    """Split the machine's cores evenly between the workers."""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def embed_sharded(
+    texts: List[str],
+    model_name: str,
+    output_path: str,
+    workers: int = 4,
+    threads_per_worker: Optional[int] = None,
+    shard_size: int = 512,
+    stats: Optional[Dict[str, Any]] = None
+) -> np.ndarray:
+    """
+    Embed texts with a pool of worker processes into a memory-mapped .npy file.
+    Args:
+    texts: texts to embed (row i of the output belongs to texts[i])
+    model_name: encoder name (see get_encoder), loaded once per worker
+    output_path: .npy file the (len(texts), dim) float32 matrix is written to
+    workers: number of worker processes
+    threads_per_worker: intra-op threads per worker (default: cores // workers)
+    shard_size: texts per task; smaller shards balance better, larger ones cost less overhead
+    stats: optional dict that receives timing numbers
+    Returns: the output matrix, opened read-only as a memory map
+    """
+    texts = list(texts)
+    threads = threads_per_worker or default_threads_per_worker(workers)
+    started = time.perf_counter()
+    #children inherit the environment at spawn time, before numpy/torch are imported,
+    #which is the only moment the BLAS thread pools read these variables
+    saved_env = {name: os.environ.get(name) for name in THREAD_ENV_VARS}
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    context = multiprocessing.get_context('spawn')
+    try:
+        with context.Pool(workers, initializer=_init_worker, initargs=(model_name, threads)) as pool:
+            dim = pool.map(_worker_dim, [0])[0]
+            output = np.lib.format.open_memmap(
+                output_path, mode='w+', dtype=np.float32, shape=(len(texts), dim)
+            )
+            del output #workers write through their own maps; this only sizes the file
+            ready = time.perf_counter()
+            tasks = [(output_path, start, texts[start:start + shard_size])
+                     for start in range(0, len(texts), shard_size)]
+            encode_seconds = 0.0
+            for _, _, seconds in pool.imap_unordered(_encode_shard, tasks):
+                encode_seconds += seconds
+    finally:
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    finished = time.perf_counter()
+    if stats is not None:
+        stats.update({
+            'texts': len(texts),
+            'workers': workers,
+            'threads_per_worker': threads,
+            'shards': len(tasks),
+            'startup_seconds': ready - started, #process spawn + model loads
+            'encode_seconds': finished - ready, #wall time of the sharded encode
+            'worker_encode_seconds': encode_seconds, #summed over workers
+            'texts_per_second': len(texts) / max(finished - ready, 1e-9)
+        })
+    logger.info(f"Embedded {len(texts)} texts with {workers} workers in {finished - started:.1f}s")
+    return np.load(output_path, mmap_mode='r')
@@ -0,0 +1,170 @@
+"""
+skill_matrix.py
+Precomputed embedding matrix of the skill taxonomy.
+
+Semantic skill matching compares short skill names ("postgresql" vs
+"postgres", "kubernetes" vs "k8s") over and over. Instead of embedding them
+per request, every taxonomy skill is embedded once by a build step and
+stored as an L2-normalized float32 matrix (matrix.npy, memory-mapped when
+loaded) with a name -> row index (skills.json). Skill-to-skill similarity is
+then a row lookup plus a small matrix multiply, with no model call.
+
+meta.json records the model name and a hash of the taxonomy; load_or_build
+rebuilds the matrix automatically when either one changes.
+
+Build it ahead of time from the project root, e.x.:
+python -m src.database.skill_matrix --model all-MiniLM-L6-v2
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.models.embeddings import l2_normalize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SKILL_MATRIX_DIR = "./data/processed/skill_matrix"
+
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase and collapse whitespace, so 'SQL  Server' and 'sql server' share a row."""
+    return re.sub(r'\s+', ' ', skill.strip().lower())
+
+
+def taxonomy_hash(skills: Iterable[str]) -> str:
+    """Order-independent fingerprint of a skill taxonomy."""
+    names = sorted({normalize_skill(skill) for skill in skills})
+    return hashlib.sha1('\n'.join(names).encode('utf-8')).hexdigest()
+
+
+class SkillMatrix:
+    """L2-normalized skill embeddings with a name -> row index."""
+    def __init__(self, skills: List[str], matrix: np.ndarray, model_name: str):
+        self.skills = skills
+        self.matrix = matrix #(len(skills), dim) float32, rows L2-normalized
+        self.model_name = model_name
+        self.rows: Dict[str, int] = {skill: row for row, skill in enumerate(skills)}
+        self.taxonomy_hash = taxonomy_hash(skills)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def __contains__(self, skill: str) -> bool:
+        return normalize_skill(skill) in self.rows
+
+    def lookup(self, skills: List[str]) -> np.ndarray:
+        """Row index of every skill, -1 for skills outside the taxonomy."""
+        return np.array([self.rows.get(normalize_skill(skill), -1) for skill in skills], dtype=np.int64)
+
+    def similarity(self, left: List[str], right: List[str]) -> np.ndarray:
+        """Cosine similarity matrix between two lists of taxonomy skills."""
+        left_rows, right_rows = self.lookup(left), self.lookup(right)
+        if (left_rows < 0).any() or (right_rows < 0).any():
+            raise KeyError("similarity() only accepts skills from the taxonomy")
+        return np.asarray(self.matrix[left_rows]) @ np.asarray(self.matrix[right_rows]).T
+
+    @staticmethod
+    def directory_for(root: str, model_name: str) -> str:
+        """One sub-directory per model (model names can contain '/')."""
+        return os.path.join(root, re.sub(r'[^\w.-]+', '_', model_name))
+
+    @classmethod
+    def build(
+        cls,
+        skills: Iterable[str],
+        encode_fn: Callable[[List[str]], np.ndarray],
+        model_name: str,
+        path: Optional[str] = None,
+        batch_size: int = 256
+    ) -> "SkillMatrix":
+        """
+        Embed every skill once (and save to `path` if given).
+        Args:
+        skills: the skill taxonomy (duplicates and case variants are merged)
+        encode_fn: embeds a list of texts, e.x. VectorStore.generate_embeddings
+        model_name: model behind encode_fn, recorded in meta.json
+        path: directory to write matrix.npy, skills.json and meta.json to
+        batch_size: skills per encode_fn call
+        """
+        names = sorted({normalize_skill(skill) for skill in skills if skill.strip()})
+        batches = [l2_normalize(encode_fn(names[start:start + batch_size]))
+                   for start in range(0, len(names), batch_size)]
+        matrix = np.vstack(batches) if batches else np.zeros((0, 0), dtype=np.float32)
+        skill_matrix = cls(names, matrix, model_name)
+        if path:
+            skill_matrix.save(path)
+        return skill_matrix
+
+    def save(self, path: str) -> None:
+        """Write matrix.npy, skills.json and meta.json (meta last, so it marks a complete build)."""
+        os.makedirs(path, exist_ok=True)
+        #temporary file + rename keeps an existing memory map of the old matrix valid
+        tmp_path = os.path.join(path, 'matrix.tmp.npy')
+        np.save(tmp_path, np.ascontiguousarray(self.matrix, dtype=np.float32))
+        os.replace(tmp_path, os.path.join(path, 'matrix.npy'))
+        with open(os.path.join(path, 'skills.json'), 'w', encoding='utf-8') as skills_file:
+            json.dump(self.skills, skills_file)
+        meta = {
+            'model_name': self.model_name,
+            'taxonomy_hash': self.taxonomy_hash,
+            'skills': len(self.skills),
+            'dim': int(self.matrix.shape[1]) if self.matrix.ndim == 2 else 0
+        }
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as meta_file:
+            json.dump(meta, meta_file)
+
+    @classmethod
+    def load(cls, path: str) -> "SkillMatrix":
+        """Load a saved matrix; the embeddings are memory-mapped, not read into memory."""
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as meta_file:
+            meta = json.load(meta_file)
+        with open(os.path.join(path, 'skills.json'), 'r', encoding='utf-8') as skills_file:
+            skills = json.load(skills_file)
+        matrix = np.load(os.path.join(path, 'matrix.npy'), mmap_mode='r')
+        if len(skills) != meta['skills'] or matrix.shape[0] != len(skills):
+            raise ValueError(f"Skill matrix at {path} is incomplete")
+        return cls(skills, matrix, meta['model_name'])
+
+    @classmethod
+    def load_or_build(
+        cls,
+        path: str,
+        skills: Iterable[str],
+        encode_fn: Callable[[List[str]], np.ndarray],
+        model_name: str
+    ) -> "SkillMatrix":
+        """
+        Load the matrix saved at `path` if it was built with the same model and the same
+        taxonomy, otherwise (missing, stale or unreadable) rebuild and save it.
+        """
+        skills = list(skills)
+        try:
+            skill_matrix = cls.load(path)
+            if skill_matrix.model_name == model_name and skill_matrix.taxonomy_hash == taxonomy_hash(skills):
+                return skill_matrix
+            logger.info(f"Skill matrix at {path} is stale (model or taxonomy changed), rebuilding")
+        except FileNotFoundError:
+            logger.info(f"No skill matrix at {path}, building it")
+        except Exception as e:
+            logger.error(f"Error loading skill matrix at {path}, rebuilding: {str(e)}")
+        return cls.build(skills, encode_fn, model_name, path)
+
+
+if __name__ == "__main__":
+    import sys
+    sys.path.append('.')
+    from src.database.vector_store import VectorStore
+    parser = argparse.ArgumentParser(description="Build the skill taxonomy embedding matrix")
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--out', default=DEFAULT_SKILL_MATRIX_DIR)
+    args = parser.parse_args()
+    store = VectorStore(model_name=args.model, skill_matrix_dir=args.out)
+    built = store.skill_matrix
+    print(f"{len(built)} skills x {built.matrix.shape[1]} dims for {args.model} "
+          f"in {SkillMatrix.directory_for(args.out, args.model)}")
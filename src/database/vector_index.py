@@ -0,0 +1,532 @@
+"""
+vector_index.py
+Pluggable vector index backends for VectorStore.
+
+Every backend implements the same small VectorIndex interface (add, search,
+contains, delete, save, load), so VectorStore can switch between:
+- ChromaIndex: the original ChromaDB collection (needs the chromadb package)
+- FlatIndex: exact brute-force cosine search in NumPy
+- IVFIndex: an in-process approximate nearest-neighbour index (inverted file,
+  i.e. k-means buckets) built on NumPy, for fast read-heavy top-k retrieval
+
+Flat and IVF indexes are saved as plain .npy files plus a JSON manifest and
+loaded back with np.load(mmap_mode='r'), so large indexes open instantly
+and their pages are shared between processes by the OS page cache.
+
+With a float16/int8 storage_dtype, searches scan the compact codes and the
+best k * rerank_factor candidates are rescored with a float32 copy of the
+vectors (quantization.rerank), so the top-k matches exact search. The
+float32 copy is saved as vectors.npy and memory-mapped on load, so only the
+rows being reranked are read.
+"""
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.database.quantization import QUANTIZATION_MODES, quantize, dequantize, rerank
+from src.models.embeddings import l2_normalize, top_k_per_row
+
+logger = logging.getLogger(__name__)
+
+#(id, cosine similarity) pairs, best first
+SearchResults = List[List[Tuple[str, float]]]
+
+
+class VectorIndex(ABC):
+    """Interface shared by all vector index backends."""
+
+    @abstractmethod
+    def add(self, ids: List[str], vectors: np.ndarray,
+            metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        Add vectors under the given ids. Ids that are already in the index are
+        skipped; to change the vector of an id, delete it first.
+        """
+
+    @abstractmethod
+    def search(self, queries: np.ndarray, k: int = 10) -> SearchResults:
+        """Top-k most similar ids for every query vector."""
+
+    @abstractmethod
+    def contains(self, ids: List[str]) -> List[bool]:
+        """Whether each id is already stored."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored vectors."""
+
+    def get_metadata(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Metadata stored with an id (None if unknown)."""
+        return None
+
+    def get_metadatas(self, ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """get_metadata for many ids (backends override it with one lookup)."""
+        return [self.get_metadata(item_id) for item_id in ids]
+
+    def find_ids(self, where: Dict[str, Any]) -> List[str]:
+        """Ids whose metadata has every key/value in where (e.x. {'resume_id': 'r1'})."""
+        raise NotImplementedError(f"{type(self).__name__} cannot filter by metadata")
+
+    def delete(self, ids: List[str]) -> None:
+        """Remove the given ids (unknown ids are ignored)."""
+        raise NotImplementedError(f"{type(self).__name__} cannot delete vectors")
+
+    def save(self, path: str) -> None:
+        """Persist the index to a directory (no-op for self-persisting backends)."""
+
+    @classmethod
+    def load(cls, path: str) -> "VectorIndex":
+        """Load an index saved with save()."""
+        raise NotImplementedError(f"{cls.__name__} cannot be loaded from disk")
+
+
+class FlatIndex(VectorIndex):
+    """Exact cosine search over all stored vectors (the recall baseline)."""
+    kind = 'flat'
+
+    def __init__(self, dim: Optional[int] = None, storage_dtype: str = 'float32', rerank_factor: int = 4):
+        """
+        Args:
+        dim: vector dimension (inferred from the first add if None)
+        storage_dtype: 'float32', 'float16' or 'int8' vector storage
+        rerank_factor: for float16/int8 storage, k * rerank_factor candidates are rescored
+        with full-precision vectors (0 = no float32 copy, search on the codes only)
+        """
+        if storage_dtype not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown storage dtype: {storage_dtype}")
+        self.dim = dim
+        self.storage_dtype = storage_dtype
+        self.rerank_factor = rerank_factor
+        #float32 copy of the rows, only kept for reranking a compact index
+        self.full_vectors: Optional[np.ndarray] = None
+        self.ids: List[str] = []
+        self._id_to_row: Dict[str, int] = {}
+        self.metadatas: Dict[str, Dict[str, Any]] = {}
+        self.codes: Optional[np.ndarray] = None
+        self.scales: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def contains(self, ids: List[str]) -> List[bool]:
+        return [item_id in self._id_to_row for item_id in ids]
+
+    def get_metadata(self, item_id: str) -> Optional[Dict[str, Any]]:
+        return self.metadatas.get(item_id)
+
+    def find_ids(self, where: Dict[str, Any]) -> List[str]:
+        return [item_id for item_id, metadata in self.metadatas.items()
+                if all(metadata.get(key) == value for key, value in where.items())]
+
+    def delete(self, ids: List[str]) -> None:
+        """Drop the rows of the given ids; the remaining rows are compacted (one copy)."""
+        rows = [self._id_to_row[item_id] for item_id in set(ids) if item_id in self._id_to_row]
+        if not rows:
+            return
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[rows] = False
+        self._keep_rows(keep)
+
+    def _keep_rows(self, keep: np.ndarray) -> None:
+        for row in np.flatnonzero(~keep):
+            self.metadatas.pop(self.ids[row], None)
+        self.ids = [item_id for item_id, kept in zip(self.ids, keep) if kept]
+        self._id_to_row = {item_id: row for row, item_id in enumerate(self.ids)}
+        self.codes = self.codes[keep]
+        if self.scales is not None:
+            self.scales = self.scales[keep]
+        if self.full_vectors is not None:
+            self.full_vectors = self.full_vectors[keep]
+
+    def _new_rows(self, ids: List[str], vectors: np.ndarray,
+                  metadatas: Optional[List[Dict[str, Any]]]) -> Tuple[List[str], np.ndarray]:
+        """Filter out known/duplicate ids, record metadata, return normalized new rows."""
+        vectors = l2_normalize(vectors)
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+        keep: List[int] = []
+        new_ids: List[str] = []
+        for position, item_id in enumerate(ids):
+            if item_id in self._id_to_row:
+                continue
+            self._id_to_row[item_id] = len(self.ids) + len(new_ids)
+            new_ids.append(item_id)
+            keep.append(position)
+            if metadatas and metadatas[position] is not None:
+                self.metadatas[item_id] = metadatas[position]
+        self.ids.extend(new_ids)
+        return new_ids, vectors[keep]
+
+    @property
+    def reranks(self) -> bool:
+        """Whether searches rescore their candidates with full-precision vectors."""
+        return self.storage_dtype != 'float32' and self.rerank_factor > 0
+
+    def _append_codes(self, rows: np.ndarray) -> None:
+        codes, scales = quantize(rows, self.storage_dtype)
+        self.codes = codes if self.codes is None else np.concatenate([self.codes, codes])
+        if scales is not None:
+            self.scales = scales if self.scales is None else np.concatenate([self.scales, scales])
+        if self.reranks:
+            rows = np.asarray(rows, dtype=np.float32)
+            full_vectors = [rows] if self.full_vectors is None else [self.full_vectors, rows]
+            self.full_vectors = np.concatenate(full_vectors)
+
+    def _rows(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Float32 vectors for the given row indexes (all rows if None)."""
+        codes = self.codes if rows is None else self.codes[rows]
+        scales = None
+        if self.scales is not None:
+            scales = self.scales if rows is None else self.scales[rows]
+        return dequantize(codes, scales, self.storage_dtype)
+
+    def add(self, ids: List[str], vectors: np.ndarray,
+            metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
+        new_ids, rows = self._new_rows(ids, vectors, metadatas)
+        if new_ids:
+            self._append_codes(rows)
+
+    def _score_all(self, queries: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+        """Cosine scores of normalized queries against every stored row."""
+        if self.storage_dtype == 'float32':
+            return queries @ np.asarray(self.codes).T
+        chunks = [queries @ self._rows(np.arange(start, min(start + chunk_size, len(self.ids)))).T
+                  for start in range(0, len(self.ids), chunk_size)]
+        return np.concatenate(chunks, axis=1)
+
+    def search(self, queries: np.ndarray, k: int = 10) -> SearchResults:
+        queries = l2_normalize(queries)
+        if not self.ids:
+            return [[] for _ in range(queries.shape[0])]
+        scores = self._score_all(queries)
+        if not self.reranks:
+            return [[(self.ids[row], score) for row, score in hits]
+                    for hits in top_k_per_row(scores, k)]
+        candidates = [np.array([row for row, _ in hits], dtype=np.int64)
+                      for hits in top_k_per_row(scores, k * self.rerank_factor)]
+        return [[(self.ids[row], score) for row, score in hits]
+                for hits in rerank(queries, candidates, self.full_vectors, k)]
+
+    def _manifest(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'dim': self.dim, 'storage_dtype': self.storage_dtype,
+                'count': len(self.ids), 'rerank_factor': self.rerank_factor,
+                'full_precision': self.full_vectors is not None}
+
+    def save(self, path: str) -> None:
+        """Write codes.npy (+ scales.npy, vectors.npy), ids.json, metadatas.json and manifest.json."""
+        os.makedirs(path, exist_ok=True)
+        if self.codes is not None:
+            _save_array(path, 'codes', np.ascontiguousarray(self.codes))
+        if self.scales is not None:
+            _save_array(path, 'scales', np.ascontiguousarray(self.scales))
+        if self.full_vectors is not None:
+            _save_array(path, 'vectors', np.ascontiguousarray(self.full_vectors))
+        self._save_json(path, self.ids, self.metadatas, self._manifest())
+
+    @staticmethod
+    def _save_json(path: str, ids: List[str], metadatas: Dict[str, Any],
+                   manifest: Dict[str, Any]) -> None:
+        with open(os.path.join(path, 'ids.json'), 'w', encoding='utf-8') as ids_file:
+            json.dump(ids, ids_file)
+        with open(os.path.join(path, 'metadatas.json'), 'w', encoding='utf-8') as meta_file:
+            json.dump(metadatas, meta_file)
+        #manifest last: a directory without a manifest is an incomplete save
+        with open(os.path.join(path, 'manifest.json'), 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file)
+
+    def _load_arrays(self, path: str, manifest: Dict[str, Any]) -> None:
+        """Shared loading of ids, metadata and memory-mapped codes/scales."""
+        with open(os.path.join(path, 'ids.json'), 'r', encoding='utf-8') as ids_file:
+            self.ids = json.load(ids_file)
+        with open(os.path.join(path, 'metadatas.json'), 'r', encoding='utf-8') as meta_file:
+            self.metadatas = json.load(meta_file)
+        self._id_to_row = {item_id: row for row, item_id in enumerate(self.ids)}
+        if manifest['count']:
+            self.codes = np.load(os.path.join(path, 'codes.npy'), mmap_mode='r')
+            if self.storage_dtype == 'int8':
+                self.scales = np.load(os.path.join(path, 'scales.npy'), mmap_mode='r')
+            if manifest.get('full_precision'):
+                self.full_vectors = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r')
+
+    @classmethod
+    def load(cls, path: str) -> "FlatIndex":
+        manifest = read_manifest(path)
+        index = cls(dim=manifest['dim'], storage_dtype=manifest['storage_dtype'],
+                    rerank_factor=manifest.get('rerank_factor', 0))
+        index._load_arrays(path, manifest)
+        return index
+
+
+class IVFIndex(FlatIndex):
+    """
+    Inverted-file approximate nearest-neighbour index.
+
+    Vectors are bucketed by their nearest k-means centroid (spherical k-means,
+    trained once enough vectors have arrived). A query is only compared against
+    the vectors in its `nprobe` closest buckets, so search cost is roughly
+    nprobe / nlist of a brute-force scan. Until the index is trained, search is
+    exact. Saved indexes store each bucket contiguously, so probing a bucket of
+    a memory-mapped index reads one sequential slice.
+
+    Buckets are retrained as the corpus grows: once the index holds
+    retrain_growth times the vectors it was last trained on, add() runs k-means
+    again (with nlist re-chosen as ~sqrt(n) unless it was fixed), so buckets do
+    not keep getting longer and queries do not drift back to a flat scan.
+    Geometric growth keeps the amortized retraining cost per added vector
+    constant. rebuild() retrains on demand, e.x. after a bulk load.
+    """
+    kind = 'ivf'
+
+    def __init__(self, dim: Optional[int] = None, nlist: Optional[int] = None,
+                 nprobe: int = 8, storage_dtype: str = 'float32',
+                 min_train_size: int = 2000, train_iterations: int = 10, seed: int = 0,
+                 retrain_growth: Optional[float] = 4.0, rerank_factor: int = 4):
+        """
+        Args:
+        dim: vector dimension (inferred from the first add if None)
+        nlist: number of buckets; default ~sqrt(n) chosen at training time
+        nprobe: buckets scanned per query (recall/latency trade-off)
+        storage_dtype: 'float32', 'float16' or 'int8' vector storage
+        min_train_size: number of vectors needed before buckets are trained
+        train_iterations: k-means iterations
+        retrain_growth: retrain once the index has grown this many times past the size it
+        was trained at (None = train once and never again)
+        rerank_factor: full-precision rescoring of float16/int8 candidates (see FlatIndex)
+        """
+        super().__init__(dim=dim, storage_dtype=storage_dtype, rerank_factor=rerank_factor)
+        self.nlist = nlist
+        self.auto_nlist = nlist is None #re-choose nlist at every (re)training
+        self.retrain_growth = retrain_growth
+        self.trained_size = 0
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.train_iterations = train_iterations
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        #rows of every bucket: bucket_rows[offsets[c]:offsets[c + 1]]
+        self._bucket_rows: Optional[np.ndarray] = None
+        self._offsets: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def add(self, ids: List[str], vectors: np.ndarray,
+            metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
+        new_ids, rows = self._new_rows(ids, vectors, metadatas)
+        if not new_ids:
+            return
+        self._append_codes(rows)
+        if self.is_trained and self.retrain_growth is not None \
+                and len(self.ids) >= self.retrain_growth * self.trained_size:
+            self.train()
+        elif self.is_trained:
+            self.assignments = np.concatenate([self.assignments, self._assign(rows)])
+            self._bucket_rows = None
+        elif len(self.ids) >= self.min_train_size:
+            self.train()
+
+    def _keep_rows(self, keep: np.ndarray) -> None:
+        super()._keep_rows(keep)
+        if self.is_trained:
+            self.assignments = np.asarray(self.assignments)[keep]
+            self._bucket_rows = None
+
+    def rebuild(self) -> None:
+        """Retrain the buckets on every stored vector now (nlist re-chosen unless fixed)."""
+        if len(self.ids) > 0:
+            self.train()
+
+    def train(self) -> None:
+        """Run spherical k-means on the stored vectors and bucket every vector."""
+        vectors = self._rows()
+        n = vectors.shape[0]
+        nlist = max(1, int(np.sqrt(n))) if self.auto_nlist or not self.nlist else self.nlist
+        nlist = min(nlist, n)
+        rng = np.random.default_rng(self.seed)
+        #train on a sample; ~50 points per centroid is plenty for bucketing
+        sample = vectors[rng.choice(n, size=min(n, 50 * nlist), replace=False)]
+        centroids = sample[rng.choice(sample.shape[0], size=nlist, replace=False)].copy()
+        for _ in range(self.train_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength=nlist) == 0
+            #re-seed empty buckets with random sample points
+            sums[empty] = sample[rng.choice(sample.shape[0], size=int(empty.sum()))]
+            centroids = l2_normalize(sums)
+        self.nlist = nlist
+        self.trained_size = n
+        self.centroids = centroids
+        self.assignments = self._assign(vectors)
+        self._bucket_rows = None
+        logger.info(f"Trained IVF index: {n} vectors in {nlist} buckets")
+
+    def _assign(self, vectors: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+        """Nearest centroid of every vector, in chunks to bound memory."""
+        labels = [np.argmax(vectors[start:start + chunk_size] @ self.centroids.T, axis=1)
+                  for start in range(0, vectors.shape[0], chunk_size)]
+        return np.concatenate(labels).astype(np.int32)
+
+    def _buckets(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(row order grouped by bucket, bucket offsets), rebuilt after adds."""
+        if self._bucket_rows is None:
+            self._bucket_rows = np.argsort(self.assignments, kind='stable')
+            counts = np.bincount(self.assignments, minlength=self.nlist)
+            self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        return self._bucket_rows, self._offsets
+
+    def search(self, queries: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> SearchResults:
+        if not self.is_trained:
+            return super().search(queries, k)
+        queries = l2_normalize(queries)
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        bucket_rows, offsets = self._buckets()
+        probes = top_k_per_row(queries @ self.centroids.T, nprobe)
+        results: SearchResults = []
+        for query, query_probes in zip(queries, probes):
+            rows = np.concatenate([bucket_rows[offsets[c]:offsets[c + 1]] for c, _ in query_probes])
+            if rows.size == 0:
+                results.append([])
+                continue
+            rows.sort() #sequential reads from a memory-mapped matrix
+            scores = self._rows(rows) @ query
+            if not self.reranks:
+                hits = top_k_per_row(scores.reshape(1, -1), k)[0]
+                results.append([(self.ids[rows[i]], score) for i, score in hits])
+                continue
+            candidates = rows[[i for i, _ in top_k_per_row(scores.reshape(1, -1), k * self.rerank_factor)[0]]]
+            hits = rerank(query.reshape(1, -1), [candidates], self.full_vectors, k)[0]
+            results.append([(self.ids[row], score) for row, score in hits])
+        return results
+
+    def _manifest(self) -> Dict[str, Any]:
+        manifest = super()._manifest()
+        manifest.update({'nlist': self.nlist, 'nprobe': self.nprobe,
+                         'min_train_size': self.min_train_size, 'trained': self.is_trained,
+                         'auto_nlist': self.auto_nlist, 'retrain_growth': self.retrain_growth,
+                         'trained_size': self.trained_size})
+        return manifest
+
+    def save(self, path: str) -> None:
+        """Save with rows reordered so every bucket is contiguous on disk."""
+        if not self.is_trained:
+            return super().save(path)
+        os.makedirs(path, exist_ok=True)
+        order, offsets = self._buckets()
+        _save_array(path, 'codes', np.ascontiguousarray(self.codes[order]))
+        if self.scales is not None:
+            _save_array(path, 'scales', np.ascontiguousarray(self.scales[order]))
+        if self.full_vectors is not None:
+            _save_array(path, 'vectors', np.ascontiguousarray(self.full_vectors[order]))
+        _save_array(path, 'centroids', self.centroids)
+        _save_array(path, 'assignments', self.assignments[order])
+        self._save_json(path, [self.ids[row] for row in order], self.metadatas, self._manifest())
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        manifest = read_manifest(path)
+        index = cls(dim=manifest['dim'], nlist=manifest['nlist'], nprobe=manifest['nprobe'],
+                    storage_dtype=manifest['storage_dtype'],
+                    min_train_size=manifest['min_train_size'],
+                    retrain_growth=manifest.get('retrain_growth', 4.0),
+                    rerank_factor=manifest.get('rerank_factor', 0))
+        index.auto_nlist = manifest.get('auto_nlist', False)
+        index.trained_size = manifest.get('trained_size', len(index.ids) if manifest['trained'] else 0)
+        index._load_arrays(path, manifest)
+        if manifest['trained']:
+            index.centroids = np.load(os.path.join(path, 'centroids.npy'))
+            index.assignments = np.load(os.path.join(path, 'assignments.npy'), mmap_mode='r')
+        return index
+
+
+class ChromaIndex(VectorIndex):
+    """Adapter exposing a ChromaDB collection through the VectorIndex interface."""
+    kind = 'chroma'
+
+    def __init__(self, collection: Any):
+        self.collection = collection
+
+    def __len__(self) -> int:
+        return self.collection.count()
+
+    def contains(self, ids: List[str]) -> List[bool]:
+        found = set(self.collection.get(ids=list(ids))['ids'])
+        return [item_id in found for item_id in ids]
+
+    def add(self, ids: List[str], vectors: np.ndarray,
+            metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
+        present = self.contains(ids)
+        keep = [i for i, is_present in enumerate(present) if not is_present]
+        if not keep:
+            return
+        vectors = l2_normalize(vectors)
+        kwargs: Dict[str, Any] = {
+            'ids': [ids[i] for i in keep],
+            'embeddings': vectors[keep].tolist()
+        }
+        if metadatas:
+            kwargs['metadatas'] = [metadatas[i] for i in keep]
+        self.collection.add(**kwargs)
+
+    def get_metadata(self, item_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_metadatas([item_id])[0]
+
+    def get_metadatas(self, ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        result = self.collection.get(ids=list(ids))
+        found = dict(zip(result['ids'], result.get('metadatas') or [None] * len(result['ids'])))
+        return [found.get(item_id) for item_id in ids]
+
+    def find_ids(self, where: Dict[str, Any]) -> List[str]:
+        if len(where) > 1:
+            where = {'$and': [{key: value} for key, value in where.items()]}
+        return list(self.collection.get(where=where)['ids'])
+
+    def delete(self, ids: List[str]) -> None:
+        if ids:
+            self.collection.delete(ids=list(ids))
+
+    def search(self, queries: np.ndarray, k: int = 10) -> SearchResults:
+        queries = l2_normalize(queries)
+        result = self.collection.query(query_embeddings=queries.tolist(), n_results=k)
+        #Chroma's default space is squared L2; for unit vectors d = 2 - 2cos
+        return [[(item_id, 1.0 - float(distance) / 2.0) for item_id, distance in zip(ids, distances)]
+                for ids, distances in zip(result['ids'], result['distances'])]
+
+    def save(self, path: str) -> None:
+        client = getattr(self.collection, '_client', None)
+        if client is not None and hasattr(client, 'persist'):
+            client.persist()
+
+
+def _save_array(path: str, name: str, array: np.ndarray) -> None:
+    """
+    Write <name>.npy via a temporary file + rename. Replacing the file atomically 
+    keeps any existing memory map of the old file valid (it holds the old inode), 
+    so an index loaded from `path` can be saved back to the same `path`.
+    """
+    tmp_path = os.path.join(path, f'{name}.tmp.npy')
+    np.save(tmp_path, array)
+    os.replace(tmp_path, os.path.join(path, f'{name}.npy'))
+
+
+INDEX_BACKENDS = {
+    'flat': FlatIndex,
+    'ivf': IVFIndex
+}
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    """Read the manifest.json of a saved Flat/IVF index."""
+    with open(os.path.join(path, 'manifest.json'), 'r', encoding='utf-8') as manifest_file:
+        return json.load(manifest_file)
+
+
+def load_index(path: str) -> VectorIndex:
+    """Load a saved Flat or IVF index, picking the class from its manifest."""
+    return INDEX_BACKENDS[read_manifest(path)['kind']].load(path)
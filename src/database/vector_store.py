@@ -15,50 +15,94 @@ areas of improvement, domain strength/weaknesses)
 
 import numpy as np
 import logging
-from typing import Dict, List, Tuple, Any, Optional
-from sentence_transformers import SentenceTransformer #uses pytorch 
-import chromadb 
-from chromadb.config import Settings
+from typing import Dict, Iterable, List, Set, Tuple, Any, Optional
+#note: sentence_transformers (uses pytorch) and chromadb are imported lazily inside 
+#_initialize_embedding_model (via get_encoder) / _initialize_vector_database, so importing this module 
+#(or constructing a VectorStore) stays cheap until the model is actually needed
+import copy
+import hashlib
+import heapq
 import os
 import re
-from src.database.job_analyzer import JobRequirements
+import threading
+import time
+import weakref
+from itertools import islice
+from src.database.job_analyzer import JobAnalyzer, JobRequirements
+from src.database.skill_matrix import DEFAULT_SKILL_MATRIX_DIR, SkillMatrix
+from src.database.sharded_embedding import embed_sharded
+from src.database.schemas import BatchMatchBuilder, BatchMatchResults, MatchResult, ResumeJobMatch
+from src.database.embedding_cache import EmbeddingCache
+from src.database.embedding_batcher import EmbeddingBatcher
+from src.database.near_duplicates import NearDuplicateIndex
+from src.database.match_cache import MatchCache, match_cache_key
+from src.models.embeddings import cosine_similarity_matrix, top_k_per_row, get_encoder, l2_normalize
+from src.database.vector_index import VectorIndex, ChromaIndex, INDEX_BACKENDS
+from src.utils.helpers import expand_keyword_pattern
+from src.models.ats_engine import ATSEngine
+from src.models.chunking import encode_sections
+from src.models.scoring import (
+    EXPERIENCE_LEVELS, LEVEL_RANKS, SCORING_VERSION, SkillBitsets, ats_score, ats_tokenize, count_phrases, 
+    estimate_level_rank, experience_score, experience_score_ranked, match_ratio, overall_score, 
+    skills_score
+)
 
 logger = logging.getLogger(__name__)
-class MatchResult: 
-    """Data class for storing match results."""
+class ResumeCorpus: 
+    """
+    Precomputed resume features for batch ranking (VectorStore.rank_resumes): 
+    normalized embeddings, skills as packed bitsets over a shared vocabulary, and 
+    experience estimates. Rows are in the same order as ids.
+    """
     def __init__(
-        self, 
-        skill: str, 
-        similarity_score: float, 
-        resume_text: str, 
-        job_requirement: str, 
-        match_type: str #'exact', 'semantic', 'partial'
-    ):
-        self.skill = skill
-        self.similarity_score = similarity_score
-        self.resume_text = resume_text
-        self.job_requirement = job_requirement
-        self.match_type = match_type
-
-class ResumeJobMatch: 
-    """Comprehensive matching results between resume and job."""
+        self,
+        ids: List[Any],
+        embeddings: np.ndarray,
+        skill_bits: np.ndarray,
+        skill_bitsets: SkillBitsets,
+        years: np.ndarray,
+        level_ranks: np.ndarray
+    ): 
+        self.ids = ids
+        self.embeddings = embeddings #(n, dim) float32, L2-normalized
+        self.skill_bits = skill_bits #(n, skill_bitsets.n_bytes) uint8
+        self.skill_bitsets = skill_bitsets
+        self.years = years #(n,) estimated years of experience
+        self.level_ranks = level_ranks #(n,) rank in EXPERIENCE_LEVELS
+
+    def __len__(self) -> int: 
+        return len(self.ids)
+
+class JobIndex: 
+    """
+    Precomputed job posting features for candidate mode (VectorStore.recommend_jobs): 
+    normalized job profile embeddings, required and preferred skills as packed bitsets 
+    over a shared vocabulary, and experience requirements. Rows are in the same order as ids.
+    """
     def __init__(
         self,
-        overall_match_score: float,
-        skills_analysis: Dict[str, Any],
-        experience_match: Dict[str, Any],
-        missing_skills: List[str],
-        matching_skills: List[MatchResult],
-        recommendations: List[str],
-        ats_score: float
-    ):
-        self.overall_match_score = overall_match_score
-        self.skills_analysis = skills_analysis
-        self.experience_match = experience_match
-        self.missing_skills = missing_skills
-        self.matching_skills = matching_skills
-        self.recommendations = recommendations
-        self.ats_score = ats_score
+        ids: List[Any],
+        jobs: List[Any],
+        embeddings: np.ndarray,
+        skill_bitsets: SkillBitsets,
+        required_bits: np.ndarray,
+        preferred_bits: np.ndarray,
+        required_years: np.ndarray,
+        required_level_ranks: np.ndarray
+    ): 
+        self.ids = ids
+        self.jobs = jobs #JobRequirements objects, for the full breakdown of the final top-k
+        self.embeddings = embeddings #(n, dim) float32, L2-normalized
+        self.skill_bitsets = skill_bitsets
+        self.required_bits = required_bits #(n, skill_bitsets.n_bytes) uint8
+        self.preferred_bits = preferred_bits #preferred skills that are not also required
+        self.required_counts = SkillBitsets.popcount(required_bits)
+        self.preferred_counts = SkillBitsets.popcount(preferred_bits)
+        self.required_years = required_years #(n,) 0 = not specified
+        self.required_level_ranks = required_level_ranks #(n,) -1 = not specified
+
+    def __len__(self) -> int: 
+        return len(self.ids)
 
 class VectorStore: 
     """
@@ -86,33 +130,425 @@ class VectorStore:
     as our default embedding model, unless otherwise specified.
 
     """
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self, 
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_dir: Optional[str] = "./data/processed/embedding_cache",
+        cache_size: int = 10000,
+        cache_storage_dtype: str = 'float32',
+        index_backend: str = 'chroma',
+        index_dir: Optional[str] = None,
+        index_storage_dtype: str = 'float32',
+        index_rerank_factor: int = 4,
+        batching: bool = False,
+        max_batch_size: int = 64,
+        max_batch_wait_ms: float = 5.0,
+        skill_matrix_dir: Optional[str] = DEFAULT_SKILL_MATRIX_DIR,
+        near_duplicate_threshold: Optional[float] = 0.9,
+        match_cache_backend: Optional[str] = 'memory',
+        match_cache_path: Optional[str] = None,
+        match_cache_ttl: float = 3600.0,
+        match_cache_size: int = 10000,
+        lazy: bool = True,
+        warm_up: bool = False
+    ):
         """
         Initialize vector store with sentence transformer model. 
-        Args: model_name: HuggingFace model name for embeddings.
+        Args: 
+        model_name: HuggingFace model name for embeddings, or "hashing" / 
+        "hashing-<dim>" for the offline hashing encoder (no torch, no model files)
+        cache_dir: directory of the persistent embedding cache (None = in-memory only)
+        cache_size: max number of embeddings kept in the in-memory LRU
+        cache_storage_dtype: 'float32', 'float16' or 'int8' rows in the persistent 
+        embedding cache (see quantization.py)
+        index_backend: where stored embeddings live and are searched: 'chroma' (the 
+        resume_job_matching collection), or the in-process NumPy backends 'flat' 
+        (exact) and 'ivf' (approximate), which do not need chromadb (see vector_index.py)
+        index_dir: directory a 'flat'/'ivf' index is loaded from (if it exists) and 
+        saved to by save_index()
+        index_storage_dtype: 'float32', 'float16' or 'int8' vectors in a new 'flat'/'ivf' 
+        index (a loaded index keeps its own)
+        index_rerank_factor: searches of a float16/int8 index rescore k * index_rerank_factor 
+        candidates with full-precision vectors (0 = no rescoring), see vector_index.py
+        batching: if True, cache misses from concurrent callers are merged into shared 
+        encode calls by an EmbeddingBatcher (see embedding_batcher.py)
+        max_batch_size / max_batch_wait_ms: batching limits (tunable later through 
+        self.batcher.configure and reported by get_metrics)
+        skill_matrix_dir: where the precomputed skill taxonomy embeddings are kept 
+        (see skill_matrix.py); rebuilt there automatically when the model or taxonomy 
+        changes. None = build in memory on first use, without saving
+        near_duplicate_threshold: estimated shingle Jaccard similarity at which embed_resumes 
+        reuses the embedding of an earlier near-duplicate resume (see near_duplicates.py); 
+        analyze_job only reuses the analysis of the exact same posting. None = off
+        match_cache_backend: where match_resume_to_job results are cached: 'memory', 
+        'sqlite' (a file at match_cache_path shared by worker processes) or None (off); 
+        see match_cache.py
+        match_cache_ttl / match_cache_size: seconds a cached result stays valid and max 
+        number of cached results
+        lazy: if True (default), the embedding model and the Chroma client are only 
+        created on first use instead of here
+        warm_up: if True, start loading the embedding model in a background thread 
+        right away (see start_warm_up)
 
         HuggingFace: a python-based open-source library (platform) 
         where devs can share pre-trained ML models 
         """
+        self._created_at = time.perf_counter()
         self.model_name = model_name
-        self.embedding_model = None
-        self.chroma_client = None
-        self.collection = None
+        self._embedding_model = None
+        self._chroma_client = None
+        self._collection = None
+        if index_backend != 'chroma' and index_backend not in INDEX_BACKENDS: 
+            raise ValueError(f"Unknown index backend: {index_backend}")
+        if index_backend == 'chroma' and index_storage_dtype != 'float32': 
+            raise ValueError("index_storage_dtype only applies to the 'flat' and 'ivf' backends")
+        self.index_backend = index_backend
+        self.index_dir = index_dir
+        self.index_storage_dtype = index_storage_dtype
+        self.index_rerank_factor = index_rerank_factor
+        self._index: Optional[VectorIndex] = None
+        self.skill_matrix_dir = skill_matrix_dir
+        self._skill_matrix: Optional[SkillMatrix] = None
+        #guards lazy initialization so concurrent first requests load the model once
+        self._init_lock = threading.RLock()
+        self._warm_up_thread: Optional[threading.Thread] = None
+        self.metrics: Dict[str, Optional[float]] = {
+            'model_load_seconds': None,
+            'vector_db_init_seconds': None,
+            'time_to_first_request_seconds': None
+        }
+        #timings of the last embed_corpus run (see sharded_embedding.py)
+        self.sharding_stats: Dict[str, Any] = {}
+        #running totals of embed_sections (sections, chunks, tokens, padded_tokens)
+        self.chunking_stats: Dict[str, int] = {}
+        #embeddings are cached by (model name, normalized text hash) so repeated 
+        #strings such as skill names are only ever encoded once
+        self.embedding_cache = EmbeddingCache(
+            model_name, cache_dir=cache_dir, max_memory_items=cache_size,
+            storage_dtype=cache_storage_dtype
+        )
+        
+        self.batcher: Optional[EmbeddingBatcher] = None
+        if batching: 
+            self.batcher = EmbeddingBatcher(
+                self._encode_direct, max_batch_size=max_batch_size, max_wait_ms=max_batch_wait_ms
+            )
         
         #Similarity thresholds (using cosine similarity)
         self.exact_match_threshold = 0.95 #x >=0.95
         self.strong_match_threshold = 0.80 #0.80 <= x < 0.95
         self.moderate_match_threshold = 0.60 #0.60 <= x < 0.80
+        #per-stage counters of the rank_resumes cascade (see get_cascade_stats)
+        self._cascade_lock = threading.Lock()
+        self.cascade_stats: Dict[str, int] = {'candidates': 0, 'lexical_passed': 0, 'ranked': 0}
+        #skills recognized in resumes (see _extract_resume_skills and skill_taxonomy)
+        self.resume_skill_patterns = [
+            r'\b(?:python|java|javascript|typescript|c\+\+|c#|go|rust|php|ruby|swift|kotlin)\b',
+            r'\b(?:react|angular|vue|django|flask|spring|express|node\.?js)\b',
+            r'\b(?:mysql|postgresql|mongodb|redis|elasticsearch)\b',
+            r'\b(?:aws|azure|gcp|docker|kubernetes|git|jenkins)\b',
+            r'\b(?:machine learning|ai|nlp|deep learning|data science)\b',
+            r'\b(?:html|css|sql|nosql|rest|api|microservices)\b'
+        ]
+        #reuse the job analyzer's skill patterns so resume and job skills share names
+        self.skill_extractor = JobAnalyzer()
+        #MinHash/LSH indexes of job postings (-> JobRequirements, reused on an exact match only) 
+        #and resumes (-> embedding)
+        self.job_duplicates: Optional[NearDuplicateIndex] = None
+        self.resume_duplicates: Optional[NearDuplicateIndex] = None
+        if near_duplicate_threshold is not None: 
+            self.job_duplicates = NearDuplicateIndex(near_duplicate_threshold)
+            self.resume_duplicates = NearDuplicateIndex(near_duplicate_threshold)
+        #complete match results by (resume, job, model, scoring version)
+        self.match_cache: Optional[MatchCache] = None
+        if match_cache_backend is not None: 
+            self.match_cache = MatchCache(
+                match_cache_backend, match_cache_path, ttl_seconds=match_cache_ttl, max_items=match_cache_size
+            )
+        #seniority implied by role words found in a resume (ranks from EXPERIENCE_LEVELS)
+        self.role_level_ranks: Dict[str, int] = {
+            'intern': 0, 'junior': 0, 'staff': 2, 'senior': 2, 'lead': 2, 'principal': 2,
+            'manager': 2, 'director': 3, 'vp': 3, 'head of': 3, 'chief': 3
+        }
+
+        _live_stores.add(self) #see _after_fork
+
+        if not lazy: 
+            self._initialize_embedding_model()
+            self.index
+        elif warm_up: 
+            self.start_warm_up()
+
+    @property
+    def embedding_model(self): 
+        """The sentence transformer model, loaded on first access."""
+        if self._embedding_model is None: 
+            with self._init_lock: 
+                if self._embedding_model is None: 
+                    self._initialize_embedding_model()
+        return self._embedding_model
+
+    @property
+    def chroma_client(self): 
+        """The ChromaDB client, created on first access."""
+        if self._chroma_client is None: 
+            with self._init_lock: 
+                if self._chroma_client is None: 
+                    self._initialize_vector_database()
+        return self._chroma_client
+
+    @property
+    def collection(self): 
+        """The resume_job_matching collection, created on first access."""
+        if self._collection is None: 
+            self.chroma_client #initializes the client and the collection together
+        return self._collection
+
+    @property
+    def index(self) -> VectorIndex: 
+        """The configured VectorIndex backend, created (or loaded) on first access."""
+        if self._index is None: 
+            with self._init_lock: 
+                if self._index is None: 
+                    self._index = self._initialize_index()
+        return self._index
+
+    @property
+    def skill_matrix(self) -> SkillMatrix: 
+        """Embeddings of the whole skill taxonomy, loaded (or built) on first access."""
+        if self._skill_matrix is None: 
+            with self._init_lock: 
+                if self._skill_matrix is None: 
+                    if self.skill_matrix_dir: 
+                        self._skill_matrix = SkillMatrix.load_or_build(
+                            SkillMatrix.directory_for(self.skill_matrix_dir, self.model_name),
+                            self.skill_taxonomy(), self.generate_embeddings, self.model_name
+                        )
+                    else: 
+                        self._skill_matrix = SkillMatrix.build(
+                            self.skill_taxonomy(), self.generate_embeddings, self.model_name
+                        )
+        return self._skill_matrix
+
+    def skill_taxonomy(self) -> List[str]: 
+        """Every skill name the resume and job description skill patterns can produce."""
+        skills = set(self.skill_extractor.get_skill_taxonomy())
+        for pattern in self.resume_skill_patterns: 
+            skills.update(expand_keyword_pattern(pattern))
+        return sorted(skills)
+
+    def _initialize_index(self) -> VectorIndex: 
+        """Build the VectorIndex for self.index_backend."""
+        if self.index_backend == 'chroma': 
+            return ChromaIndex(self.collection)
+        if self.index_dir and os.path.exists(os.path.join(self.index_dir, 'manifest.json')): 
+            logger.info(f"Loading {self.index_backend} index from {self.index_dir}")
+            return INDEX_BACKENDS[self.index_backend].load(self.index_dir)
+        return INDEX_BACKENDS[self.index_backend](
+            storage_dtype=self.index_storage_dtype, rerank_factor=self.index_rerank_factor
+        )
+
+    def save_index(self) -> None: 
+        """Persist the vector index (to index_dir for the in-process backends)."""
+        if self.index_backend != 'chroma' and not self.index_dir: 
+            raise ValueError("index_dir is required to save an in-process index")
+        self.index.save(self.index_dir)
+
+    def search_index(self, texts: List[str], k: int = 10) -> List[List[Tuple[str, float]]]: 
+        """
+        Embed texts and return the k most similar stored items for each one, 
+        as (id, cosine similarity) pairs sorted best first.
+        """
+        embeddings = self.generate_embeddings(texts)
+        if len(embeddings) == 0: 
+            return [[] for _ in texts]
+        return self.index.search(embeddings, k)
+
+    @staticmethod
+    def make_item_id(doc_type: str, field: str = '', source_id: str = '', item: str = '') -> str: 
+        """
+        Deterministic id for a stored item: sha1 of (source id, type, field, item). 
+        The id names the slot (e.x. the skills section of resume r1), not its content, 
+        so editing the text replaces the slot's vector instead of adding a second one.
+        """
+        payload = f"{source_id}\x00{doc_type}\x00{field}\x00{item}"
+        return f"{doc_type}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+    @staticmethod
+    def content_hash(text: str) -> str: 
+        """sha1 of the normalized text, stored with each item to spot unchanged content."""
+        return hashlib.sha1(EmbeddingCache.normalize_text(text).encode('utf-8')).hexdigest()
+
+    def upsert_documents(
+        self, documents: List[Dict[str, Any]], chunk_size: int = 256
+    ) -> Dict[str, Any]: 
+        """
+        Insert or update documents in the vector index. A document whose id is stored 
+        with the same content hash is skipped without re-encoding; one whose content 
+        changed has its old vector deleted and the new one added. 
+        Args: 
+        documents: [{'id': item id, 'text': str, 'metadata': dict}, ...] 
+        (see upsert_resume_sections / upsert_job_requirements)
+        chunk_size: number of documents checked, embedded and written per call
+        Returns: ingest stats (received, inserted, updated, skipped, chunks, seconds, 
+        docs_per_second)
+        """
+        start = time.perf_counter()
+        stats: Dict[str, Any] = {'received': len(documents), 'inserted': 0, 'updated': 0, 'skipped': 0, 
+                                 'chunks': 0}
+        seen = set()
+        for chunk_start in range(0, len(documents), chunk_size): 
+            chunk = documents[chunk_start:chunk_start + chunk_size]
+            stats['chunks'] += 1
+            stored = self.index.get_metadatas([doc['id'] for doc in chunk])
+            new_docs, hashes, changed = [], [], []
+            for doc, metadata in zip(chunk, stored): 
+                text_hash = self.content_hash(doc['text'])
+                #unchanged content: skip it without re-encoding
+                if doc['id'] in seen or (metadata is not None and metadata.get('content_hash') == text_hash): 
+                    stats['skipped'] += 1
+                    continue
+                seen.add(doc['id'])
+                new_docs.append(doc)
+                hashes.append(text_hash)
+                if metadata is not None: 
+                    changed.append(doc['id'])
+            if not new_docs: 
+                continue
+            embeddings = self.generate_embeddings([doc['text'] for doc in new_docs])
+            if len(embeddings) != len(new_docs): 
+                logger.error(f"Skipping chunk of {len(new_docs)} documents: embedding failed")
+                continue
+            self.index.delete(changed)
+            self.index.add(
+                [doc['id'] for doc in new_docs], embeddings,
+                metadatas=[{**(doc.get('metadata') or {}), 'content_hash': text_hash} 
+                           for doc, text_hash in zip(new_docs, hashes)]
+            )
+            stats['inserted'] += len(new_docs) - len(changed)
+            stats['updated'] += len(changed)
+        stats['seconds'] = time.perf_counter() - start
+        stats['docs_per_second'] = stats['received'] / stats['seconds'] if stats['seconds'] > 0 else 0.0
+        logger.info(f"Upserted {stats['inserted']} new and {stats['updated']} changed documents "
+                    f"({stats['skipped']} unchanged) in {stats['seconds']:.2f}s")
+        return stats
 
-        self._initialize_embedding_model()
-        self._initialize_vector_database()
+    def _upsert_source(
+        self, documents: List[Dict[str, Any]], where: Dict[str, Any], chunk_size: int
+    ) -> Dict[str, Any]: 
+        """upsert_documents, then delete the source's stored items that are no longer in documents."""
+        stats = self.upsert_documents(documents, chunk_size=chunk_size)
+        current = {doc['id'] for doc in documents}
+        stale = [item_id for item_id in self.index.find_ids(where) if item_id not in current]
+        self.index.delete(stale)
+        stats['deleted'] = len(stale)
+        return stats
+
+    def upsert_resume_sections(
+        self, sections: Dict[str, Any], resume_id: str, chunk_size: int = 256
+    ) -> Dict[str, Any]: 
+        """
+        Store resume sections (SectionParser.parse_sections(...)['sections'], i.e. 
+        name -> ResumeSection, or name -> plain text), one item per section of resume_id. 
+        Calling it again for the same resume_id replaces the edited sections and drops 
+        the ones that are gone.
+        """
+        texts = {name: getattr(section, 'content', section) for name, section in sections.items()}
+        documents = [{
+            'id': self.make_item_id('resume_section', name, resume_id),
+            'text': text,
+            'metadata': {'type': 'resume_section', 'section': name, 'resume_id': resume_id}
+        } for name, text in texts.items() if text and text.strip()]
+        return self._upsert_source(documents, {'resume_id': resume_id}, chunk_size)
+
+    def upsert_job_requirements(
+        self, job_requirements: JobRequirements, job_id: str, chunk_size: int = 256
+    ) -> Dict[str, Any]: 
+        """
+        Store the requirement items of a JobRequirements object (title, skills, 
+        education, certifications, responsibilities), one document per item of job_id. 
+        Calling it again for the same job_id adds new items and drops removed ones.
+        """
+        fields = {
+            'job_title': [job_requirements.job_title],
+            'required_skills': job_requirements.required_skills,
+            'preferred_skills': job_requirements.preferred_skills,
+            'education_requirements': job_requirements.education_requirements,
+            'certifications': job_requirements.certifications,
+            'responsibilities': job_requirements.responsibilities
+        }
+        documents = [{
+            'id': self.make_item_id('job_requirement', field, job_id, EmbeddingCache.normalize_text(item)),
+            'text': item,
+            'metadata': {'type': 'job_requirement', 'field': field, 'job_id': job_id}
+        } for field, items in fields.items() for item in items if item and item.strip()]
+        return self._upsert_source(documents, {'job_id': job_id}, chunk_size)
+
+    def start_warm_up(self) -> threading.Thread: 
+        """
+        Load the embedding model (and run one tiny encode so lazy framework setup 
+        happens too) in a background daemon thread. Requests that arrive before the 
+        warm-up finishes simply wait on the same initialization lock.
+        """
+        if self._warm_up_thread is None: 
+            def _warm_up(): 
+                try: 
+                    self.embedding_model.encode(["warm up"], convert_to_numpy=True)
+                    logger.info("Embedding model warm-up complete")
+                except Exception as e: 
+                    logger.error(f"Embedding model warm-up failed: {str(e)}")
+            self._warm_up_thread = threading.Thread(
+                target=_warm_up, name="vector-store-warm-up", daemon=True
+            )
+            self._warm_up_thread.start()
+        return self._warm_up_thread
+
+    def _after_fork(self) -> None: 
+        """
+        Called in a forked child (see _reset_locks_after_fork): fresh locks for this store, 
+        and every component resets its own state (see their _after_fork methods).
+        """
+        self._init_lock = threading.RLock()
+        self._warm_up_thread = None
+        self._cascade_lock = threading.Lock()
+        self.embedding_cache._after_fork()
+        if self.match_cache is not None: 
+            self.match_cache._after_fork()
+        for duplicates in (self.job_duplicates, self.resume_duplicates): 
+            if duplicates is not None: 
+                duplicates._after_fork()
+        if self.batcher is not None: 
+            self.batcher._after_fork()
+
+    def get_metrics(self) -> Dict[str, Any]: 
+        """Startup timings (seconds) plus embedding cache and ranking cascade statistics."""
+        metrics: Dict[str, Any] = dict(self.metrics)
+        metrics['model_loaded'] = self._embedding_model is not None
+        metrics['cache'] = self.get_cache_stats()
+        metrics['cascade'] = self.get_cascade_stats()
+        metrics['chunking'] = dict(self.chunking_stats)
+        metrics['sharding'] = dict(self.sharding_stats)
+        if self.match_cache is not None: 
+            metrics['match_cache'] = self.match_cache.get_stats()
+        if self.job_duplicates is not None: 
+            metrics['near_duplicates'] = {
+                'jobs': self.job_duplicates.get_stats(), 'resumes': self.resume_duplicates.get_stats()
+            }
+        if self.batcher is not None: 
+            metrics['batching'] = self.batcher.get_stats()
+        return metrics
 
     def _initialize_embedding_model(self): 
         """Load the sentence transformer model."""
         try: 
             logger.info(f"Loading embedding model: {self.model_name}")
-            self.embedding_model = SentenceTransformer(self.model_name)
-            logger.info("Embedding model loaded successfully.")
+            start = time.perf_counter()
+            #"hashing"/"hashing-<dim>" selects the torch-free HashingEncoder; any other 
+            #name is loaded as a sentence transformer (see src/models/embeddings.py)
+            self._embedding_model = get_encoder(self.model_name)
+            self.metrics['model_load_seconds'] = time.perf_counter() - start
+            logger.info(f"Embedding model loaded successfully in "
+                        f"{self.metrics['model_load_seconds']:.2f}s.")
         except Exception as e: 
             logger.error(f"Failed to load embedding mode: {str(e)}")
             raise 
@@ -120,6 +556,9 @@ class VectorStore:
     def _initialize_vector_database(self): 
         """Initialize ChromaDB for vector storage."""
         try: 
+            start = time.perf_counter()
+            import chromadb 
+            from chromadb.config import Settings
             #create chromadb client 
             #client = object that provides an interface to talk to the ChromaDB server
             #duckdb is the query engine; parquet is the storage format (a highly 
@@ -127,7 +566,7 @@ class VectorStore:
             #basically: we store the vector data in Parquet files, and we query it 
             #with Duckdb (this is local setup -- NOT cloud based, fast, + persistent 
             #b/c it survives between program runs b/c it's saved in ./vector_db)
-            self.chroma_client = chromadb.Client(Settings(
+            self._chroma_client = chromadb.Client(Settings(
                 chroma_db_impl="duckdb+parquet",
                 persist_directory="./vector_db"
             ))
@@ -137,10 +576,11 @@ class VectorStore:
             - if a collection with that name already exists, return it 
             - if it doesn't already exist, create a new one, then return it 
             """
-            self.collection = self.chroma_client.get_or_create_collection(
+            self._collection = self._chroma_client.get_or_create_collection(
                 name="resume_job_matching",
                 metadata={"description": "Resume and job requirement embeddings"}
             )
+            self.metrics['vector_db_init_seconds'] = time.perf_counter() - start
             logger.info("Vector database initialized successfully")
         except Exception as e: 
             logger.error(f"Failed to initialize vector database: {str(e)}")
@@ -156,35 +596,185 @@ class VectorStore:
         try: 
             if not texts: 
                 return np.array([])
-            embeddings = self.embedding_model.encode(texts, convert_to_numpy=True)
-            logger.info(f"Generated embeddings for {len(texts)} texts")
+            cached, missing = self.embedding_cache.lookup(texts)
+            if missing: 
+                #encode only the cache misses, deduplicated, as one batch
+                missing_texts = list(dict.fromkeys(texts[i] for i in missing))
+                new_embeddings = self._encode(missing_texts)
+                new_embeddings = self.embedding_cache.store(missing_texts, new_embeddings)
+                encoded = dict(zip(missing_texts, new_embeddings))
+                for i in missing: 
+                    cached[i] = encoded[texts[i]]
+            embeddings = np.vstack([cached[i] for i in range(len(texts))]).astype(np.float32)
+            if self.metrics['time_to_first_request_seconds'] is None: 
+                #measured from construction, so it includes any lazy model loading
+                self.metrics['time_to_first_request_seconds'] = time.perf_counter() - self._created_at
+                logger.info(f"Time to first embedding request: "
+                            f"{self.metrics['time_to_first_request_seconds']:.2f}s")
+            logger.info(f"Generated embeddings for {len(texts)} texts "
+                        f"({len(texts) - len(missing)} cache hits, {len(missing)} misses)")
             return embeddings
         except Exception as e: 
             logger.error(f"Error generating embeddings: {str(e)}")
             return np.array([])
         
+    def _encode_direct(self, texts: List[str]) -> np.ndarray: 
+        """Run the embedding model on texts (no cache, no batching)."""
+        return self.embedding_model.encode(texts, convert_to_numpy=True)
+
+    def _encode(self, texts: List[str]) -> np.ndarray: 
+        """
+        Encode cache misses, through the micro-batcher when it is enabled. 
+        Cache hits never wait in the batching queue.
+        """
+        if self.batcher is not None and not self.batcher.is_worker_thread(): 
+            return self.batcher.encode(texts)
+        return self._encode_direct(texts)
+
+    def embed_corpus(
+        self, 
+        texts: List[str], 
+        output_path: str, 
+        workers: int = 4, 
+        threads_per_worker: Optional[int] = None, 
+        shard_size: int = 512
+    ) -> np.ndarray: 
+        """
+        Offline embedding of a large corpus with a pool of worker processes, each loading 
+        self.model_name once with pinned intra-op threads, written into a memory-mapped 
+        .npy output (see sharded_embedding.py). The embedding cache is bypassed.
+        Returns: the (len(texts), dim) output, opened read-only as a memory map
+        """
+        stats: Dict[str, Any] = {}
+        output = embed_sharded(
+            texts, self.model_name, output_path, workers=workers, 
+            threads_per_worker=threads_per_worker, shard_size=shard_size, stats=stats
+        )
+        self.sharding_stats = stats
+        return output
+
+    def embed_sections(
+        self, sections: List[str], max_tokens: Optional[int] = None, batch_size: int = 32
+    ) -> np.ndarray: 
+        """
+        One vector per resume section, without truncating long sections: sections are split 
+        into sentence-aligned chunks under the encoder's token limit, encoded in length-sorted 
+        batches (minimal padding) and mean-pooled back per section (see chunking.py).
+        Args: 
+        sections: section texts, e.x. the values of SectionParser.parse_sections()['sections']
+        max_tokens: chunk token limit (default: the encoder's window, or 256)
+        batch_size: chunks per encode call
+        Returns: (len(sections), dim) L2-normalized array, in the original order
+        """
+        encoder = self.embedding_model
+        stats: Dict[str, int] = {}
+        vectors = encode_sections(
+            list(sections), self.generate_embeddings, 
+            max_tokens=max_tokens or encoder.max_tokens or 256, batch_size=batch_size, 
+            count_tokens=encoder.count_tokens, stats=stats
+        )
+        for key, value in stats.items(): 
+            self.chunking_stats[key] = self.chunking_stats.get(key, 0) + value
+        return vectors
+
+    def analyze_job(self, job_text: str) -> JobRequirements: 
+        """
+        JobAnalyzer.analyze_job_description, reusing the JobRequirements of an earlier 
+        posting with exactly the same text (a repost). A near-duplicate is analyzed again: 
+        one changed skill, year count or level changes the requirements, and the analysis 
+        is cheap regex work. The job's embedding comes from the embedding cache either way. 
+        Returns a copy, so callers can edit it without changing the stored analysis.
+        """
+        if self.job_duplicates is None: 
+            return self.skill_extractor.analyze_job_description(job_text)
+        key = hashlib.sha1(job_text.encode('utf-8')).hexdigest()
+        cached = self.job_duplicates.get(key)
+        if cached is not None: 
+            return copy.deepcopy(cached)
+        requirements = self.skill_extractor.analyze_job_description(job_text)
+        self.job_duplicates.add(key, job_text, copy.deepcopy(requirements))
+        return requirements
+
+    def embed_resumes(self, resume_texts: List[str]) -> np.ndarray: 
+        """
+        generate_embeddings for whole resumes, where a resume that is a near-duplicate
+        of one embedded earlier (or earlier in the same list) reuses that embedding.
+        """
+        if self.resume_duplicates is None: 
+            return self.generate_embeddings(resume_texts)
+        rows: List[Any] = [None] * len(resume_texts)
+        copies: List[Tuple[int, Any]] = [] #(position, key of a resume still being embedded)
+        pending: Dict[str, int] = {} #key -> position of the resume embedded by this call
+        signatures = {}
+        for position, text in enumerate(resume_texts): 
+            signature = self.resume_duplicates.signature(text)
+            duplicate = self.resume_duplicates.find(text, signature)
+            if duplicate is not None and duplicate[0] in pending: 
+                copies.append((position, duplicate[0]))
+            elif duplicate is not None and duplicate[2] is not None: 
+                rows[position] = duplicate[2]
+            else: 
+                key = hashlib.sha1(text.encode('utf-8')).hexdigest()
+                pending[key] = position
+                signatures[key] = signature
+                #no embedding yet, but later near-duplicates in this list can find it
+                self.resume_duplicates.add(key, text, None, signature)
+        if pending: 
+            embeddings = self.generate_embeddings([resume_texts[position] for position in pending.values()])
+            for (key, position), embedding in zip(pending.items(), embeddings): 
+                rows[position] = embedding
+                self.resume_duplicates.add(key, resume_texts[position], embedding, signatures[key])
+        for position, key in copies: 
+            rows[position] = rows[pending[key]]
+        return np.vstack(rows) if rows else np.array([])
+
+    def get_cache_stats(self) -> Dict[str, int]: 
+        """Return embedding cache hit/miss counts and sizes."""
+        return self.embedding_cache.get_stats()
+
+    def similarity_matrix(self, left_texts: List[str], right_texts: List[str]) -> np.ndarray: 
+        """
+        Calculate semantic similarity between every left text and every right text. 
+        Both sides are encoded together in one batch (cache misses only), 
+        L2-normalized, and compared with a single matrix multiply. 
+        Args: 
+        left_texts: e.x. all resume skills 
+        right_texts: e.x. all job skills 
+        Returns: a (len(left_texts), len(right_texts)) array of cosine similarities
+        """
+        try: 
+            if not left_texts or not right_texts: 
+                return np.zeros((len(left_texts), len(right_texts)), dtype=np.float32)
+            embeddings = self.generate_embeddings(list(left_texts) + list(right_texts))
+            if len(embeddings) != len(left_texts) + len(right_texts): 
+                return np.zeros((len(left_texts), len(right_texts)), dtype=np.float32)
+            return cosine_similarity_matrix(
+                embeddings[:len(left_texts)], embeddings[len(left_texts):]
+            )
+        except Exception as e: 
+            logger.error(f"Error calculating similarity matrix: {str(e)}")
+            return np.zeros((len(left_texts), len(right_texts)), dtype=np.float32)
+
+    def top_k_similar(
+        self, left_texts: List[str], right_texts: List[str], k: int = 5
+    ) -> List[List[Tuple[int, float]]]: 
+        """
+        For every left text, return the k most similar right texts as 
+        (right index, similarity) pairs sorted from most to least similar.
+        """
+        scores = self.similarity_matrix(left_texts, right_texts)
+        return top_k_per_row(scores, k)
+
     def calculate_similarity(self, text1: str, text2: str) -> float: 
         """
         Calculate semantic similarity between two texts. 
+        Thin wrapper over similarity_matrix for a single pair.
         Args: 
         text1: first text
         text2: second text 
         Returns: a similarity score between 0 and 1 (using cosine similarity)
         """
-        try: 
-            embeddings = self.generate_embeddings([text1, text2])
-            if len(embeddings) != 2: 
-                return 0.0
-            #compute cosine similarity
-            #note: embedding1, embedding2 are 1d np arrays 
-            embedding1, embedding2 = embeddings[0], embeddings[1] #unpack
-            similarity = np.dot(embedding1, embedding2) / (
-                np.linalg.norm(embedding1) * np.linalg.norm(embedding2)
-            )
-            return float(similarity)
-        except Exception as e: 
-            logger.error(f"Error calculating similarity: {str(e)}")
-            return 0.0
+        return float(self.similarity_matrix([text1], [text2])[0, 0])
 
     def match_resume_to_job(self, resume_text: str, job_requirements: Any) -> ResumeJobMatch: 
         """
@@ -195,6 +785,12 @@ class VectorStore:
         Returns: 
         ResumeJobMatch object
         """
+        cache_key = None
+        if self.match_cache is not None: 
+            cache_key = match_cache_key(resume_text, job_requirements, self.model_name, self._scoring_version())
+            cached = self.match_cache.get(cache_key)
+            if cached is not None: 
+                return cached
         try: 
             logger.info("Starting resume-job matching analysis")
             #Extract resume skills and content 
@@ -230,26 +826,480 @@ class VectorStore:
                 ats_score=ats_score
             )
             logger.info(f"Matching analysis complete. Overall score: {overall_score: .2f}")
+            if cache_key is not None: #failed matches (below) are not cached
+                self.match_cache.put(cache_key, match_result)
             return match_result
         except Exception as e: 
             logger.error(f"Error in resume-job matching: {str(e)}")
             return self._empty_match_result()
         
+    def _scoring_version(self) -> str: 
+        """SCORING_VERSION plus the match thresholds, which can be tuned per instance."""
+        return f"{SCORING_VERSION}:{self.exact_match_threshold}:{self.strong_match_threshold}:" \
+            f"{self.moderate_match_threshold}"
+
+    def match_batch(
+        self, 
+        resume_texts: List[str], 
+        job_requirements: List[Any], 
+        pairs: Optional[Iterable[Tuple[int, int]]] = None
+    ) -> BatchMatchResults: 
+        """
+        Full match_resume_to_job breakdown for many resume-job pairs, written straight into 
+        the columns of BatchMatchResults (see schemas.py), so no ResumeJobMatch is built per pair. 
+        Skills and experience are extracted once per resume, and the semantic and ATS scores 
+        of all pairs come from one similarity matrix and one ATSEngine pass. The match cache 
+        is not used: a batch would only fill it with pairs nobody asks for again.
+        Args: 
+        resume_texts: cleaned resume texts
+        job_requirements: JobRequirements objects
+        pairs: (resume index, job index) pairs to match; default = every resume x every job
+        """
+        if pairs is None: 
+            pairs = [(i, j) for i in range(len(resume_texts)) for j in range(len(job_requirements))]
+        pairs = list(pairs)
+        #only the resumes and jobs that appear in a pair are scored
+        resume_rows = {index: row for row, index in enumerate(dict.fromkeys(i for i, _ in pairs))}
+        job_columns = {index: column for column, index in enumerate(dict.fromkeys(j for _, j in pairs))}
+        batch_resumes = [resume_texts[index] for index in resume_rows]
+        batch_jobs = [job_requirements[index] for index in job_columns]
+        semantic = self.similarity_matrix(batch_resumes, [self._job_profile_text(job) for job in batch_jobs])
+        ats = self.ats_score_matrix(batch_resumes, batch_jobs) if pairs else np.zeros((0, 0))
+        resume_profiles: Dict[int, Tuple[List[str], Dict[str, Any]]] = {}
+        builder = BatchMatchBuilder()
+        for resume_index, job_index in pairs: 
+            resume_text, job = resume_texts[resume_index], job_requirements[job_index]
+            row, column = resume_rows[resume_index], job_columns[job_index]
+            try: 
+                if resume_index not in resume_profiles: 
+                    resume_profiles[resume_index] = (
+                        self._extract_resume_skills(resume_text), 
+                        self._extract_experience_indicators(resume_text)
+                    )
+                resume_skills, resume_experience = resume_profiles[resume_index]
+                skills_analysis = self._analyze_skills_match(
+                    resume_skills, resume_text, job, semantic_similarity=float(semantic[row, column])
+                )
+                experience_match = self._analyze_experience_match(resume_experience, job)
+                builder.add_analysis(
+                    skills_analysis, 
+                    experience_match, 
+                    self._calculate_overall_match_score(skills_analysis, experience_match), 
+                    float(ats[row, column]), 
+                    self._generate_recommendations(skills_analysis, experience_match, job), 
+                    resume_index, 
+                    job_index
+                )
+            except Exception as e: 
+                logger.error(f"Error in batch matching of resume {resume_index} and job {job_index}: {str(e)}")
+                builder.add_analysis({}, {}, 0.0, 0.0, [], resume_index, job_index)
+        return builder.build()
+
+    def prepare_resume_corpus(
+        self, 
+        resume_texts: List[str], 
+        ids: Optional[List[Any]] = None, 
+        batch_size: int = 256, 
+        reuse_near_duplicates: bool = False
+    ) -> ResumeCorpus: 
+        """
+        Extract skills and experience and embed every resume once, so the corpus can be 
+        ranked against any number of jobs without touching the text again.
+        Args: 
+        resume_texts: cleaned resume texts
+        ids: one id per resume (defaults to the list positions)
+        batch_size: texts per embedding call
+        reuse_near_duplicates: embed through embed_resumes, so a lightly edited copy of a 
+        resume seen before reuses its embedding (its semantic score then comes from the 
+        earlier version)
+        """
+        resume_texts = list(resume_texts)
+        ids = list(ids) if ids is not None else list(range(len(resume_texts)))
+        if len(ids) != len(resume_texts): 
+            raise ValueError(f"Got {len(ids)} ids for {len(resume_texts)} resumes")
+        skill_sets = [set(self._extract_resume_skills(text)) for text in resume_texts]
+        experience = [self._extract_experience_indicators(text) for text in resume_texts]
+        return self._build_resume_corpus(
+            resume_texts, ids, skill_sets, experience, batch_size, reuse_near_duplicates
+        )
+
+    def _build_resume_corpus(
+        self, 
+        resume_texts: List[str], 
+        ids: List[Any], 
+        skill_sets: List[Set[str]], 
+        experience: List[Dict[str, Any]], 
+        batch_size: int, 
+        reuse_near_duplicates: bool = False
+    ) -> ResumeCorpus: 
+        """Embed resumes whose skills and experience are already extracted."""
+        skill_bitsets = SkillBitsets(sorted(set().union(*skill_sets)))
+        embed = self.embed_resumes if reuse_near_duplicates else self.generate_embeddings
+        embeddings = [
+            l2_normalize(embed(resume_texts[start:start + batch_size]))
+            for start in range(0, len(resume_texts), batch_size)
+        ]
+        return ResumeCorpus(
+            ids=ids,
+            embeddings=np.vstack(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32),
+            skill_bits=skill_bitsets.pack(skill_sets),
+            skill_bitsets=skill_bitsets,
+            years=np.array([info['estimated_years'] for info in experience], dtype=np.float32),
+            level_ranks=np.array([info['level_rank'] for info in experience], dtype=np.int8)
+        )
+
+    def _skill_credit_tables(
+        self, skills: List[str], skill_bitsets: SkillBitsets
+    ) -> Tuple[np.ndarray, List[Tuple[int, np.ndarray, np.ndarray]]]: 
+        """
+        Compile job skills against a corpus skill vocabulary. 
+        Returns: (exact_bits, semantic) where exact_bits is the packed (len(skills), n_bytes) 
+        bitset of each skill's own vocabulary entry, and semantic lists 
+        (skill row, vocabulary columns, similarities) for the vocabulary skills that would 
+        earn semantic credit (>= moderate_match_threshold) for that job skill.
+        """
+        exact_bits = self._skill_masks(skills, skill_bitsets)
+        semantic: List[Tuple[int, np.ndarray, np.ndarray]] = []
+        if skills and skill_bitsets.skills: 
+            similarities = self._skill_similarity(skills, skill_bitsets.skills)
+            for row, skill in enumerate(skills): 
+                columns = np.flatnonzero(similarities[row] >= self.moderate_match_threshold)
+                columns = columns[[skill_bitsets.skills[column] != skill for column in columns]] \
+                    if len(columns) else columns
+                if len(columns): 
+                    semantic.append((row, columns, similarities[row, columns].astype(np.float32)))
+        return exact_bits, semantic
+
+    @staticmethod
+    def _skill_masks(skills: List[str], skill_bitsets: SkillBitsets) -> np.ndarray: 
+        """Packed (len(skills), n_bytes) bitset of each skill's own vocabulary entry."""
+        if not skills: 
+            return np.zeros((0, skill_bitsets.n_bytes), dtype=np.uint8)
+        return np.stack([skill_bitsets.mask([skill]) for skill in skills])
+
+    @staticmethod
+    def _exact_skill_hits(skill_bits: np.ndarray, exact_bits: np.ndarray) -> np.ndarray: 
+        """(n resumes, n job skills) boolean: job skill present exactly (bitwise AND + popcount)."""
+        if len(exact_bits) == 0: 
+            return np.zeros((skill_bits.shape[0], 0), dtype=bool)
+        return np.stack(
+            [SkillBitsets.popcount(skill_bits & mask) > 0 for mask in exact_bits], axis=1
+        )
+
+    @staticmethod
+    def _batch_skill_credit(
+        skill_bits: np.ndarray, 
+        skill_bitsets: SkillBitsets, 
+        has_exact: np.ndarray, 
+        semantic: List[Tuple[int, np.ndarray, np.ndarray]]
+    ) -> np.ndarray: 
+        """
+        Total skill credit per resume: 1.0 per exactly matched job skill, plus the best 
+        semantic similarity for job skills matched only semantically.
+        """
+        credit = has_exact.sum(axis=1).astype(np.float32)
+        if semantic: 
+            present = skill_bitsets.unpack(skill_bits)
+            for row, columns, similarities in semantic: 
+                best = (present[:, columns] * similarities[None, :]).max(axis=1)
+                credit += np.where(has_exact[:, row], 0.0, best)
+        return credit
+
+    @staticmethod
+    def _lexical_keep(
+        lexical: np.ndarray, threshold: Optional[float], top_fraction: Optional[float]
+    ) -> np.ndarray: 
+        """Row indexes that pass the lexical stage (score threshold and/or rank cutoff)."""
+        keep = np.ones(len(lexical), dtype=bool)
+        if threshold is not None: 
+            keep &= lexical >= threshold
+        if top_fraction is not None and len(lexical): 
+            cutoff = max(1, int(np.ceil(top_fraction * len(lexical))))
+            ranked = np.argsort(-lexical, kind='stable')[:cutoff]
+            in_top = np.zeros(len(lexical), dtype=bool)
+            in_top[ranked] = True
+            keep &= in_top
+        return np.flatnonzero(keep)
+
+    def get_cascade_stats(self) -> Dict[str, Any]: 
+        """Per-stage counts and pass rates of the rank_resumes cascade."""
+        with self._cascade_lock: 
+            stats: Dict[str, Any] = dict(self.cascade_stats)
+        #stage 1 (lexical): share of resumes sent on to the embedding stage
+        stats['lexical_pass_rate'] = stats['lexical_passed'] / max(1, stats['candidates'])
+        #stage 2 (semantic): share of embedded resumes that made a top-k
+        stats['semantic_pass_rate'] = stats['ranked'] / max(1, stats['lexical_passed'])
+        return stats
+
+    def rank_resumes(
+        self, 
+        job_requirements: Any, 
+        resume_corpus: Any, 
+        k: int = 10, 
+        batch_size: int = 1024,
+        lexical_threshold: Optional[float] = None,
+        lexical_top_fraction: Optional[float] = None
+    ) -> List[Dict[str, Any]]: 
+        """
+        Recruiter mode: rank many resumes against one job and keep the best k.
+        Job-side work (profile embedding, compiled skill sets) happens once; resumes are 
+        scored in vectorized batches with the same formulas as match_resume_to_job, and a 
+        size-k heap keeps memory flat however many resumes are streamed through.
+
+        Scoring is a two-stage cascade. Stage one is a lexical score: skills_score with 
+        exact credit only, from skill-set overlap (bitsets) and, for streamed texts, job 
+        skill keyword hits in the resume's tokens. Only resumes passing lexical_threshold 
+        and/or lexical_top_fraction reach stage two, the embedding-based score (for streamed 
+        texts, the others are never embedded). With both left as None every resume 
+        reaches stage two. Pass rates are reported by get_cascade_stats / get_metrics.
+        Args: 
+        job_requirements: JobRequirements object from job_analyzer
+        resume_corpus: a ResumeCorpus from prepare_resume_corpus, or an iterable of resume 
+        texts (prepared batch by batch; ids are the positions in the iterable)
+        k: number of resumes to return
+        batch_size: resumes scored per batch
+        lexical_threshold: min lexical score (0-1) to reach the embedding stage
+        lexical_top_fraction: only the best this fraction of each batch, by lexical score, 
+        reaches the embedding stage (e.x. 0.2)
+        Returns: 
+        up to k dicts (resume_id, overall_match_score, skills_score, experience_score, 
+        semantic_similarity, lexical_score), best first
+        """
+        try: 
+            if k <= 0: 
+                return []
+            required = list(dict.fromkeys(job_requirements.required_skills))
+            preferred = [skill for skill in dict.fromkeys(job_requirements.preferred_skills) 
+                         if skill not in required]
+            job_embedding = l2_normalize(
+                self.generate_embeddings([self._job_profile_text(job_requirements)])
+            )[0]
+            compiled: Dict[int, Tuple[Any, Any]] = {} #id(skill_bitsets) -> compiled job skills
+            heap: List[Tuple[float, int, Dict[str, Any]]] = []
+            counts = {'candidates': 0, 'lexical_passed': 0}
+
+            def lexical_scores(required_hits: np.ndarray, preferred_hits: np.ndarray) -> np.ndarray: 
+                return np.asarray(skills_score(
+                    match_ratio(required_hits.astype(np.float32), len(required)),
+                    match_ratio(preferred_hits.astype(np.float32), len(preferred))
+                ), dtype=np.float32)
+
+            def score_rows(corpus: ResumeCorpus, rows: np.ndarray, positions: np.ndarray, 
+                           lexical: np.ndarray) -> None: 
+                """Stage two for the given corpus rows; positions break score ties."""
+                counts['lexical_passed'] += len(rows)
+                if len(rows) == 0: 
+                    return
+                key = id(corpus.skill_bitsets)
+                if key not in compiled: 
+                    compiled.clear() #streamed batches each carry their own vocabulary
+                    compiled[key] = (
+                        self._skill_credit_tables(required, corpus.skill_bitsets),
+                        self._skill_credit_tables(preferred, corpus.skill_bitsets)
+                    )
+                (required_bits, required_semantic), (preferred_bits, preferred_semantic) = compiled[key]
+                bits = corpus.skill_bits[rows]
+                required_ratio = match_ratio(self._batch_skill_credit(
+                    bits, corpus.skill_bitsets, self._exact_skill_hits(bits, required_bits),
+                    required_semantic), len(required))
+                preferred_ratio = match_ratio(self._batch_skill_credit(
+                    bits, corpus.skill_bitsets, self._exact_skill_hits(bits, preferred_bits),
+                    preferred_semantic), len(preferred))
+                skills_part = skills_score(required_ratio, preferred_ratio)
+                experience_part = np.broadcast_to(experience_score(
+                    corpus.years[rows], corpus.level_ranks[rows],
+                    job_requirements.experience_years, job_requirements.experience_level
+                ), (len(rows),))
+                semantic_part = corpus.embeddings[rows] @ job_embedding
+                scores = overall_score(skills_part, experience_part, semantic_part)
+                #only the batch's own top k can enter the global top k
+                for i in np.argsort(-scores, kind='stable')[:k]: 
+                    entry = (float(scores[i]), -int(positions[i]), {
+                        'resume_id': corpus.ids[rows[i]],
+                        'overall_match_score': float(scores[i]),
+                        'skills_score': float(skills_part[i]),
+                        'experience_score': float(experience_part[i]),
+                        'semantic_similarity': float(semantic_part[i]),
+                        'lexical_score': float(lexical[i])
+                    })
+                    if len(heap) < k: 
+                        heapq.heappush(heap, entry)
+                    elif entry[:2] > heap[0][:2]: 
+                        heapq.heapreplace(heap, entry)
+                    else: 
+                        break #candidates are sorted, the rest score lower
+
+            if isinstance(resume_corpus, ResumeCorpus): 
+                #stage one from the precomputed skill bitsets
+                required_exact = self._skill_masks(required, resume_corpus.skill_bitsets)
+                preferred_exact = self._skill_masks(preferred, resume_corpus.skill_bitsets)
+                for start in range(0, len(resume_corpus), batch_size): 
+                    end = min(start + batch_size, len(resume_corpus))
+                    bits = resume_corpus.skill_bits[start:end]
+                    lexical = lexical_scores(
+                        self._exact_skill_hits(bits, required_exact).sum(axis=1),
+                        self._exact_skill_hits(bits, preferred_exact).sum(axis=1)
+                    )
+                    counts['candidates'] += end - start
+                    keep = self._lexical_keep(lexical, lexical_threshold, lexical_top_fraction)
+                    score_rows(resume_corpus, start + keep, start + keep, lexical[keep])
+            else: 
+                offset = 0
+                texts = iter(resume_corpus)
+                keywords = [set(ats_tokenize(skill)) for skill in required + preferred]
+                while True: 
+                    batch = list(islice(texts, batch_size))
+                    if not batch: 
+                        break
+                    #stage one from skill sets and keyword hits, before any embedding
+                    skill_sets = [set(self._extract_resume_skills(text)) for text in batch]
+                    hits = np.zeros((len(batch), len(keywords)), dtype=bool)
+                    for row, (text, skill_set) in enumerate(zip(batch, skill_sets)): 
+                        tokens = set(ats_tokenize(text))
+                        for column, skill in enumerate(required + preferred): 
+                            hits[row, column] = skill in skill_set or \
+                                bool(keywords[column]) and keywords[column] <= tokens
+                    lexical = lexical_scores(
+                        hits[:, :len(required)].sum(axis=1), hits[:, len(required):].sum(axis=1)
+                    )
+                    counts['candidates'] += len(batch)
+                    keep = self._lexical_keep(lexical, lexical_threshold, lexical_top_fraction)
+                    if len(keep): 
+                        kept_texts = [batch[row] for row in keep]
+                        corpus = self._build_resume_corpus(
+                            kept_texts, [offset + int(row) for row in keep], 
+                            [skill_sets[row] for row in keep],
+                            [self._extract_experience_indicators(text) for text in kept_texts],
+                            batch_size
+                        )
+                        score_rows(corpus, np.arange(len(keep)), offset + keep, lexical[keep])
+                    offset += len(batch)
+            with self._cascade_lock: 
+                self.cascade_stats['candidates'] += counts['candidates']
+                self.cascade_stats['lexical_passed'] += counts['lexical_passed']
+                self.cascade_stats['ranked'] += len(heap)
+            return [entry[2] for entry in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+        except Exception as e: 
+            logger.error(f"Error ranking resumes: {str(e)}")
+            return []
+
+    def build_job_index(
+        self, job_requirements: List[Any], ids: Optional[List[Any]] = None, batch_size: int = 256
+    ) -> JobIndex: 
+        """
+        Embed every job posting's profile once and compile its skills into bitsets, so 
+        recommend_jobs can score a whole catalogue with a few array operations.
+        Args: 
+        job_requirements: JobRequirements objects from job_analyzer
+        ids: one id per job (defaults to the list positions)
+        batch_size: texts per embedding call
+        """
+        jobs = list(job_requirements)
+        ids = list(ids) if ids is not None else list(range(len(jobs)))
+        if len(ids) != len(jobs): 
+            raise ValueError(f"Got {len(ids)} ids for {len(jobs)} jobs")
+        required_sets = [set(job.required_skills) for job in jobs]
+        preferred_sets = [set(job.preferred_skills) - required 
+                          for job, required in zip(jobs, required_sets)]
+        skill_bitsets = SkillBitsets(sorted(set().union(*required_sets, *preferred_sets)))
+        profiles = [self._job_profile_text(job) for job in jobs]
+        embeddings = [
+            l2_normalize(self.generate_embeddings(profiles[start:start + batch_size]))
+            for start in range(0, len(profiles), batch_size)
+        ]
+        return JobIndex(
+            ids=ids,
+            jobs=jobs,
+            embeddings=np.vstack(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32),
+            skill_bitsets=skill_bitsets,
+            required_bits=skill_bitsets.pack(required_sets),
+            preferred_bits=skill_bitsets.pack(preferred_sets),
+            required_years=np.array([job.experience_years or 0 for job in jobs], dtype=np.float32),
+            required_level_ranks=np.array(
+                [LEVEL_RANKS.get(job.experience_level, -1) for job in jobs], dtype=np.int8
+            )
+        )
+
+    def recommend_jobs(
+        self, resume_text: str, job_index: JobIndex, k: int = 10
+    ) -> List[Dict[str, Any]]: 
+        """
+        Candidate mode: the k best-matching postings of a job index for one resume.
+        The resume is embedded and analyzed once. Every job is then scored with the same 
+        formulas as match_resume_to_job, but as array operations over the index: each 
+        vocabulary skill gets one credit for this resume (1.0 exact, its best semantic 
+        similarity, or 0), and a job's skill credit is the sum of the credits of its skill 
+        bits. The full match breakdown (match_resume_to_job) runs only on the final top k.
+        Args: 
+        resume_text: cleaned resume text
+        job_index: JobIndex from build_job_index
+        k: number of jobs to return
+        Returns: 
+        up to k dicts (job_id, overall_match_score, skills_score, experience_score, 
+        semantic_similarity, match), best first; match is the ResumeJobMatch
+        """
+        try: 
+            if k <= 0 or len(job_index) == 0: 
+                return []
+            resume_skills = sorted(set(self._extract_resume_skills(resume_text)))
+            resume_experience = self._extract_experience_indicators(resume_text)
+            resume_embedding = l2_normalize(self.generate_embeddings([resume_text]))[0]
+            #per vocabulary skill credit for this resume, in one similarity call
+            vocabulary = job_index.skill_bitsets.skills
+            credits = np.zeros(len(vocabulary), dtype=np.float32)
+            if vocabulary and resume_skills: 
+                resume_skill_set = set(resume_skills)
+                best = self._skill_similarity(vocabulary, resume_skills).max(axis=1)
+                for column, skill in enumerate(vocabulary): 
+                    if skill in resume_skill_set: 
+                        credits[column] = 1.0
+                    elif best[column] >= self.moderate_match_threshold: 
+                        credits[column] = best[column]
+            required_credit = np.zeros(len(job_index), dtype=np.float32)
+            preferred_credit = np.zeros(len(job_index), dtype=np.float32)
+            for column in np.flatnonzero(credits): 
+                skill = vocabulary[column]
+                required_credit += credits[column] * job_index.skill_bitsets.column(
+                    job_index.required_bits, skill)
+                preferred_credit += credits[column] * job_index.skill_bitsets.column(
+                    job_index.preferred_bits, skill)
+            #empty skill lists count as fully matched (see match_ratio)
+            required_ratio = np.where(job_index.required_counts > 0, 
+                required_credit / np.maximum(job_index.required_counts, 1), 1.0)
+            preferred_ratio = np.where(job_index.preferred_counts > 0, 
+                preferred_credit / np.maximum(job_index.preferred_counts, 1), 1.0)
+            skills_part = skills_score(required_ratio, preferred_ratio)
+            experience_part = experience_score_ranked(
+                resume_experience['estimated_years'], resume_experience['level_rank'],
+                job_index.required_years, job_index.required_level_ranks
+            )
+            semantic_part = job_index.embeddings @ resume_embedding
+            scores = overall_score(skills_part, experience_part, semantic_part)
+            k = min(k, len(job_index))
+            top = np.argpartition(-scores, k - 1)[:k] if k < len(job_index) else np.arange(len(job_index))
+            top = top[np.lexsort((top, -scores[top]))] #best first, ties by position
+            return [{
+                'job_id': job_index.ids[row],
+                'overall_match_score': float(scores[row]),
+                'skills_score': float(skills_part[row]),
+                'experience_score': float(experience_part[row]),
+                'semantic_similarity': float(semantic_part[row]),
+                'match': self.match_resume_to_job(resume_text, job_index.jobs[row])
+            } for row in top]
+        except Exception as e: 
+            logger.error(f"Error recommending jobs: {str(e)}")
+            return []
+
     def _extract_resume_skills(self, resume_text: str) -> List[str]: 
         """Extract skills mentioned in resume. """
-        skill_patterns = [
-            r'\b(?:python|java|javascript|typescript|c\+\+|c#|go|rust|php|ruby|swift|kotlin)\b',
-            r'\b(?:react|angular|vue|django|flask|spring|express|node\.?js)\b',
-            r'\b(?:mysql|postgresql|mongodb|redis|elasticsearch)\b',
-            r'\b(?:aws|azure|gcp|docker|kubernetes|git|jenkins)\b',
-            r'\b(?:machine learning|ai|nlp|deep learning|data science)\b',
-            r'\b(?:html|css|sql|nosql|rest|api|microservices)\b'
-        ]
         skills = set()
         resume_lower = resume_text.lower()
-        for pattern in skill_patterns: 
+        for pattern in self.resume_skill_patterns: 
             matches = re.findall(pattern, resume_lower, re.IGNORECASE)
             skills.update(matches)
+        #also recognize every skill the job analyzer can extract from job descriptions, 
+        #otherwise a required skill like 'terraform' could never be matched exactly
+        skills.update(self.skill_extractor._extract_skills_from_text(resume_lower))
         return list(skills)
     
     def _extract_experience_indicators(self, resume_text: str) -> Dict[str, Any]: 
@@ -258,11 +1308,288 @@ class VectorStore:
             'years_mentioned': [],
             'roles': [],
             'companies': [],
-            'estimated_years': 0
+            'estimated_years': 0,
+            'level_rank': 0
         }
+        text = resume_text.lower()
+        #explicit mentions e.x. "5+ years", "3 yrs"
+        experience_info['years_mentioned'] = [
+            int(years) for years in re.findall(r'\b(\d{1,2})\+?\s*(?:years?|yrs?)\b', text)
+        ]
+        #date ranges e.x. "2019 - 2022", "2021 to present"; overlapping ranges are merged
+        current_year = time.localtime().tm_year
+        spans = []
+        for start, end in re.findall(
+            r'\b((?:19|20)\d{2})\s*(?:-|–|to)\s*((?:19|20)\d{2}|present|current|now)\b', text
+        ): 
+            end_year = current_year if not end.isdigit() else int(end)
+            if end_year >= int(start): 
+                spans.append((int(start), end_year))
+        covered_years = 0
+        last_end = None
+        for start, end in sorted(spans): 
+            if last_end is not None and start < last_end: 
+                start = last_end
+            if end > start: 
+                covered_years += end - start
+            last_end = end if last_end is None else max(last_end, end)
+        estimated_years = max([covered_years] + experience_info['years_mentioned'])
+        experience_info['estimated_years'] = min(estimated_years, 50)
+        #seniority words in job titles
+        experience_info['roles'] = sorted(set(re.findall(
+            r'\b(intern|junior|senior|staff|lead|principal|manager|director|vp|head of|chief)\b', text
+        )))
+        role_ranks = [self.role_level_ranks[role] for role in experience_info['roles']]
+        experience_info['level_rank'] = int(max(
+            role_ranks + [int(estimate_level_rank(experience_info['estimated_years']))]
+        ))
+        return experience_info
 
-            
-    
+    def _job_profile_text(self, job_requirements: Any) -> str: 
+        """One text describing the job, embedded for document-level semantic similarity."""
+        parts = [job_requirements.job_title]
+        parts += job_requirements.required_skills + job_requirements.preferred_skills
+        parts += job_requirements.responsibilities
+        return '. '.join(part for part in parts if part)
+
+    def _skill_vectors(self, skills: List[str]) -> np.ndarray: 
+        """
+        Normalized embeddings of skill names: rows of the precomputed skill matrix, 
+        with only skills outside the taxonomy sent to the model (via the embedding cache).
+        """
+        skill_matrix = self.skill_matrix
+        rows = skill_matrix.lookup(skills)
+        if len(skill_matrix) == 0: 
+            return l2_normalize(self.generate_embeddings(skills))
+        vectors = np.empty((len(skills), skill_matrix.matrix.shape[1]), dtype=np.float32)
+        known = rows >= 0
+        vectors[known] = skill_matrix.matrix[rows[known]]
+        if not known.all(): 
+            vectors[~known] = l2_normalize(
+                self.generate_embeddings([skill for skill, row in zip(skills, rows) if row < 0])
+            )
+        return vectors
+
+    def _skill_similarity(self, job_skills: List[str], resume_skills: List[str]) -> np.ndarray: 
+        """
+        Semantic similarity between job skill names and resume skill names. 
+        Taxonomy skills are a row lookup in the skill matrix plus one small matrix 
+        multiply, so no model call happens in the request path.
+        """
+        if not job_skills or not resume_skills: 
+            return np.zeros((len(job_skills), len(resume_skills)), dtype=np.float32)
+        try: 
+            return self._skill_vectors(job_skills) @ self._skill_vectors(resume_skills).T
+        except Exception as e: 
+            logger.error(f"Error using the skill matrix, embedding skills directly: {str(e)}")
+            return self.similarity_matrix(job_skills, resume_skills)
+
+    def _analyze_skills_match(
+        self, resume_skills: List[str], resume_text: str, job_requirements: Any, 
+        semantic_similarity: Optional[float] = None
+    ) -> Dict[str, Any]: 
+        """
+        Match required and preferred job skills against the resume. 
+        Exact matches earn 1.0 credit. Skills without an exact match earn their best 
+        semantic similarity to any resume skill if it reaches moderate_match_threshold 
+        ('semantic' at or above strong_match_threshold, 'partial' below it).
+        semantic_similarity: resume-job text similarity if already known (e.x. from match_batch)
+        """
+        required = list(dict.fromkeys(job_requirements.required_skills))
+        preferred = [skill for skill in dict.fromkeys(job_requirements.preferred_skills) 
+                     if skill not in required]
+        resume_skill_set = set(resume_skills)
+        resume_skill_list = sorted(resume_skill_set)
+        #one batched similarity call for every job skill without an exact match
+        unmatched = [skill for skill in required + preferred if skill not in resume_skill_set]
+        best_semantic: Dict[str, Tuple[str, float]] = {}
+        if unmatched and resume_skill_list: 
+            similarities = self._skill_similarity(unmatched, resume_skill_list)
+            for row, skill in enumerate(unmatched): 
+                column = int(np.argmax(similarities[row]))
+                best_semantic[skill] = (resume_skill_list[column], float(similarities[row, column]))
+
+        matching_skills: List[MatchResult] = []
+        credits: Dict[str, float] = {}
+        for skill in required + preferred: 
+            requirement = 'required' if skill in required else 'preferred'
+            if skill in resume_skill_set: 
+                credits[skill] = 1.0
+                matching_skills.append(MatchResult(skill, 1.0, skill, requirement, 'exact'))
+                continue
+            resume_skill, score = best_semantic.get(skill, ('', 0.0))
+            if score >= self.moderate_match_threshold: 
+                credits[skill] = score
+                match_type = 'semantic' if score >= self.strong_match_threshold else 'partial'
+                matching_skills.append(MatchResult(skill, score, resume_skill, requirement, match_type))
 
+        missing_required = [skill for skill in required if skill not in credits]
+        missing_preferred = [skill for skill in preferred if skill not in credits]
+        required_ratio = match_ratio(sum(credits.get(skill, 0.0) for skill in required), len(required))
+        preferred_ratio = match_ratio(sum(credits.get(skill, 0.0) for skill in preferred), len(preferred))
+        return {
+            'required_skills': required,
+            'preferred_skills': preferred,
+            'resume_skills': resume_skill_list,
+            'matching_skills': matching_skills,
+            'missing_skills': missing_required + missing_preferred,
+            'missing_required_skills': missing_required,
+            'missing_preferred_skills': missing_preferred,
+            'required_match_ratio': float(required_ratio),
+            'preferred_match_ratio': float(preferred_ratio),
+            'skills_score': float(skills_score(required_ratio, preferred_ratio)),
+            'semantic_similarity': semantic_similarity if semantic_similarity is not None 
+                else self.calculate_similarity(resume_text, self._job_profile_text(job_requirements))
+        }
+
+    def _analyze_experience_match(
+        self, resume_experience: Dict[str, Any], job_requirements: Any
+    ) -> Dict[str, Any]: 
+        """Compare estimated resume experience with the job's years and level."""
+        resume_years = resume_experience['estimated_years']
+        level_rank = resume_experience['level_rank']
+        required_years = job_requirements.experience_years
+        required_level = job_requirements.experience_level
+        return {
+            'resume_years': resume_years,
+            'required_years': required_years,
+            'resume_level': EXPERIENCE_LEVELS[level_rank],
+            'required_level': required_level,
+            'meets_years_requirement': not required_years or resume_years >= required_years,
+            'meets_level_requirement': required_level not in LEVEL_RANKS 
+                or level_rank >= LEVEL_RANKS[required_level],
+            'experience_score': float(experience_score(
+                resume_years, level_rank, required_years, required_level
+            ))
+        }
+
+    def _calculate_overall_match_score(
+        self, skills_analysis: Dict[str, Any], experience_match: Dict[str, Any]
+    ) -> float: 
+        """Weighted skills, experience and semantic similarity (see src/models/scoring.py)."""
+        return overall_score(
+            skills_analysis['skills_score'], 
+            experience_match['experience_score'], 
+            skills_analysis['semantic_similarity']
+        )
+
+    def _calculate_ats_score(self, resume_text: str, job_requirements: Any) -> float: 
+        """
+        Score how well the resume would pass keyword-based ATS filters: coverage of the 
+        job's skill keywords, their density in the resume, and exact job title presence.
+        """
+        tokens = ats_tokenize(resume_text)
+        keywords = list(dict.fromkeys(
+            tuple(ats_tokenize(skill)) 
+            for skill in job_requirements.required_skills + job_requirements.preferred_skills
+        ))
+        keywords = [keyword for keyword in keywords if keyword]
+        title = tuple(ats_tokenize(job_requirements.job_title))
+        counts = count_phrases(tokens, keywords + ([title] if title else []))
+        if keywords: 
+            coverage = sum(1 for keyword in keywords if counts[keyword] > 0) / len(keywords)
+        else: 
+            coverage = 0.0
+        keyword_tokens = sum(counts[keyword] * len(keyword) for keyword in keywords)
+        density = keyword_tokens / max(1, len(tokens))
+        title_present = 1.0 if title and counts[title] > 0 else 0.0
+        return float(ats_score(coverage, density, title_present))
+
+    def ats_score_matrix(self, resume_texts: List[str], job_requirements: List[Any]) -> np.ndarray: 
+        """
+        ATS scores of every resume against every job, (len(resume_texts), len(job_requirements)), 
+        computed with sparse term matrices (see src/models/ats_engine.py). Entry [i, j] 
+        equals _calculate_ats_score(resume_texts[i], job_requirements[j]).
+        """
+        return ATSEngine(job_requirements).score(list(resume_texts))
+
+    def _generate_recommendations(
+        self, skills_analysis: Dict[str, Any], experience_match: Dict[str, Any], 
+        job_requirements: Any
+    ) -> List[str]: 
+        """Actionable suggestions based on the skills and experience analysis."""
+        recommendations: List[str] = []
+        for skill in skills_analysis['missing_required_skills'][:5]: 
+            recommendations.append(f"Add missing required skill: {skill}")
+        for skill in skills_analysis['missing_preferred_skills'][:3]: 
+            recommendations.append(f"Consider adding preferred skill: {skill}")
+        for match in skills_analysis['matching_skills']: 
+            if match.match_type != 'exact': 
+                recommendations.append(
+                    f"Mention '{match.skill}' explicitly (closest match on your resume: "
+                    f"'{match.resume_text}')"
+                )
+        if not experience_match['meets_years_requirement']: 
+            recommendations.append(
+                f"Highlight your experience more clearly: the role asks for "
+                f"{experience_match['required_years']}+ years, about "
+                f"{experience_match['resume_years']} detected"
+            )
+        if not experience_match['meets_level_requirement']: 
+            recommendations.append(
+                f"Emphasize {experience_match['required_level']}-level responsibilities "
+                f"(e.x. ownership, leadership, scope of impact)"
+            )
+        if skills_analysis['semantic_similarity'] < 0.3: 
+            recommendations.append(
+                f"Tailor your summary and bullet points to the wording of the "
+                f"{job_requirements.job_title} job description"
+            )
+        return recommendations
+
+    def _empty_match_result(self) -> ResumeJobMatch: 
+        """Zero-score result returned when matching fails."""
+        return ResumeJobMatch(
+            overall_match_score=0.0,
+            skills_analysis={},
+            experience_match={},
+            missing_skills=[],
+            matching_skills=[],
+            recommendations=[],
+            ats_score=0.0
+        )
+
+
+#Process-wide VectorStore instances, one per model name. Sharing one instance means 
+#one copy of the model weights per process instead of one per caller.
+_shared_stores: Dict[str, VectorStore] = {}
+#every live VectorStore, so the fork hook reaches instances created outside get_vector_store too
+_live_stores: "weakref.WeakSet[VectorStore]" = weakref.WeakSet()
+_shared_stores_lock = threading.Lock()
+
+def get_vector_store(model_name: str = "all-MiniLM-L6-v2", **kwargs: Any) -> VectorStore: 
+    """
+    Return the process-wide VectorStore for model_name, creating it on first call. 
+    Extra keyword arguments are only used when the instance is first created.
+    """
+    store = _shared_stores.get(model_name)
+    if store is None: 
+        with _shared_stores_lock: 
+            store = _shared_stores.get(model_name)
+            if store is None: 
+                store = VectorStore(model_name=model_name, **kwargs)
+                _shared_stores[model_name] = store
+    return store
+
+def preload_vector_store(model_name: str = "all-MiniLM-L6-v2", **kwargs: Any) -> VectorStore: 
+    """
+    Load the shared VectorStore's embedding model in the current (parent) process. 
+    Call this before forking workers (e.x. gunicorn --preload, or multiprocessing with 
+    the 'fork' start method): children inherit the already-loaded weights and share 
+    their memory pages copy-on-write instead of each loading their own copy. 
+    The Chroma client is deliberately NOT created here; it holds file handles and 
+    threads that should not cross a fork, so each worker creates its own lazily.
+    """
+    store = get_vector_store(model_name, **kwargs)
+    store.embedding_model.encode(["warm up"], convert_to_numpy=True)
+    return store
 
+def _reset_locks_after_fork() -> None: 
+    """A lock held by another thread at fork time would stay locked forever in the child."""
+    global _shared_stores_lock
+    _shared_stores_lock = threading.Lock()
+    for store in list(_live_stores): 
+        store._after_fork()
 
+if hasattr(os, 'register_at_fork'): 
+    os.register_at_fork(after_in_child=_reset_locks_after_fork)
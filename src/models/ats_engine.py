@@ -0,0 +1,137 @@
+"""
+ats_engine.py
+Vectorized ATS (applicant tracking system) keyword scoring for N resumes x M jobs.
+
+VectorStore._calculate_ats_score scans one resume for one job's keywords.
+Scoring every resume against every job that way repeats the tokenizing and
+the string scanning N x M times. The ATSEngine instead:
+1. compiles all jobs once: every keyword phrase and job title becomes a term
+   of one shared vocabulary, and each job becomes a column of sparse
+   term x job matrices (keyword membership, keyword length, title)
+2. tokenizes each resume once into a sparse resume x term count matrix (CSR)
+3. gets coverage, density and title presence for all pairs from sparse x
+   dense matrix products, and combines them with scoring.ats_score
+
+The CSR matrix is plain NumPy arrays (indptr, indices, data) so no scipy is
+needed; the product only touches the non-zero counts.
+"""
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from src.models.scoring import ats_score, ats_tokenize
+
+
+class TermCounts:
+    """Sparse (n_documents, n_terms) count matrix in CSR form, plus token totals."""
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray,
+                 token_counts: np.ndarray, n_terms: int):
+        self.indptr = indptr #row r holds entries indptr[r]:indptr[r + 1]
+        self.indices = indices #term ids
+        self.data = data #counts
+        self.token_counts = token_counts #tokens per document
+        self.n_terms = n_terms
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def dot(self, dense: np.ndarray, binary: bool = False) -> np.ndarray:
+        """
+        (n_documents, n_terms) @ (n_terms, k) without densifying the counts.
+        binary=True uses 1 for every non-zero count (term present or not).
+        """
+        result = np.zeros((len(self), dense.shape[1]), dtype=np.float32)
+        if len(self.indices) == 0:
+            return result
+        values = np.ones(len(self.data), dtype=np.float32) if binary else self.data.astype(np.float32)
+        contributions = values[:, None] * dense[self.indices]
+        non_empty = np.flatnonzero(np.diff(self.indptr) > 0)
+        #reduceat sums each row's contiguous block of entries
+        result[non_empty] = np.add.reduceat(contributions, self.indptr[non_empty], axis=0)
+        return result
+
+
+class ATSEngine:
+    """Keyword coverage / density / title ATS scores for many resumes against many jobs."""
+    def __init__(self, jobs: List[Any]):
+        """
+        Args:
+        jobs: JobRequirements objects (required_skills, preferred_skills, job_title)
+        """
+        self.jobs = list(jobs)
+        self.vocabulary: Dict[Tuple[str, ...], int] = {}
+        keyword_entries: List[Tuple[int, int]] = [] #(term id, job column)
+        title_entries: List[Tuple[int, int]] = []
+        self.keyword_counts = np.zeros(len(self.jobs), dtype=np.float32)
+        for column, job in enumerate(self.jobs):
+            #same keyword list as the single-pair path: unique, non-empty token phrases
+            keywords = [keyword for keyword in dict.fromkeys(
+                tuple(ats_tokenize(skill)) for skill in job.required_skills + job.preferred_skills
+            ) if keyword]
+            self.keyword_counts[column] = len(keywords)
+            for keyword in keywords:
+                keyword_entries.append((self._term_id(keyword), column))
+            title = tuple(ats_tokenize(job.job_title))
+            if title:
+                title_entries.append((self._term_id(title), column))
+        n_terms = len(self.vocabulary)
+        self.term_lengths = np.array([len(term) for term in self.vocabulary], dtype=np.float32)
+        #term x job matrices (few non-zeros per column; dense because n_terms stays small)
+        self.keyword_matrix = np.zeros((n_terms, len(self.jobs)), dtype=np.float32)
+        self.title_matrix = np.zeros((n_terms, len(self.jobs)), dtype=np.float32)
+        for term_id, column in keyword_entries:
+            self.keyword_matrix[term_id, column] = 1.0
+        for term_id, column in title_entries:
+            self.title_matrix[term_id, column] = 1.0
+        self.keyword_length_matrix = self.keyword_matrix * self.term_lengths[:, None]
+        #n-gram lengths to scan for, and the first tokens any term can start with
+        self.term_sizes = sorted({len(term) for term in self.vocabulary})
+        self.first_tokens = {term[0] for term in self.vocabulary}
+
+    def _term_id(self, term: Tuple[str, ...]) -> int:
+        if term not in self.vocabulary:
+            self.vocabulary[term] = len(self.vocabulary)
+        return self.vocabulary[term]
+
+    def term_counts(self, texts: List[str]) -> TermCounts:
+        """Tokenize every text once and count occurrences of every vocabulary term."""
+        indptr = [0]
+        indices: List[int] = []
+        data: List[int] = []
+        token_counts = np.zeros(len(texts), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = ats_tokenize(text)
+            token_counts[row] = len(tokens)
+            counts: Dict[int, int] = {}
+            for start, token in enumerate(tokens):
+                if token not in self.first_tokens:
+                    continue
+                for size in self.term_sizes:
+                    if start + size > len(tokens):
+                        break
+                    term_id = self.vocabulary.get(tuple(tokens[start:start + size]))
+                    if term_id is not None:
+                        counts[term_id] = counts.get(term_id, 0) + 1
+            for term_id in sorted(counts):
+                indices.append(term_id)
+                data.append(counts[term_id])
+            indptr.append(len(indices))
+        return TermCounts(np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64),
+                          np.array(data, dtype=np.int32), token_counts, len(self.vocabulary))
+
+    def score_components(self, counts: TermCounts) -> Dict[str, np.ndarray]:
+        """(n_resumes, n_jobs) coverage, density and title_present matrices."""
+        coverage = counts.dot(self.keyword_matrix, binary=True) / np.maximum(self.keyword_counts, 1.0)
+        density = counts.dot(self.keyword_length_matrix) / np.maximum(counts.token_counts, 1.0)[:, None]
+        title_present = (counts.dot(self.title_matrix, binary=True) > 0).astype(np.float32)
+        return {'coverage': coverage, 'density': density, 'title_present': title_present}
+
+    def score(self, resume_texts: List[str], batch_size: int = 512) -> np.ndarray:
+        """(len(resume_texts), len(jobs)) ATS scores, same formula as the single-pair path."""
+        scores = np.zeros((len(resume_texts), len(self.jobs)), dtype=np.float64)
+        for start in range(0, len(resume_texts), batch_size):
+            components = self.score_components(self.term_counts(resume_texts[start:start + batch_size]))
+            scores[start:start + batch_size] = ats_score(
+                components['coverage'], components['density'], components['title_present']
+            )
+        return scores
@@ -0,0 +1,132 @@
+"""
+chunking.py
+Length-bucketed, padding-minimizing encoder input for long resume sections.
+
+Transformer encoders pad every text in a batch to the longest one, and cut
+anything past their window (256 word pieces for all-MiniLM-L6-v2). Encoding
+sections in caller order therefore wastes most of the compute when one long
+section shares a batch with many short bullets, and silently drops the end
+of long sections. encode_sections instead:
+1. splits each section into sentence-aligned chunks under max_tokens
+   (sentences longer than the limit are split between words)
+2. sorts all chunks by token count, so every batch holds similar lengths
+   (little padding), and encodes them batch by batch
+3. mean-pools each section's chunk vectors (weighted by chunk tokens) and
+   returns one L2-normalized vector per section, in the original order
+"""
+import re
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.models.embeddings import l2_normalize
+
+#sentence ends (. ! ? followed by whitespace), line breaks and bullet markers
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\s*\n+\s*|\s*[•▪●◦]\s*')
+#rough word-piece count when no tokenizer is available: words and punctuation marks
+APPROXIMATE_TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+
+def approximate_token_count(text: str) -> int:
+    """Approximate tokenizer length (words + punctuation marks)."""
+    return len(APPROXIMATE_TOKEN_PATTERN.findall(text))
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences / bullet points (empty pieces dropped)."""
+    return [piece.strip() for piece in SENTENCE_BOUNDARY.split(text) if piece and piece.strip()]
+
+
+def chunk_text(
+    text: str,
+    max_tokens: int,
+    count_tokens: Callable[[str], int] = approximate_token_count
+) -> List[str]:
+    """
+    Greedily pack consecutive sentences into chunks of at most max_tokens.
+    A single sentence over the limit is split between words.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for sentence in split_sentences(text):
+        tokens = count_tokens(sentence)
+        if tokens > max_tokens:
+            #flush, then cut the long sentence into word windows
+            if current:
+                chunks.append(' '.join(current))
+                current, current_tokens = [], 0
+            window: List[str] = []
+            for word in sentence.split():
+                if window and count_tokens(' '.join(window + [word])) > max_tokens:
+                    chunks.append(' '.join(window))
+                    window = []
+                window.append(word)
+            if window:
+                chunks.append(' '.join(window))
+            continue
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(' '.join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += tokens
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+
+def length_sorted_batches(lengths: List[int], batch_size: int) -> List[np.ndarray]:
+    """Indexes of the inputs grouped into batches of similar length (shortest first)."""
+    order = np.argsort(np.asarray(lengths), kind='stable')
+    return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+
+def padded_tokens(lengths: List[int], batches: List[np.ndarray]) -> int:
+    """Tokens an encoder processes when every batch is padded to its longest input."""
+    lengths = np.asarray(lengths)
+    return int(sum(len(batch) * lengths[batch].max() for batch in batches if len(batch)))
+
+
+def encode_sections(
+    sections: List[str],
+    encode_fn: Callable[[List[str]], np.ndarray],
+    max_tokens: int = 256,
+    batch_size: int = 32,
+    count_tokens: Callable[[str], int] = approximate_token_count,
+    stats: Optional[Dict[str, int]] = None
+) -> np.ndarray:
+    """
+    One pooled, L2-normalized vector per section (same order as `sections`).
+    Args:
+    sections: section texts (any length; empty sections get a zero vector)
+    encode_fn: embeds a list of texts, e.x. VectorStore.generate_embeddings
+    max_tokens: chunk size limit, the encoder window (minus special tokens)
+    batch_size: chunks per encode_fn call
+    count_tokens: tokenizer length function
+    stats: optional dict that receives chunk, token and padded-token counts
+    """
+    chunk_texts: List[str] = []
+    chunk_sections: List[int] = []
+    for section_index, section in enumerate(sections):
+        for chunk in chunk_text(section or '', max_tokens, count_tokens):
+            chunk_texts.append(chunk)
+            chunk_sections.append(section_index)
+    lengths = [max(1, count_tokens(chunk)) for chunk in chunk_texts]
+    batches = length_sorted_batches(lengths, batch_size)
+    chunk_vectors: Optional[np.ndarray] = None
+    for batch in batches:
+        vectors = l2_normalize(encode_fn([chunk_texts[i] for i in batch]))
+        if chunk_vectors is None:
+            chunk_vectors = np.zeros((len(chunk_texts), vectors.shape[1]), dtype=np.float32)
+        chunk_vectors[batch] = vectors
+    if stats is not None:
+        stats['sections'] = len(sections)
+        stats['chunks'] = len(chunk_texts)
+        stats['tokens'] = int(sum(lengths))
+        stats['padded_tokens'] = padded_tokens(lengths, batches)
+    if chunk_vectors is None:
+        return np.zeros((len(sections), 0), dtype=np.float32)
+    #token-weighted mean of each section's chunks, scattered back in section order
+    pooled = np.zeros((len(sections), chunk_vectors.shape[1]), dtype=np.float32)
+    np.add.at(pooled, np.asarray(chunk_sections), chunk_vectors * np.asarray(lengths, dtype=np.float32)[:, None])
+    return l2_normalize(pooled)
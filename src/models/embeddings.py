@@ -0,0 +1,156 @@
+"""
+embeddings.py
+Text encoders and NumPy helpers for working with text embeddings
+(normalization, cosine similarity matrices and top-k selection).
+
+Encoders share one small interface (TextEncoder.encode, mirroring
+SentenceTransformer.encode) and are picked by model name via get_encoder:
+- "hashing" / "hashing-<dim>": HashingEncoder, a deterministic, torch-free
+  encoder built on hashed character and word n-grams
+- anything else: SentenceTransformerEncoder (a HuggingFace model name such
+  as the default "all-MiniLM-L6-v2")
+"""
+import re
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    Scale every row to unit length so that a dot product equals cosine similarity.
+    All-zero rows are left as zeros instead of producing NaNs.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def cosine_similarity_matrix(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Full (len(left), len(right)) cosine similarity matrix from one matrix multiply."""
+    return l2_normalize(left) @ l2_normalize(right).T
+
+
+def top_k_per_row(scores: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+    """
+    Best k (column index, score) pairs for every row of a score matrix, highest first.
+    Uses argpartition so each row costs O(columns) instead of a full sort.
+    """
+    if scores.size == 0 or k <= 0:
+        return [[] for _ in range(scores.shape[0])]
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+    results: List[List[Tuple[int, float]]] = []
+    for row, columns in enumerate(candidates):
+        row_scores = scores[row, columns]
+        order = np.argsort(-row_scores, kind='stable')
+        results.append([(int(columns[i]), float(row_scores[i])) for i in order])
+    return results
+
+
+class TextEncoder(ABC):
+    """Interface for anything that turns a list of texts into a 2d embedding array."""
+    name: str = ''
+    dim: Optional[int] = None
+    #longest input (in tokens) the encoder reads before truncating; None = no limit
+    max_tokens: Optional[int] = None
+
+    @abstractmethod
+    def encode(self, texts: List[str], convert_to_numpy: bool = True, **kwargs: Any) -> np.ndarray:
+        """Encode texts into a (len(texts), dim) float32 array."""
+
+    def count_tokens(self, text: str) -> int:
+        """Input length in the encoder's tokens (approximated by default)."""
+        from src.models.chunking import approximate_token_count
+        return approximate_token_count(text)
+
+
+class SentenceTransformerEncoder(TextEncoder):
+    """Neural encoder backed by a sentence-transformers model (imports torch)."""
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer #uses pytorch
+        self.name = model_name
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+        #the model's window includes the [CLS] and [SEP] special tokens
+        self.max_tokens = self.model.max_seq_length - 2
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.model.tokenizer.tokenize(text))
+
+    def encode(self, texts: List[str], convert_to_numpy: bool = True, **kwargs: Any) -> np.ndarray:
+        return self.model.encode(texts, convert_to_numpy=convert_to_numpy, **kwargs)
+
+
+class HashingEncoder(TextEncoder):
+    """
+    Deterministic, dependency-light encoder (NumPy + zlib only).
+
+    Every text is broken into character n-grams (of each word, padded with
+    boundary markers, so "python" and "pythonic" overlap) and word unigrams and
+    bigrams. Each feature is hashed with crc32 to a bucket in [0, dim) and a
+    +/-1 sign (the "hashing trick", a random projection of the huge sparse
+    n-gram space down to dim dimensions). Counts are log-scaled and the result
+    is L2-normalized, so dot products are cosine similarities.
+
+    It captures lexical overlap, not meaning ("car" vs "automobile" score ~0),
+    which makes it good for cheap pre-filtering, tests and air-gapped hosts.
+    """
+    def __init__(self, dim: int = 384, char_ngrams: Tuple[int, ...] = (3, 4, 5),
+                 word_weight: float = 2.0):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+        self.char_ngrams = char_ngrams
+        self.word_weight = word_weight
+
+    def _features(self, text: str) -> List[Tuple[str, float]]:
+        """(feature, weight) pairs for one text."""
+        words = re.findall(r'\w[\w+#.]*', text.lower())
+        features: List[Tuple[str, float]] = []
+        for word in words:
+            padded = f"<{word}>"
+            for n in self.char_ngrams:
+                for start in range(max(1, len(padded) - n + 1)):
+                    features.append((padded[start:start + n], 1.0))
+            features.append(("w:" + word, self.word_weight))
+        for first, second in zip(words, words[1:]):
+            features.append((f"b:{first} {second}", self.word_weight))
+        return features
+
+    def encode(self, texts: List[str], convert_to_numpy: bool = True, **kwargs: Any) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text or '')
+            if not features:
+                continue
+            hashes = np.fromiter(
+                (zlib.crc32(feature.encode('utf-8')) for feature, _ in features),
+                dtype=np.uint32, count=len(features)
+            )
+            weights = np.fromiter((weight for _, weight in features), dtype=np.float32,
+                                  count=len(features))
+            #lowest bit picks the sign, the remaining bits pick the bucket
+            signs = np.where(hashes & 1, 1.0, -1.0).astype(np.float32)
+            np.add.at(vectors[row], (hashes >> 1) % self.dim, signs * weights)
+        #sublinear (log) scaling keeps one very frequent n-gram from dominating
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        return l2_normalize(vectors)
+
+
+def get_encoder(model_name: str) -> TextEncoder:
+    """
+    Build the encoder for a model name: "hashing" or "hashing-<dim>" gives a
+    HashingEncoder, any other name is loaded as a sentence-transformers model.
+    """
+    match = re.fullmatch(r'hashing(?:-(\d+))?', model_name)
+    if match:
+        return HashingEncoder(dim=int(match.group(1) or 384))
+    return SentenceTransformerEncoder(model_name)
@@ -0,0 +1,199 @@
+"""
+scoring.py
+Resume scoring formulas shared by the single-pair path
+(VectorStore.match_resume_to_job) and the batch paths (rank_resumes, ...).
+
+Every formula is written with NumPy operations, so it works the same for one
+resume (plain floats) and for a whole batch (arrays). Keeping them in one
+place guarantees both paths produce identical scores.
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Union
+
+import numpy as np
+
+Number = Union[float, np.ndarray]
+
+#bump whenever a formula, weight or threshold below (or in VectorStore's matching) changes:
+#it is part of every MatchCache key, so results scored the old way are never served
+SCORING_VERSION = 1
+
+#How much each part contributes to the overall match score
+OVERALL_WEIGHTS: Dict[str, float] = {
+    'skills': 0.60,
+    'experience': 0.25,
+    'semantic': 0.15
+}
+#Required skills matter more than preferred ones
+REQUIRED_SKILL_WEIGHT = 0.8
+PREFERRED_SKILL_WEIGHT = 0.2
+
+#Experience levels in increasing order of seniority (see JobAnalyzer.experience_indicators)
+EXPERIENCE_LEVELS: List[str] = ['entry', 'mid', 'senior', 'executive']
+LEVEL_RANKS: Dict[str, int] = {level: rank for rank, level in enumerate(EXPERIENCE_LEVELS)}
+
+#ATS score components
+ATS_WEIGHTS: Dict[str, float] = {
+    'coverage': 0.60, #fraction of job keywords present in the resume
+    'density': 0.25, #how often they are used, relative to resume length
+    'title': 0.15 #whether the exact job title appears
+}
+ATS_TARGET_DENSITY = 0.03 #keyword tokens / all tokens at which density scores 1.0
+
+#note: keeps '+', '#' and inner dots so c++, c# and node.js survive as one token
+ATS_TOKEN_PATTERN = re.compile(r'[a-z0-9+#]+(?:\.[a-z0-9+#]+)*')
+
+
+def match_ratio(credit: Number, total: int) -> Number:
+    """Matched credit / number of skills; an empty skill list counts as fully matched."""
+    if total == 0:
+        return np.ones_like(credit, dtype=np.float32) if isinstance(credit, np.ndarray) else 1.0
+    return credit / total
+
+
+def skills_score(required_ratio: Number, preferred_ratio: Number) -> Number:
+    """Weighted combination of required and preferred skill match ratios."""
+    return REQUIRED_SKILL_WEIGHT * required_ratio + PREFERRED_SKILL_WEIGHT * preferred_ratio
+
+
+def estimate_level_rank(years: Number) -> Number:
+    """Experience level rank implied by years of experience (0 = entry ... 3 = executive)."""
+    return np.searchsorted(np.array([2.0, 5.0, 10.0]), years, side='right')
+
+
+def experience_score(
+    resume_years: Number,
+    resume_level_rank: Number,
+    required_years: Optional[int],
+    required_level: str
+) -> Number:
+    """
+    0.7 * years score + 0.3 * level score.
+    years score: resume years / required years (capped at 1), 1.0 if no years required
+    level score: 1.0 if the resume is at or above the required level, 0.5 otherwise,
+    1.0 if the job level is unknown
+    """
+    return experience_score_ranked(
+        resume_years, resume_level_rank, required_years or 0, LEVEL_RANKS.get(required_level, -1)
+    )
+
+
+def experience_score_ranked(
+    resume_years: Number,
+    resume_level_rank: Number,
+    required_years: Number,
+    required_level_rank: Number
+) -> Number:
+    """
+    experience_score with the job side as numbers too, so one resume can be scored
+    against many jobs at once: required_years 0 means no requirement and
+    required_level_rank -1 means the level is unknown.
+    """
+    resume_years = np.asarray(resume_years, dtype=np.float32)
+    required_years = np.asarray(required_years, dtype=np.float32)
+    years_part = np.where(
+        required_years > 0,
+        np.minimum(1.0, resume_years / np.maximum(required_years, 1.0)),
+        1.0
+    )
+    level_part = np.where(
+        np.asarray(required_level_rank) < 0,
+        1.0,
+        np.where(np.asarray(resume_level_rank) >= required_level_rank, 1.0, 0.5)
+    )
+    score = (0.7 * years_part + 0.3 * level_part).astype(np.float32)
+    return float(score) if np.ndim(score) == 0 else score
+
+
+def overall_score(skills: Number, experience: Number, semantic: Number) -> Number:
+    """Overall match score from its three parts (each in [0, 1])."""
+    semantic = np.clip(semantic, 0.0, 1.0)
+    score = (OVERALL_WEIGHTS['skills'] * skills
+             + OVERALL_WEIGHTS['experience'] * experience
+             + OVERALL_WEIGHTS['semantic'] * semantic)
+    return float(score) if np.ndim(score) == 0 else score
+
+
+def ats_tokenize(text: str) -> List[str]:
+    """Lowercase word tokens used by ATS keyword matching."""
+    return ATS_TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def ats_score(coverage: Number, density: Number, title_present: Number) -> Number:
+    """ATS score from keyword coverage, keyword density and job-title presence."""
+    density_part = np.minimum(1.0, np.asarray(density, dtype=np.float64) / ATS_TARGET_DENSITY)
+    score = (ATS_WEIGHTS['coverage'] * coverage
+             + ATS_WEIGHTS['density'] * density_part
+             + ATS_WEIGHTS['title'] * title_present)
+    return float(score) if np.ndim(score) == 0 else score
+
+
+#number of set bits in every possible byte, for vectorised popcounts
+POPCOUNT_TABLE = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+
+class SkillBitsets:
+    """
+    Fixed skill vocabulary (skill -> bit position) used to store every resume's
+    skill set as a packed bitset (1 bit per skill, np.packbits layout). Matching
+    a job against many resumes is then a bitwise AND plus a popcount per row.
+    """
+    def __init__(self, skills: Iterable[str]):
+        self.vocabulary: Dict[str, int] = {}
+        for skill in skills:
+            if skill not in self.vocabulary:
+                self.vocabulary[skill] = len(self.vocabulary)
+        self.skills: List[str] = list(self.vocabulary)
+        self.n_bytes = max(1, (len(self.vocabulary) + 7) // 8)
+
+    def to_bool(self, skill_sets: Sequence[Set[str]]) -> np.ndarray:
+        """(n, vocabulary size) boolean matrix; unknown skills are ignored."""
+        matrix = np.zeros((len(skill_sets), len(self.vocabulary)), dtype=bool)
+        for row, skills in enumerate(skill_sets):
+            for skill in skills:
+                column = self.vocabulary.get(skill)
+                if column is not None:
+                    matrix[row, column] = True
+        return matrix
+
+    def pack(self, skill_sets: Sequence[Set[str]]) -> np.ndarray:
+        """(n, n_bytes) uint8 packed bitsets."""
+        packed = np.packbits(self.to_bool(skill_sets), axis=1)
+        if packed.shape[1] < self.n_bytes: #empty vocabulary edge case
+            packed = np.zeros((len(skill_sets), self.n_bytes), dtype=np.uint8)
+        return packed
+
+    def unpack(self, bits: np.ndarray) -> np.ndarray:
+        """Inverse of pack: (n, vocabulary size) boolean matrix."""
+        return np.unpackbits(bits, axis=1, count=len(self.vocabulary)).astype(bool)
+
+    def mask(self, skills: Iterable[str]) -> np.ndarray:
+        """Packed bitset (n_bytes,) of the given skills."""
+        return self.pack([set(skills)])[0]
+
+    def column(self, bits: np.ndarray, skill: str) -> np.ndarray:
+        """Boolean (n,) column of one skill across packed rows (all False if unknown)."""
+        position = self.vocabulary.get(skill)
+        if position is None:
+            return np.zeros(bits.shape[0], dtype=bool)
+        return (bits[:, position >> 3] >> (7 - (position & 7))) & 1 == 1
+
+    @staticmethod
+    def popcount(bits: np.ndarray) -> np.ndarray:
+        """Number of set bits per row of a packed (n, n_bytes) matrix."""
+        return POPCOUNT_TABLE[bits].sum(axis=1, dtype=np.int32)
+
+
+def count_phrases(tokens: List[str], phrases: Iterable[tuple]) -> Dict[tuple, int]:
+    """
+    Count occurrences of token phrases (tuples of tokens, e.x. ('google', 'cloud'))
+    in a token list. Each distinct phrase length is counted with one n-gram pass.
+    """
+    phrases = list(phrases)
+    counts: Dict[tuple, int] = {phrase: 0 for phrase in phrases}
+    for n in {len(phrase) for phrase in phrases if phrase}:
+        for start in range(len(tokens) - n + 1):
+            gram = tuple(tokens[start:start + n])
+            if gram in counts:
+                counts[gram] += 1
+    return counts
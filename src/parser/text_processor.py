@@ -4,7 +4,7 @@
 import re #for regex (re = regular expression)
 import string 
 import logging 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
 import unicodedata #to normalize unicode strings e.x. remove accents 
 
 logger = logging.getLogger(__name__)
@@ -36,6 +36,8 @@ class TextProcessor:
         for pattern in self.formatting_artifacts: 
             compiled_pattern = re.compile(pattern, re.MULTILINE)
             self.compiled_artifacts.append(compiled_pattern)
+        #words for shingles (see get_shingles); keeps c++, c#, node.js and hyphenated words whole
+        self.shingle_word_pattern = re.compile(r"[a-z0-9+#]+(?:[.'-][a-z0-9+#]+)*")
 
     #main text processing pipeline
     #raw_text = raw extracted text from pdf 
@@ -154,7 +156,22 @@ class TextProcessor:
         
         return text.strip()
     
-    #extract individual words from text 
+    #word shingles (overlapping runs of `size` cleaned, lowercased words) of a text
+    #e.x. size=3: "built rest apis in python" -> {'built rest apis', 'rest apis python'}
+    #used for near-duplicate detection (see src/database/near_duplicates.py)
+    def get_shingles(self, text: str, size: int = 3) -> Set[str]:
+        #note: one lowercase regex pass + the stopword set instead of _extract_words/_clean_words,
+        #this runs on every incoming posting/resume so it has to stay much cheaper than parsing it
+        words = [word for word in self.shingle_word_pattern.findall(text.lower()) 
+                 if word not in self.resume_stopwords]
+        if len(words) < size: #short texts: the whole text is one shingle
+            return {' '.join(words)} if words else set()
+        shingles = set()
+        for start in range(len(words) - size + 1):
+            shingles.add(' '.join(words[start:start + size]))
+        return shingles
+
+    #extract individual words from text
     def _extract_words(self, text: str) -> List[str]:
         if not text:
             return []
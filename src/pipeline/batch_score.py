@@ -0,0 +1,158 @@
+"""
+batch_score.py
+Command-line batch scoring of a folder of resumes against one or more job files.
+
+Every resume goes through the staged pipeline (see orchestrator.py) and is
+matched against every job; one JSON line per resume-job pair is written as
+soon as the resume is done, so results stream out while the run goes on and
+an interrupted run loses nothing already written. A summary (throughput,
+errors by kind, per-stage counters) is printed to stderr at the end.
+
+--resume-from reads an earlier JSONL output and skips every pair it already
+holds without an error (failed pairs are retried). When it is the same file
+as --output, new lines are appended to it.
+
+e.x.
+python -m src.pipeline.batch_score data/sample_resumes --jobs job1.txt job2.txt \\
+    --output results.jsonl --workers 4
+python -m src.pipeline.batch_score "resumes/**/*.pdf" --jobs job1.txt \\
+    --output results.jsonl --resume-from results.jsonl
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple
+
+from src.database.vector_store import VectorStore
+from src.pipeline.orchestrator import PipelineResult, ResumePipeline
+from src.utils.helpers import json_default
+
+logger = logging.getLogger(__name__)
+
+
+def find_resumes(path: str) -> List[str]:
+    """The PDF files in a directory, or the files matching a glob pattern (** allowed), sorted."""
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith('.pdf'))
+    return sorted(file for file in glob.glob(path, recursive=True) if os.path.isfile(file))
+
+
+def load_done_pairs(path: str) -> Set[Tuple[str, str]]:
+    """(resume, job) pairs in an earlier output that were scored without an error."""
+    done: Set[Tuple[str, str]] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError: #e.x. a line cut short when the last run was killed
+                continue
+            if record.get('error') is None and 'resume' in record and 'job' in record:
+                done.add((record['resume'], record['job']))
+    return done
+
+
+def pair_records(result: PipelineResult, jobs: List[Tuple[str, Any]]) -> List[Dict[str, Any]]:
+    """One output record per job for a pipeline result (matches are in job order)."""
+    records = []
+    for position, (job_path, job) in enumerate(jobs):
+        record: Dict[str, Any] = {'resume': result.name, 'job': job_path, 'job_title': job.job_title,
+                                  'error': result.error}
+        if result.ok and position < len(result.matches):
+            record.update(result.matches[position].to_dict())
+        elif result.ok:
+            record['error'] = 'no match result'
+        records.append(record)
+    return records
+
+
+def print_summary(summary: Dict[str, Any], stats: Dict[str, Any], out: TextIO) -> None:
+    seconds = max(summary['seconds'], 1e-9)
+    print(f"Scored {summary['pairs']} resume-job pairs ({summary['resumes']} resumes x {summary['jobs']} jobs) "
+          f"in {summary['seconds']:.1f}s: {summary['pairs'] / seconds:.1f} pairs/s, "
+          f"{summary['resumes'] / seconds:.1f} resumes/s", file=out)
+    if summary['skipped']:
+        print(f"Skipped {summary['skipped']} pairs already scored", file=out)
+    print(f"Errors: {summary['error_pairs']} pairs", file=out)
+    for kind, count in summary['errors_by_kind'].most_common():
+        print(f"  {kind}: {count}", file=out)
+    for name, stage in stats.get('stages', {}).items():
+        print(f"  stage {name}: {stage['processed']} documents, {stage['errors']} errors, "
+              f"busy {stage['busy_seconds']:.1f}s on {stage['workers']} workers, "
+              f"max queue {stage['max_queue_depth']}/{stage['queue_size']}", file=out)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the batch; returns the exit code (1 if any pair failed)."""
+    parser = argparse.ArgumentParser(description="Score resumes against job descriptions (JSONL output)")
+    parser.add_argument('resumes', help="directory of PDF resumes, or a glob pattern")
+    parser.add_argument('--jobs', nargs='+', required=True, help="job description text files")
+    parser.add_argument('--output', default='-', help="JSONL output file ('-' = stdout)")
+    parser.add_argument('--resume-from', default=None, help="earlier JSONL output whose finished pairs are skipped")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="parse worker processes")
+    parser.add_argument('--match-workers', type=int, default=1)
+    parser.add_argument('--queue-size', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=16, help="resumes per embedding call")
+    parser.add_argument('--model', default='all-MiniLM-L6-v2')
+    parser.add_argument('--no-cache', action='store_true',
+                        help="keep the embedding cache and skill matrix in memory only")
+    args = parser.parse_args(argv)
+
+    resume_paths = find_resumes(args.resumes)
+    if not resume_paths:
+        print(f"No resumes found for {args.resumes}", file=sys.stderr)
+        return 1
+    options: Dict[str, Any] = {'cache_dir': None, 'skill_matrix_dir': None} if args.no_cache else {}
+    store = VectorStore(model_name=args.model, **options)
+    jobs = []
+    for job_path in args.jobs:
+        with open(job_path, encoding='utf-8') as file:
+            jobs.append((job_path, store.analyze_job(file.read())))
+
+    done = load_done_pairs(args.resume_from) if args.resume_from else set()
+    pending = [path for path in resume_paths if any((path, job_path) not in done for job_path, _ in jobs)]
+    skipped = sum(1 for path in resume_paths for job_path, _ in jobs if (path, job_path) in done)
+
+    pipeline = ResumePipeline(
+        store, [job for _, job in jobs], parse_workers=args.workers, match_workers=args.match_workers,
+        queue_size=args.queue_size, embed_batch_size=args.batch_size
+    )
+    summary: Dict[str, Any] = {'resumes': 0, 'jobs': len(jobs), 'pairs': 0, 'skipped': skipped,
+                               'error_pairs': 0, 'errors_by_kind': Counter()}
+    started = time.perf_counter()
+    appending = args.resume_from is not None and args.output != '-' and os.path.exists(args.output) \
+        and os.path.abspath(args.output) == os.path.abspath(args.resume_from)
+    output = sys.stdout if args.output == '-' else open(args.output, 'a' if appending else 'w', encoding='utf-8')
+    if appending and output.tell() > 0:
+        with open(args.output, 'rb') as previous:
+            previous.seek(-1, os.SEEK_END)
+            if previous.read(1) != b'\n': #finish a line cut short by a killed run
+                output.write('\n')
+    try:
+        for result in pipeline.run(pending):
+            summary['resumes'] += 1
+            for record in pair_records(result, jobs):
+                if (record['resume'], record['job']) in done:
+                    continue
+                output.write(json.dumps(record, default=json_default) + '\n')
+                summary['pairs'] += 1
+                if record['error'] is not None:
+                    summary['error_pairs'] += 1
+                    summary['errors_by_kind'][record['error'].split(':')[0]] += 1
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    summary['seconds'] = time.perf_counter() - started
+    print_summary(summary, pipeline.get_stats(), sys.stderr)
+    return 1 if summary['error_pairs'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,457 @@
+"""
+orchestrator.py
+Staged resume pipeline: PDFExtractor -> TextProcessor -> SectionParser ->
+embeddings -> matching (see docs/execution_flow.md), run as overlapping stages.
+
+Every stage has its own workers and hands documents to the next one through a
+bounded queue:
+- parse: extraction, cleaning and section parsing are CPU-bound pure Python,
+  so they run in a pool of worker processes (ProcessPoolExecutor, 'spawn')
+- embed: a single model thread takes whatever parsed documents are waiting
+  (up to embed_batch_size, or embed_wait_ms after the first one) and embeds
+  them with one VectorStore.embed_resumes call, plus one call for the skill
+  names found in the batch, so the match stage never waits on the model
+- match: worker threads score each resume against every job
+  (VectorStore.match_resume_to_job) and optionally look up best practices in
+  the knowledge base
+
+Document 2 is parsed while document 1 is embedded and document 0 is matched.
+When a downstream stage falls behind, its input queue fills up, the stage
+feeding it blocks on put, and the parse stage stops submitting new files. At
+most parse_in_flight + embed_batch_size + match_workers + 3 * queue_size
+documents are held in memory at any time, however long the input is.
+
+A failed document (unreadable PDF, empty text) does not stop the run: it comes
+out with .error set and skips the stages after the one that failed.
+"""
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.database.schemas import ResumeJobMatch
+
+logger = logging.getLogger(__name__)
+
+#a PDF path, or (file name, PDF bytes) for uploads
+PipelineInput = Union[str, Tuple[str, bytes]]
+
+#per-process parsers, created on first use in every parse worker
+_parsers: Optional[Tuple[Any, Any, Any]] = None
+
+
+def _get_parsers() -> Tuple[Any, Any, Any]:
+    global _parsers
+    if _parsers is None:
+        from src.parser.pdf_extractor import PDFExtractor
+        from src.parser.section_parser import SectionParser
+        from src.parser.text_processor import TextProcessor
+        _parsers = (PDFExtractor(), TextProcessor(), SectionParser())
+    return _parsers
+
+
+def parse_document(source: PipelineInput) -> Dict[str, Any]:
+    """
+    Extract, clean and section one resume (the parse stage; runs in a worker process).
+    Args: source: PDF path or (file name, PDF bytes)
+    Returns: dict with 'name', 'extraction' (stats, no text), 'text' (cleaned),
+    'sections' ({name: {'content', 'confidence'}}), 'parse_seconds' and 'error' (None if fine)
+    """
+    started = time.perf_counter()
+    extractor, text_processor, section_parser = _get_parsers()
+    if isinstance(source, tuple):
+        name = source[0]
+        extraction = extractor.extract_from_bytes(source[1], source[0])
+    else:
+        name = str(source)
+        extraction = extractor.extract_text_disk(str(source))
+    document: Dict[str, Any] = {
+        'name': name,
+        'extraction': {key: value for key, value in extraction.items() if key not in ('full_text', 'page_texts')},
+        'text': '',
+        'sections': {},
+        'error': None
+    }
+    if extraction['extraction_status'] != 'success':
+        document['error'] = f"extraction failed: {extraction.get('error', 'unknown error')}"
+    else:
+        processed = text_processor.process_text(extraction['full_text'])
+        if processed['processing_status'] != 'success':
+            document['error'] = f"text processing failed: {processed.get('error', 'unknown error')}"
+        else:
+            document['text'] = processed['cleaned_text']
+            parsed = section_parser.parse_sections(processed['cleaned_text'])
+            #ResumeSection objects -> plain dicts, cheap to send back from the worker
+            document['sections'] = {
+                section_name: {'content': section.content, 'confidence': section.confidence}
+                for section_name, section in parsed.get('sections', {}).items()
+            }
+    document['parse_seconds'] = time.perf_counter() - started
+    return document
+
+
+class PipelineResult:
+    """Everything the pipeline produced for one resume."""
+    __slots__ = ('name', 'extraction', 'text', 'sections', 'embedding', 'matches',
+                 'best_practices', 'error', 'stage_seconds')
+
+    def __init__(
+        self,
+        name: str,
+        extraction: Dict[str, Any],
+        text: str,
+        sections: Dict[str, Dict[str, Any]],
+        embedding: Optional[np.ndarray] = None,
+        matches: Optional[List[ResumeJobMatch]] = None, #one per job, in job order
+        best_practices: Optional[List[str]] = None,
+        error: Optional[str] = None,
+        stage_seconds: Optional[Dict[str, float]] = None
+    ):
+        self.name = name
+        self.extraction = extraction
+        self.text = text
+        self.sections = sections
+        self.embedding = embedding
+        self.matches = matches or []
+        self.best_practices = best_practices or []
+        self.error = error
+        self.stage_seconds = stage_seconds or {}
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready dict (the embedding is left out)."""
+        return {
+            'name': self.name,
+            'extraction': self.extraction,
+            'sections': self.sections,
+            'matches': [match.to_dict() for match in self.matches],
+            'best_practices': self.best_practices,
+            'error': self.error,
+            'stage_seconds': self.stage_seconds
+        }
+
+
+class _StageStats:
+    """Counters of one stage; busy_seconds is summed over the stage's workers."""
+    def __init__(self, workers: int, queue_size: int):
+        self.lock = threading.Lock()
+        self.values: Dict[str, Any] = {
+            'workers': workers, 'processed': 0, 'errors': 0, 'busy_seconds': 0.0,
+            'queue_size': queue_size, 'max_queue_depth': 0
+        }
+
+    def record(self, processed: int = 0, errors: int = 0, busy_seconds: float = 0.0) -> None:
+        with self.lock:
+            self.values['processed'] += processed
+            self.values['errors'] += errors
+            self.values['busy_seconds'] += busy_seconds
+
+    def depth(self, depth: int) -> None:
+        with self.lock:
+            self.values['max_queue_depth'] = max(self.values['max_queue_depth'], depth)
+
+
+class _Stopped(Exception):
+    """Raised inside stage threads once the run was stopped."""
+
+
+class ResumePipeline:
+    """Run resumes through parse -> embed -> match as overlapping, bounded stages."""
+    def __init__(
+        self,
+        vector_store: Any = None,
+        job_requirements: Optional[List[Any]] = None,
+        knowledge_base: Any = None,
+        parse_workers: int = 2,
+        match_workers: int = 1,
+        queue_size: int = 8,
+        parse_in_flight: Optional[int] = None,
+        embed_batch_size: int = 16,
+        embed_wait_ms: float = 20.0,
+        best_practices_k: int = 3
+    ):
+        """
+        Args:
+        vector_store: VectorStore used for embeddings and matching (default: the shared
+        "all-MiniLM-L6-v2" store, see get_vector_store)
+        job_requirements: JobRequirements every resume is matched against (none = parse and
+        embed only)
+        knowledge_base: optional KnowledgeBase; best practices for each resume's missing skills
+        are looked up lexically (no extra model calls)
+        parse_workers: parse processes; 0 parses on a thread in this process (no process
+        start-up cost, for small or interactive runs)
+        match_workers: match threads
+        queue_size: capacity of each queue between stages (the backpressure bound)
+        parse_in_flight: files submitted to the parse pool at once (default 2 * parse_workers)
+        embed_batch_size / embed_wait_ms: most documents per embedding call, and how long the
+        first document of a batch waits for more
+        best_practices_k: knowledge base documents per resume
+        """
+        if vector_store is None:
+            from src.database.vector_store import get_vector_store
+            vector_store = get_vector_store()
+        self.vector_store = vector_store
+        self.job_requirements = list(job_requirements or [])
+        self.knowledge_base = knowledge_base
+        self.parse_workers = parse_workers
+        self.match_workers = max(1, match_workers)
+        self.queue_size = max(1, queue_size)
+        self.parse_in_flight = parse_in_flight or max(1, 2 * parse_workers)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.embed_wait_ms = embed_wait_ms
+        self.best_practices_k = best_practices_k
+        self.stats: Dict[str, Any] = {}
+        self._stage_stats: Dict[str, _StageStats] = {}
+
+    def _put(self, target: "queue.Queue", item: Any, stats: Optional[_StageStats], stop: threading.Event) -> None:
+        """Blocking put (this is the backpressure), which gives up once the run is stopped."""
+        while True:
+            if stop.is_set():
+                raise _Stopped()
+            try:
+                target.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            if stats is not None:
+                stats.depth(target.qsize())
+            return
+
+    @staticmethod
+    def _get(source: "queue.Queue", stop: threading.Event, timeout: Optional[float] = None) -> Any:
+        """Blocking get; with a timeout, raises queue.Empty when nothing arrived in time."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            if stop.is_set():
+                raise _Stopped()
+            wait_for = 0.1 if deadline is None else min(0.1, deadline - time.perf_counter())
+            if wait_for <= 0:
+                raise queue.Empty()
+            try:
+                return source.get(timeout=wait_for)
+            except queue.Empty:
+                continue
+
+    def _parse_executor(self) -> Executor:
+        if self.parse_workers <= 0:
+            return ThreadPoolExecutor(1, thread_name_prefix='pipeline-parse')
+        #'spawn': forking a process that holds a loaded model (and its threads) is unsafe
+        return ProcessPoolExecutor(self.parse_workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def _run_parse(self, inputs: Iterable[PipelineInput], parsed: "queue.Queue", stop: threading.Event) -> None:
+        """Keep at most parse_in_flight files in the pool; a full parsed queue pauses submission."""
+        stats = self._stage_stats['parse']
+        executor = self._parse_executor()
+        in_flight: Dict[Future, PipelineInput] = {}
+        sources = iter(inputs)
+        exhausted = False
+        try:
+            while not exhausted or in_flight:
+                while not exhausted and len(in_flight) < self.parse_in_flight:
+                    source = next(sources, None)
+                    if source is None:
+                        exhausted = True
+                    else:
+                        in_flight[executor.submit(parse_document, source)] = source
+                stats.depth(len(in_flight))
+                if not in_flight:
+                    break
+                done, _ = wait(list(in_flight), timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source = in_flight.pop(future)
+                    try:
+                        document = future.result()
+                    except Exception as e:
+                        name = source[0] if isinstance(source, tuple) else str(source)
+                        logger.error(f"Error parsing {name}: {str(e)}")
+                        document = {'name': name, 'extraction': {}, 'text': '', 'sections': {},
+                                    'error': f"parse failed: {str(e)}", 'parse_seconds': 0.0}
+                    stats.record(1, int(document['error'] is not None), document['parse_seconds'])
+                    self._put(parsed, document, self._stage_stats['embed'], stop)
+                if stop.is_set():
+                    raise _Stopped()
+        except _Stopped:
+            pass
+        except Exception as e:
+            logger.error(f"Error in the parse stage: {str(e)}")
+        finally:
+            #pending files are dropped, but a parse already running is waited for, so no
+            #pool thread or process outlives run()
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+            try:
+                self._put(parsed, None, None, stop)
+            except _Stopped:
+                pass
+
+    def _embed_batch(self, documents: List[Dict[str, Any]]) -> int:
+        """
+        One embedding call for the batch's resumes and one for the skills they mention.
+        Returns: the number of documents that failed here
+        """
+        parsed = [document for document in documents if document['error'] is None]
+        if not parsed:
+            return 0
+        store = self.vector_store
+        try:
+            embeddings = store.embed_resumes([document['text'] for document in parsed])
+            skills = sorted({skill for document in parsed for skill in store._extract_resume_skills(document['text'])})
+            if skills:
+                store._skill_vectors(skills) #warms the embedding cache for the match stage
+            for document, embedding in zip(parsed, embeddings):
+                document['embedding'] = embedding
+            return 0
+        except Exception as e:
+            logger.error(f"Error embedding a batch of {len(parsed)} resumes: {str(e)}")
+            for document in parsed:
+                document['error'] = f"embedding failed: {str(e)}"
+            return len(parsed)
+
+    def _run_embed(self, parsed: "queue.Queue", embedded: "queue.Queue", stop: threading.Event) -> None:
+        stats = self._stage_stats['embed']
+        finished = False
+        try:
+            while not finished:
+                first = self._get(parsed, stop)
+                if first is None:
+                    break
+                batch = [first]
+                #collect what is already waiting, up to the batch size / wait limit
+                deadline = time.perf_counter() + self.embed_wait_ms / 1000.0
+                while len(batch) < self.embed_batch_size:
+                    try:
+                        document = self._get(parsed, stop, timeout=max(0.0, deadline - time.perf_counter()))
+                    except queue.Empty:
+                        break
+                    if document is None:
+                        finished = True
+                        break
+                    batch.append(document)
+                started = time.perf_counter()
+                errors = self._embed_batch(batch)
+                seconds = time.perf_counter() - started
+                stats.record(len(batch), errors, seconds)
+                for document in batch:
+                    document['embed_seconds'] = seconds / len(batch)
+                    self._put(embedded, document, self._stage_stats['match'], stop)
+        except _Stopped:
+            pass
+        except Exception as e:
+            logger.error(f"Error in the embed stage: {str(e)}")
+        finally:
+            for _ in range(self.match_workers):
+                try:
+                    self._put(embedded, None, None, stop)
+                except _Stopped:
+                    break
+
+    def _match(self, document: Dict[str, Any]) -> PipelineResult:
+        result = PipelineResult(
+            document['name'], document['extraction'], document['text'], document['sections'],
+            embedding=document.get('embedding'), error=document['error'],
+            stage_seconds={'parse': document.get('parse_seconds', 0.0), 'embed': document.get('embed_seconds', 0.0)}
+        )
+        if result.error is not None:
+            return result
+        try:
+            result.matches = [self.vector_store.match_resume_to_job(result.text, job)
+                              for job in self.job_requirements]
+            if self.knowledge_base is not None and self.best_practices_k > 0:
+                missing = list(dict.fromkeys(skill for match in result.matches for skill in match.missing_skills))
+                query = f"missing skills {' '.join(missing)}" if missing else result.text[:500]
+                result.best_practices = self.knowledge_base.get_best_practices(
+                    query, k=self.best_practices_k, mode='lexical'
+                )
+        except Exception as e:
+            logger.error(f"Error matching {result.name}: {str(e)}")
+            result.error = f"matching failed: {str(e)}"
+        return result
+
+    def _run_match(self, embedded: "queue.Queue", results: "queue.Queue", stop: threading.Event) -> None:
+        stats = self._stage_stats['match']
+        try:
+            while True:
+                document = self._get(embedded, stop)
+                if document is None:
+                    break
+                started = time.perf_counter()
+                failed_before = document['error'] is not None
+                result = self._match(document)
+                seconds = time.perf_counter() - started
+                result.stage_seconds['match'] = seconds
+                stats.record(1, int(not failed_before and result.error is not None), seconds)
+                self._put(results, result, None, stop)
+        except _Stopped:
+            pass
+        except Exception as e:
+            logger.error(f"Error in the match stage: {str(e)}")
+        finally:
+            try:
+                self._put(results, None, None, stop)
+            except _Stopped:
+                pass
+
+    def run(self, inputs: Iterable[PipelineInput]) -> Iterator[PipelineResult]:
+        """
+        Process resumes through every stage, yielding results in completion order (not
+        input order). inputs may be a lazy iterator; it is only consumed as fast as the
+        stages make room. Closing the generator early stops every stage.
+        Args: inputs: PDF paths and/or (file name, PDF bytes) tuples
+        """
+        started = time.perf_counter()
+        stop = threading.Event()
+        parsed: "queue.Queue" = queue.Queue(self.queue_size)
+        embedded: "queue.Queue" = queue.Queue(self.queue_size)
+        results: "queue.Queue" = queue.Queue(self.queue_size)
+        self._stage_stats = {
+            'parse': _StageStats(self.parse_workers, self.parse_in_flight),
+            'embed': _StageStats(1, self.queue_size),
+            'match': _StageStats(self.match_workers, self.queue_size)
+        }
+        threads = [threading.Thread(target=self._run_parse, args=(inputs, parsed, stop), name='pipeline-parse'),
+                   threading.Thread(target=self._run_embed, args=(parsed, embedded, stop), name='pipeline-embed')]
+        threads += [threading.Thread(target=self._run_match, args=(embedded, results, stop), name=f'pipeline-match-{i}')
+                    for i in range(self.match_workers)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        documents = errors = 0
+        running = self.match_workers
+        try:
+            while running:
+                result = results.get()
+                if result is None:
+                    running -= 1
+                    continue
+                documents += 1
+                errors += int(not result.ok)
+                yield result
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            seconds = time.perf_counter() - started
+            self.stats = {
+                'documents': documents,
+                'errors': errors,
+                'seconds': seconds,
+                'documents_per_second': documents / max(seconds, 1e-9),
+                'stages': {name: dict(stage.values) for name, stage in self._stage_stats.items()}
+            }
+            logger.info(f"Pipeline processed {documents} documents ({errors} errors) in {seconds:.1f}s")
+
+    def run_all(self, inputs: Iterable[PipelineInput]) -> List[PipelineResult]:
+        return list(self.run(inputs))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Totals of the last run: documents, errors, throughput and per-stage counters."""
+        return self.stats
+
@@ -0,0 +1,154 @@
+"""
+helpers.py
+Small shared utilities used across the parser, database and analyzer modules.
+"""
+from collections import deque
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton for counting many literal keywords in one pass.
+
+    Each keyword is attached to a (group, label) pair, e.x. ('industry', 'finance')
+    or ('experience_level', 'senior'). Scanning a text walks it once, character by
+    character, so the cost depends on the text length and not on how many keywords
+    were registered. Matching is substring-based (like `keyword in text`) and
+    overlapping matches are all counted.
+    """
+    def __init__(self, keywords: Dict[str, Dict[str, List[str]]]) -> None:
+        """
+        Build the automaton.
+        Args: keywords: {group: {label: [keyword, ...]}}. Keywords should already be
+        normalized the same way as the texts that will be scanned (e.x. lowercased).
+        """
+        self.groups: Dict[str, List[str]] = {}
+        #goto[state] maps a character to the next state; state 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        #output[state] = list of (group, label) pairs for keywords ending at this state
+        self._output: List[List[Tuple[str, str]]] = [[]]
+        for group, labels in keywords.items():
+            self.groups[group] = list(labels)
+            for label, words in labels.items():
+                for word in words:
+                    self._add_keyword(word, group, label)
+        self._build_failure_links()
+
+    def _add_keyword(self, word: str, group: str, label: str) -> None:
+        """Insert a keyword into the trie."""
+        if not word:
+            return
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((group, label))
+
+    def _build_failure_links(self) -> None:
+        """Breadth-first pass to compute failure links and merge outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                #inherit matches that end at the failure state (suffix keywords)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str, str]]:
+        """Yield (end_index, group, label) for every keyword occurrence in text."""
+        state = 0
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for group, label in output[state]:
+                yield index, group, label
+
+    def count(self, text: str) -> Dict[str, Dict[str, int]]:
+        """
+        Count keyword hits for every label of every group in a single scan.
+        Returns: {group: {label: hits}} with every registered label present (0 if unseen)
+        """
+        counts: Dict[str, Dict[str, int]] = {}
+        for group, labels in self.groups.items():
+            counts[group] = {label: 0 for label in labels}
+        if not text:
+            return counts
+        for _, group, label in self.iter_matches(text):
+            counts[group][label] += 1
+        return counts
+
+
+def score_distribution(counts: Dict[str, int], default_label: str) -> Dict[str, object]:
+    """
+    Turn raw hit counts into a normalized distribution plus the top label.
+    Ties are broken by the insertion order of counts. If nothing was hit, the
+    default label is returned with an all-zero distribution.
+    """
+    total = sum(counts.values())
+    if total == 0:
+        return {'label': default_label, 'scores': {label: 0.0 for label in counts}}
+    scores = {label: hits / total for label, hits in counts.items()}
+    top_label = max(counts, key=lambda label: counts[label])
+    return {'label': top_label, 'scores': scores}
+
+
+
+def expand_keyword_pattern(pattern: str) -> List[str]:
+    r"""
+    List the literal strings matched by a simple keyword alternation regex, e.x.
+    r'\b(?:node\.?js|sql\s+server|c\+\+)\b' -> ['node.js', 'nodejs', 'sql server', 'c++'].
+    Supports the escapes used by the skill patterns (\., \.?, \+, \s+); alternatives
+    using any other regex syntax are skipped.
+    """
+    body = pattern.replace(r'\b', '')
+    if body.startswith('(?:') and body.endswith(')'):
+        body = body[3:-1]
+    keywords: List[str] = []
+    for alternative in body.split('|'):
+        variants = ['']
+        position = 0
+        supported = True
+        while position < len(alternative):
+            token = alternative[position:position + 3]
+            if token == r'\.?':
+                variants = [variant + suffix for variant in variants for suffix in ('.', '')]
+                position += 3
+            elif token == r'\s+':
+                variants = [variant + ' ' for variant in variants]
+                position += 3
+            elif alternative[position] == '\\' and position + 1 < len(alternative) \
+                    and alternative[position + 1] in '.+#/-':
+                variants = [variant + alternative[position + 1] for variant in variants]
+                position += 2
+            elif alternative[position] in '\\()[]{}?*+^$.':
+                supported = False
+                break
+            else:
+                variants = [variant + alternative[position] for variant in variants]
+                position += 1
+        if supported:
+            keywords.extend(variant for variant in variants if variant)
+    return keywords
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps default= for NumPy scalars (e.x. float32 scores): plain Python numbers."""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
@@ -0,0 +1,64 @@
+#This file, test_embedding_batcher.py, tests embedding_batcher.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_database/test_embedding_batcher.py
+import sys
+sys.path.append('.')
+import asyncio
+import threading
+import numpy as np
+from src.database.embedding_batcher import EmbeddingBatcher
+from src.database.vector_store import VectorStore
+
+def fake_encode(texts):
+    return np.array([[len(text), i] for i, text in enumerate(texts)], dtype=np.float32)
+
+def test_concurrent_requests_are_merged() -> None:
+    batcher = EmbeddingBatcher(fake_encode, max_batch_size=1000, max_wait_ms=200)
+    results = {}
+    barrier = threading.Barrier(8)
+    def worker(n):
+        barrier.wait()
+        results[n] = batcher.encode(["x" * n, "y" * n])
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(1, 9)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    for n, embeddings in results.items():
+        #every caller gets its own rows back, in order
+        assert embeddings.shape == (2, 2)
+        assert list(embeddings[:, 0]) == [n, n]
+    stats = batcher.get_stats()
+    assert stats['requests'] == 8 and stats['texts'] == 16
+    assert stats['batches'] < 8
+    assert stats['max_wait_ms'] == 200
+    batcher.close()
+
+def test_batch_size_limit_and_async() -> None:
+    batcher = EmbeddingBatcher(fake_encode, max_batch_size=2, max_wait_ms=50)
+    async def main():
+        return await asyncio.gather(*(batcher.encode_async([str(i), str(i)]) for i in range(4)))
+    results = asyncio.run(main())
+    assert [len(result) for result in results] == [2, 2, 2, 2]
+    assert batcher.get_stats()['batches'] == 4
+    batcher.configure(max_batch_size=8)
+    assert batcher.get_stats()['max_batch_size'] == 8
+    batcher.close()
+
+def test_errors_reach_every_caller() -> None:
+    def broken(texts):
+        raise ValueError("model exploded")
+    batcher = EmbeddingBatcher(broken, max_wait_ms=1)
+    try:
+        batcher.encode(["a"])
+        assert False, "expected an exception"
+    except ValueError:
+        pass
+    assert batcher.get_stats()['errors'] == 1
+    batcher.close()
+
+def test_vector_store_batches_cache_misses() -> None:
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None, batching=True, max_batch_wait_ms=20)
+    embeddings = store.generate_embeddings(["python", "docker"])
+    assert embeddings.shape == (2, 384)
+    store.generate_embeddings(["python"]) #cache hit: never queued
+    assert store.get_metrics()['batching']['requests'] == 1
+    store.batcher.close()
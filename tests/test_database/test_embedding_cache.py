@@ -0,0 +1,65 @@
+#This file, test_embedding_cache.py, tests embedding_cache.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_database/test_embedding_cache.py
+import sys
+sys.path.append('.')
+import numpy as np
+from src.database.embedding_cache import EmbeddingCache
+
+def test_lookup_reports_hits_and_misses() -> None:
+    cache = EmbeddingCache("test-model", max_memory_items=10)
+    found, missing = cache.lookup(["python", "docker"])
+    assert found == {} and missing == [0, 1]
+    cache.store(["python", "docker"], np.eye(2, 4, dtype=np.float32))
+    #normalized text ("  python ") shares the same key
+    found, missing = cache.lookup(["  python ", "kubernetes"])
+    assert missing == [1]
+    assert np.allclose(found[0], [1, 0, 0, 0])
+    stats = cache.get_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 3
+
+def test_lru_is_bounded() -> None:
+    cache = EmbeddingCache("test-model", max_memory_items=2)
+    cache.store(["a", "b", "c"], np.ones((3, 4), dtype=np.float32))
+    assert cache.get_stats()['memory_items'] == 2
+    _, missing = cache.lookup(["a", "c"])
+    assert missing == [0] #"a" was evicted first
+
+def test_persistent_store_survives_reopen(tmp_path) -> None:
+    vectors = np.arange(12, dtype=np.float32).reshape(3, 4)
+    cache = EmbeddingCache("test-model", cache_dir=str(tmp_path))
+    cache.store(["sql", "aws", "git"], vectors)
+    reopened = EmbeddingCache("test-model", cache_dir=str(tmp_path), max_memory_items=0)
+    found, missing = reopened.lookup(["aws", "rust"])
+    assert missing == [1]
+    assert np.allclose(found[0], vectors[1])
+    assert reopened.get_stats()['disk_hits'] == 1
+    #a different model never sees these vectors
+    other = EmbeddingCache("other-model", cache_dir=str(tmp_path))
+    assert other.lookup(["aws"])[1] == [0]
+
+def _write_vectors(cache_dir: str, worker: int) -> None:
+    cache = EmbeddingCache("test-model", cache_dir=cache_dir, max_memory_items=0)
+    for number in range(50):
+        #one store call per text interleaves the two writers' appends
+        cache.store([f"text {worker} {number}"], np.full((1, 4), worker * 100 + number, dtype=np.float32))
+
+def test_concurrent_writer_processes_share_one_store(tmp_path) -> None:
+    import multiprocessing
+    cache_dir = str(tmp_path)
+    reader = EmbeddingCache("test-model", cache_dir=cache_dir, max_memory_items=0)
+    context = multiprocessing.get_context('fork')
+    writers = [context.Process(target=_write_vectors, args=(cache_dir, worker)) for worker in (1, 2)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+    texts = [f"text {worker} {number}" for worker in (1, 2) for number in range(50)]
+    #the reader opened the store before the writes and picks them up on a miss
+    for cache in (reader, EmbeddingCache("test-model", cache_dir=cache_dir)):
+        found, missing = cache.lookup(texts)
+        assert missing == []
+        assert all(found[position][0] == float(int(text.split()[1]) * 100 + int(text.split()[2]))
+                   for position, text in enumerate(texts))
+    assert cache.get_stats()['disk_items'] == 100
@@ -0,0 +1,55 @@
+#This file, test_job_analyzer.py, tests job_analyzer.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_database/test_job_analyzer.py
+import sys
+sys.path.append('.')
+from src.database.job_analyzer import JobAnalyzer
+from src.utils.helpers import KeywordAutomaton
+
+SAMPLE_JOB = (
+    "Job Title: Senior Backend Engineer\n"
+    "We are a fintech company building trading and investment software for banks. "
+    "Requirements: 5+ years of experience with python, postgresql and aws. "
+    "You will lead a team of engineers. Preferred skills: kubernetes, docker."
+)
+
+def test_keyword_automaton_counts_overlapping_matches() -> None:
+    automaton = KeywordAutomaton({
+        'group': {'a': ['he', 'hers'], 'b': ['she', 'his']}
+    })
+    counts = automaton.count("ushers and his")
+    #'ushers' contains 'she', 'he' and 'hers'; 'his' appears once
+    assert counts == {'group': {'a': 2, 'b': 2}}
+    assert automaton.count("") == {'group': {'a': 0, 'b': 0}}
+
+def test_industry_uses_most_hits_instead_of_first_match() -> None:
+    analyzer = JobAnalyzer()
+    text = analyzer._clean_job_text(SAMPLE_JOB)
+    industry = analyzer._extract_industry(text)
+    #'software' (technology) appears, but finance keywords dominate
+    assert industry['label'] == 'finance'
+    assert industry['scores']['finance'] > industry['scores']['technology'] > 0
+    assert abs(sum(industry['scores'].values()) - 1.0) < 1e-9
+
+def test_experience_level_scores() -> None:
+    analyzer = JobAnalyzer()
+    text = analyzer._clean_job_text(SAMPLE_JOB)
+    experience = analyzer._extract_experience_requirements(text)
+    assert experience['years'] == 5
+    assert experience['level'] == 'senior'
+    assert set(experience['level_scores']) == {'entry', 'mid', 'senior', 'executive'}
+
+def test_defaults_when_no_keywords_found() -> None:
+    analyzer = JobAnalyzer()
+    assert analyzer._extract_industry("nothing relevant here")['label'] == 'technology'
+    assert analyzer._extract_experience_requirements("nothing relevant here")['level'] == 'unknown'
+
+def test_analyze_job_description_attaches_distributions() -> None:
+    analyzer = JobAnalyzer()
+    requirements = analyzer.analyze_job_description(SAMPLE_JOB)
+    assert requirements.industry == 'finance'
+    assert requirements.experience_level == 'senior'
+    assert requirements.industry_scores['finance'] > 0
+    assert requirements.experience_level_scores['senior'] > 0
+    summary = analyzer.get_requirements_summary(requirements)
+    assert 'Industry: Finance' in summary and 'Experience Level: Senior' in summary
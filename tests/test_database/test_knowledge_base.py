@@ -0,0 +1,138 @@
+#This file, test_knowledge_base.py, tests knowledge_base.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_database/test_knowledge_base.py
+import sys
+sys.path.append('.')
+import math
+import pytest
+import numpy as np
+from src.database.knowledge_base import (BM25Index, KnowledgeBase, StaleSnapshotError, load_documents,
+                                         reciprocal_rank_fusion, tokenize)
+from src.database.vector_store import VectorStore
+
+DOCUMENTS = [
+    {'id': 'a', 'text': "Quantify impact with numbers and percentages"},
+    {'id': 'b', 'text': "Mirror keywords from the job description for the ATS"},
+    {'id': 'c', 'text': "ATS keywords: ATS filters match keywords"},
+    {'id': 'd', 'text': "Start bullets with action verbs"}
+]
+
+def test_bm25_matches_reference_formula() -> None:
+    texts = [document['text'] for document in DOCUMENTS]
+    index = BM25Index.build(texts)
+    scores = index.scores("ats keywords")
+    tokenized = [tokenize(text) for text in texts]
+    average_length = sum(len(tokens) for tokens in tokenized) / len(tokenized)
+    for doc_id, tokens in enumerate(tokenized):
+        expected = 0.0
+        for term in ['ats', 'keywords']:
+            df = sum(term in other for other in tokenized)
+            tf = tokens.count(term)
+            idf = math.log(1 + (len(texts) - df + 0.5) / (df + 0.5))
+            expected += idf * tf * 2.5 / (tf + 1.5 * (0.25 + 0.75 * len(tokens) / average_length))
+        assert abs(scores[doc_id] - expected) < 1e-5
+    assert scores[2] > scores[1] > 0 and scores[0] == 0
+
+def test_reciprocal_rank_fusion() -> None:
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1]], rrf_k=60)
+    assert abs(fused[1] - (1 / 61 + 1 / 62)) < 1e-12
+    assert abs(fused[3] - (1 / 63 + 1 / 61)) < 1e-12
+    assert fused[1] > fused[3] > fused[2]
+
+def test_lexical_search_never_loads_the_model() -> None:
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    kb = KnowledgeBase(DOCUMENTS, vector_store=store)
+    results = kb.search("ATS keywords", k=2, mode='lexical')
+    assert [result['id'] for result in results] == ['c', 'b']
+    assert store._embedding_model is None and kb.embeddings is None
+
+def test_hybrid_search_and_latency_budget() -> None:
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    kb = KnowledgeBase(DOCUMENTS, vector_store=store)
+    #cold model: a budgeted query falls back to the lexical ranking
+    results = kb.search("action verbs for bullets", k=2, budget_ms=1000)
+    assert kb.last_query_stats['degraded'] and store._embedding_model is None
+    assert results[0]['id'] == 'd' and results[0]['dense_rank'] is None
+    kb.warm_up()
+    results = kb.search("action verbs for bullets", k=2, budget_ms=10000)
+    assert not kb.last_query_stats['degraded'] and kb.last_query_stats['used'] == ['dense', 'lexical']
+    assert results[0]['id'] == 'd' and results[0]['dense_rank'] == 1
+    #a budget the dense path cannot fit in
+    kb.search("action verbs", budget_ms=0.0)
+    assert kb.last_query_stats['degraded']
+    dense = kb.search("numbers and percentages", k=1, mode='dense')
+    assert dense[0]['id'] == 'a' and dense[0]['lexical_rank'] is None
+    assert np.allclose(np.linalg.norm(kb.embeddings, axis=1), 1.0, atol=1e-5)
+
+def test_default_best_practices() -> None:
+    kb = KnowledgeBase()
+    practices = kb.get_best_practices("how do I get past the ATS keyword filter", k=2, mode='lexical')
+    assert len(practices) == 2 and any('ATS' in practice for practice in practices)
+
+def test_snapshot_round_trip_and_staleness(tmp_path) -> None:
+    source = tmp_path / 'source'
+    source.mkdir()
+    (source / 'ats.md').write_text("Mirror keywords from the job description. " * 30)
+    (source / 'verbs.txt').write_text("Start bullets with action verbs.")
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    documents = load_documents(str(source))
+    built = KnowledgeBase.from_documents(documents, store, max_tokens=32)
+    assert len(built) > 2 and built.documents[0]['id'] == 'ats#0'
+    built.save_snapshot(str(tmp_path / 'snapshots'))
+    loaded = KnowledgeBase.load_snapshot(str(tmp_path / 'snapshots'), store, documents, max_tokens=32)
+    assert isinstance(loaded.embeddings, np.memmap) and isinstance(loaded.bm25.posting_docs, np.memmap)
+    assert not loaded.embeddings.flags.writeable
+    query = "action verbs for bullets"
+    assert [r['id'] for r in loaded.search(query, mode='dense')] == [r['id'] for r in built.search(query, mode='dense')]
+    assert [r['score'] for r in loaded.search(query)] == [r['score'] for r in built.search(query)]
+    #edited source, another model or a different chunk size: rejected
+    (source / 'verbs.txt').write_text("Start bullets with strong action verbs.")
+    with pytest.raises(StaleSnapshotError):
+        KnowledgeBase.load_snapshot(str(tmp_path / 'snapshots'), store, load_documents(str(source)))
+    other_store = VectorStore(model_name="hashing-64", cache_dir=None, skill_matrix_dir=None)
+    with pytest.raises(StaleSnapshotError):
+        KnowledgeBase.load_snapshot(str(tmp_path / 'snapshots'), other_store, documents)
+    with pytest.raises(StaleSnapshotError):
+        KnowledgeBase.load_snapshot(str(tmp_path / 'snapshots'), store, documents, max_tokens=64)
+    #load_or_build falls back to an in-memory build for the edited source
+    rebuilt = KnowledgeBase.load_or_build(store, str(source), str(tmp_path / 'snapshots'), max_tokens=32)
+    assert rebuilt.snapshot is None and 'strong' in rebuilt.documents[-1]['text']
+
+def assert_same_results(kb, reference, query, mode) -> None:
+    results, expected = kb.search(query, k=10, mode=mode), reference.search(query, k=10, mode=mode)
+    assert [result['id'] for result in results] == [result['id'] for result in expected]
+    assert np.allclose([result['score'] for result in results], [result['score'] for result in expected])
+
+def test_incremental_updates_match_a_rebuild() -> None:
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    kb = KnowledgeBase.from_documents(DOCUMENTS, store, max_tokens=32, max_deltas=0)
+    kb.build_dense()
+    updated = {'id': 'b', 'text': "Mirror the exact ATS keywords and the job title"}
+    added = {'id': 'e', 'text': "Keep ATS friendly formatting: no tables, no images"}
+    kb.add_documents([updated, added])
+    assert kb.delete_documents(['a']) == 1 and kb.delete_documents(['missing']) == 0
+    final = [updated, DOCUMENTS[2], DOCUMENTS[3], added]
+    reference = KnowledgeBase.from_documents(final, store, max_tokens=32)
+    stats = kb.get_stats()
+    assert stats['delta_segments'] == 1 and stats['tombstones'] == 2 and len(kb) == 4
+    for query in ["ATS keywords", "numbers and percentages", "job title formatting"]:
+        for mode in ('lexical', 'dense', 'hybrid'):
+            assert_same_results(kb, reference, query, mode)
+    kb.compact()
+    stats = kb.get_stats()
+    assert stats['delta_segments'] == 0 and stats['tombstones'] == 0 and stats['compactions'] == 1
+    assert kb.source_hash == reference.source_hash
+    for mode in ('lexical', 'dense', 'hybrid'):
+        assert_same_results(kb, reference, "ATS keywords", mode)
+
+def test_background_compaction_and_sync() -> None:
+    kb = KnowledgeBase.from_documents(DOCUMENTS, max_tokens=32, max_deltas=2)
+    assert kb.sync(DOCUMENTS) == {'changed': 0, 'removed': 0}
+    edited = [dict(DOCUMENTS[0], text="Quantify impact with revenue numbers")] + DOCUMENTS[1:3]
+    assert kb.sync(edited) == {'changed': 1, 'removed': 1}
+    kb.add_documents([{'id': 'f', 'text': "Tailor the summary to the role"}])
+    kb.compact_in_background().join()
+    stats = kb.get_stats()
+    assert stats['compactions'] == 1 and stats['delta_segments'] == 0 and stats['live_chunks'] == 4
+    assert kb.search("revenue", mode='lexical')[0]['id'] == 'a'
+    assert kb.search("action verbs", mode='lexical') == []
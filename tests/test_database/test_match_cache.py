@@ -0,0 +1,61 @@
+#This file, test_match_cache.py, tests match_cache.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_database/test_match_cache.py
+import sys
+sys.path.append('.')
+import pytest
+from src.database.job_analyzer import JobAnalyzer
+from src.database.match_cache import MatchCache, match_cache_key
+from src.database.schemas import MatchResult, ResumeJobMatch
+from src.database.vector_store import VectorStore
+
+RESUME = "Backend engineer, 6 years of Python, Django, PostgreSQL and Docker. Built REST APIs on AWS."
+JOB = "Senior Python Developer. Required: Python, Django, Kubernetes. 5+ years of experience."
+
+def make_result(score: float) -> ResumeJobMatch:
+    match = MatchResult('python', 1.0, 'python', 'required', 'exact')
+    return ResumeJobMatch(score, {'matching_skills': [match], 'skills_score': score}, {'resume_years': 6.0},
+                          ['kubernetes'], [match], ['Add Kubernetes'], 0.5)
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+def test_ttl_and_lru_eviction(backend, tmp_path) -> None:
+    path = str(tmp_path / 'cache.sqlite')
+    cache = MatchCache(backend, path, ttl_seconds=60, max_items=2)
+    cache.put('a', make_result(0.1))
+    cache.put('b', make_result(0.2))
+    assert cache.get('a').overall_match_score == 0.1 #'a' is now the most recently used
+    cache.put('c', make_result(0.3))
+    assert cache.get('b') is None and cache.get('a') is not None and cache.get('c') is not None
+    stats = cache.get_stats()
+    assert stats['evictions'] == 1 and stats['size'] == 2 and stats['hits'] == 3
+    loaded = cache.get('c')
+    assert isinstance(loaded.matching_skills[0], MatchResult)
+    assert loaded.skills_analysis['matching_skills'][0].skill == 'python'
+    expired = MatchCache(backend, path, ttl_seconds=0, max_items=2)
+    expired.put('d', make_result(0.4))
+    assert expired.get('d') is None
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path) -> None:
+    path = str(tmp_path / 'cache.sqlite')
+    MatchCache('sqlite', path).put('key', make_result(0.7))
+    assert MatchCache('sqlite', path).get('key').overall_match_score == 0.7
+
+def test_vector_store_serves_repeated_matches_from_cache() -> None:
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    job = JobAnalyzer().analyze_job_description(JOB)
+    first = store.match_resume_to_job(RESUME, job)
+    second = store.match_resume_to_job(RESUME, job)
+    assert store.match_cache.get_stats()['hits'] == 1
+    assert second.to_dict() == first.to_dict() and second is not first
+    second.recommendations.append('changed')
+    assert 'changed' not in store.match_resume_to_job(RESUME, job).recommendations
+    #another job, another model or new thresholds are different keys
+    other_job = JobAnalyzer().analyze_job_description(JOB)
+    other_job.required_skills = other_job.required_skills + ['go']
+    assert match_cache_key(RESUME, job, 'hashing') != match_cache_key(RESUME, other_job, 'hashing')
+    assert match_cache_key(RESUME, job, 'hashing') != match_cache_key(RESUME, job, 'all-MiniLM-L6-v2')
+    store.moderate_match_threshold = 0.5
+    store.match_resume_to_job(RESUME, job)
+    assert store.match_cache.get_stats()['misses'] == 2
+    uncached = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None, match_cache_backend=None)
+    assert uncached.match_resume_to_job(RESUME, job).to_dict() == first.to_dict()
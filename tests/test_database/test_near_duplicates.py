@@ -0,0 +1,70 @@
+#This file, test_near_duplicates.py, tests near_duplicates.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_database/test_near_duplicates.py
+import sys
+sys.path.append('.')
+import random
+import numpy as np
+from src.database.near_duplicates import MinHasher, NearDuplicateIndex
+from src.database.vector_store import VectorStore
+from src.parser.text_processor import TextProcessor
+
+JOB = ("Senior Backend Engineer at Acme. Required: 5+ years of Python, Django and PostgreSQL. "
+       "Preferred: AWS, Docker and Kubernetes. You will design REST APIs, mentor junior engineers, "
+       "own services in production and work with product managers on the roadmap. We offer a "
+       "competitive salary, equity, remote work, a yearly learning budget, health insurance and "
+       "flexible hours. Our platform processes millions of payments every day for small businesses "
+       "across Europe and North America, and the team ships to production several times a day.")
+REPOST = JOB.replace("Acme.", "Acme Corp.")
+
+def random_text(generator: random.Random, words: int = 80) -> str:
+    vocabulary = [f"word{i}" for i in range(2000)]
+    return ' '.join(generator.choice(vocabulary) for _ in range(words))
+
+def test_shingles() -> None:
+    shingles = TextProcessor().get_shingles("Built REST APIs in Python", size=3)
+    assert shingles == {'built rest apis', 'rest apis python'}
+    assert TextProcessor().get_shingles("Python", size=3) == {'python'}
+
+def test_minhash_estimates_jaccard() -> None:
+    hasher = MinHasher(num_perm=256)
+    left = {f"s{i}" for i in range(100)}
+    right = {f"s{i}" for i in range(50, 150)} #jaccard 50 / 150
+    estimate = MinHasher.similarity(hasher.signature(left), hasher.signature(right))
+    assert abs(estimate - 1 / 3) < 0.1
+    assert MinHasher.similarity(hasher.signature(left), hasher.signature(set(left))) == 1.0
+
+def test_index_finds_near_duplicates_among_few_candidates() -> None:
+    generator = random.Random(0)
+    index = NearDuplicateIndex(threshold=0.8)
+    for number in range(300):
+        index.add(number, random_text(generator), value=number)
+    index.add('job', JOB, value='requirements')
+    found = index.find(REPOST)
+    assert found is not None and found[0] == 'job' and found[2] == 'requirements' and found[1] >= 0.8
+    assert index.find(random_text(generator)) is None
+    assert index.get_stats()['avg_candidates'] < 5 #LSH only compares against bucket mates
+
+def test_vector_store_reuses_work_for_near_duplicates() -> None:
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    requirements = store.analyze_job(JOB)
+    #an exact repost reuses the analysis, as a copy the caller can change
+    repost = store.analyze_job(JOB)
+    assert repost is not requirements and vars(repost) == vars(requirements)
+    repost.required_skills.append('cobol')
+    assert 'cobol' not in store.analyze_job(JOB).required_skills
+    #a near-duplicate with one changed skill and year count keeps its own values
+    posting = JOB.replace('5+ years of Python', '5+ years of experience with Python')
+    original = store.analyze_job(posting)
+    edited_posting = posting.replace('5+ years', '8+ years').replace('Django', 'Java')
+    edited = store.analyze_job(edited_posting)
+    assert edited.experience_years == 8 and original.experience_years == 5
+    assert 'java' in edited.required_skills and 'django' not in edited.required_skills
+    assert 'django' in original.required_skills
+    encoded = []
+    generate_embeddings = store.generate_embeddings
+    store.generate_embeddings = lambda texts: encoded.extend(texts) or generate_embeddings(texts)
+    embeddings = store.embed_resumes([JOB, REPOST, "A completely different resume about nursing and patient care"])
+    assert len(encoded) == 2 and np.array_equal(embeddings[0], embeddings[1])
+    assert np.array_equal(store.embed_resumes([REPOST + " "])[0], embeddings[0]) and len(encoded) == 2
+    assert store.get_metrics()['near_duplicates']['jobs']['exact_hits'] == 2
@@ -0,0 +1,97 @@
+#This file, test_quantization.py, tests quantization.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_database/test_quantization.py
+import sys
+sys.path.append('.')
+import numpy as np
+from src.database.quantization import QuantizedVectors, quantize, dequantize
+import random
+from src.database.embedding_cache import EmbeddingCache
+from src.database.vector_index import load_index
+from src.database.vector_store import VectorStore
+from src.models.embeddings import l2_normalize, top_k_per_row
+
+def make_corpus(n: int = 2000, dim: int = 64, seed: int = 0):
+    """Clustered unit vectors, so neighbours are close but not identical."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(40, dim))
+    corpus = centers[rng.integers(0, 40, size=n)] + 0.3 * rng.normal(size=(n, dim))
+    queries = centers[rng.integers(0, 40, size=20)] + 0.3 * rng.normal(size=(20, dim))
+    return l2_normalize(corpus), l2_normalize(queries)
+
+def test_round_trip_error_is_small() -> None:
+    vectors, _ = make_corpus(100)
+    for mode, tolerance in [('float16', 1e-3), ('int8', 1e-2)]:
+        codes, scales = quantize(vectors, mode)
+        assert np.abs(dequantize(codes, scales, mode) - vectors).max() < tolerance
+
+def test_compact_storage_is_smaller() -> None:
+    vectors, _ = make_corpus(1000)
+    full = QuantizedVectors(64, 'float32'); full.add(vectors)
+    half = QuantizedVectors(64, 'float16'); half.add(vectors)
+    compact = QuantizedVectors(64, 'int8'); compact.add(vectors)
+    assert half.nbytes * 2 == full.nbytes
+    assert compact.nbytes * 3.5 < full.nbytes
+
+def test_ranking_stays_stable() -> None:
+    corpus, queries = make_corpus()
+    exact = top_k_per_row(queries @ corpus.T, 10)
+    store = QuantizedVectors(64, 'int8')
+    store.add(corpus)
+    approximate = store.search(queries, k=10)
+    rescored = store.search(queries, k=10, full_precision=corpus)
+    recall = np.mean([
+        len({i for i, _ in a} & {i for i, _ in e}) / 10 for a, e in zip(approximate, exact)
+    ])
+    assert recall >= 0.9
+    #exact rescoring of the top candidates recovers the exact top-10 scores
+    for r, e in zip(rescored, exact):
+        assert np.allclose([s for _, s in r], [s for _, s in e], atol=1e-5)
+
+def test_int8_embedding_cache(tmp_path) -> None:
+    vectors, _ = make_corpus(3)
+    cache = EmbeddingCache("test-model", cache_dir=str(tmp_path), storage_dtype='int8')
+    cache.store(["a", "b", "c"], vectors)
+    reopened = EmbeddingCache("test-model", cache_dir=str(tmp_path), max_memory_items=0)
+    assert reopened.storage_dtype == 'int8'
+    found, _ = reopened.lookup(["b"])
+    assert np.abs(found[0] - vectors[1]).max() < 1e-2
+
+def test_quantized_cache_serves_one_vector_per_text(tmp_path) -> None:
+    store = VectorStore(model_name="hashing", cache_dir=str(tmp_path), cache_size=1,
+                        cache_storage_dtype='int8', skill_matrix_dir=None)
+    encoded = store.generate_embeddings(["python developer"])
+    from_memory = store.generate_embeddings(["python developer"])
+    store.generate_embeddings(["nurse"]) #evicts it from the one-item LRU
+    from_disk = store.generate_embeddings(["python developer"])
+    other_process = VectorStore(model_name="hashing", cache_dir=str(tmp_path), skill_matrix_dir=None)
+    assert np.array_equal(encoded, from_memory) and np.array_equal(encoded, from_disk)
+    assert np.array_equal(encoded, other_process.generate_embeddings(["python developer"]))
+
+def test_quantized_index_search_reranks_with_full_precision(tmp_path) -> None:
+    rng = random.Random(0)
+    #40 topics of 12 words each, so documents cluster like real resumes do
+    topics = [[f"skill{topic}x{word}" for word in range(12)] for topic in range(40)]
+    texts = [' '.join(rng.sample(rng.choice(topics), 6)) for _ in range(3000)]
+    queries = [' '.join(rng.sample(rng.choice(topics), 3)) for _ in range(20)]
+    documents = [{'id': f"doc-{i}", 'text': text} for i, text in enumerate(texts)]
+    exact = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None, index_backend='flat')
+    exact.upsert_documents(documents)
+    expected = exact.search_index(queries, k=10)
+    for backend in ('flat', 'ivf'):
+        store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None, index_backend=backend,
+                            index_storage_dtype='int8', index_dir=str(tmp_path / backend))
+        store.upsert_documents(documents)
+        assert store.index.storage_dtype == 'int8' and store.index.reranks
+        results = store.search_index(queries, k=10)
+        if backend == 'flat':
+            #the rescored scores are the exact ones, so the ranking matches exact search
+            for hits, exact_hits in zip(results, expected):
+                assert np.allclose([s for _, s in hits], [s for _, s in exact_hits], atol=1e-5)
+        recall = np.mean([len({i for i, _ in r} & {i for i, _ in e}) / 10 for r, e in zip(results, expected)])
+        assert recall >= 0.9
+        #a saved index memory-maps its float32 copy and still reranks
+        store.save_index()
+        loaded = load_index(str(tmp_path / backend))
+        assert isinstance(loaded.full_vectors, np.memmap)
+        assert loaded.search(exact.generate_embeddings(queries), k=10) == results
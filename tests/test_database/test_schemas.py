@@ -0,0 +1,67 @@
+#This file, test_schemas.py, tests schemas.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_database/test_schemas.py
+import sys
+sys.path.append('.')
+from src.database.job_analyzer import JobRequirements
+from src.database.schemas import BatchMatchBuilder, BatchMatchResults, ResumeJobMatch
+from src.database.vector_store import VectorStore
+
+def make_job(title, required, preferred, years, level): 
+    return JobRequirements(
+        required_skills=required, preferred_skills=preferred, experience_years=years,
+        experience_level=level, education_requirements=[], certifications=[], responsibilities=[],
+        company_info={}, salary_range=None, job_title=title, industry='technology'
+    )
+
+def assert_same_match(view: ResumeJobMatch, match: ResumeJobMatch) -> None: 
+    assert abs(view.overall_match_score - match.overall_match_score) < 1e-6
+    assert abs(view.ats_score - match.ats_score) < 1e-6
+    assert view.missing_skills == match.missing_skills
+    assert view.recommendations == match.recommendations
+    assert [(m.skill, m.resume_text, m.job_requirement, m.match_type) for m in view.matching_skills] == \
+        [(m.skill, m.resume_text, m.job_requirement, m.match_type) for m in match.matching_skills]
+    for key, value in match.skills_analysis.items(): 
+        if key != 'matching_skills': 
+            assert view.skills_analysis[key] == value or abs(view.skills_analysis[key] - value) < 1e-6
+    assert view.experience_match.keys() == match.experience_match.keys()
+    for key, value in match.experience_match.items(): 
+        assert view.experience_match[key] == value or abs(view.experience_match[key] - value) < 1e-6
+
+def test_batch_results_round_trip(tmp_path) -> None: 
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    store.moderate_match_threshold = 0.3 #include semantic/partial matches
+    jobs = [
+        make_job('Backend Engineer', ['python', 'postgresql', 'aws'], ['docker'], 5, 'senior'),
+        make_job('Frontend Developer', ['javascript', 'react'], [], None, 'not specified')
+    ]
+    resumes = [
+        "Senior engineer 2015 - 2023: python, postgres, mysql and docker.",
+        "Junior developer, 1 year of javascript.",
+        ""
+    ]
+    results = store.match_batch(resumes, jobs)
+    #the batch is scored from the helpers directly and leaves the match cache alone
+    stats = store.match_cache.get_stats()
+    assert stats['hits'] + stats['misses'] == 0 and stats['size'] == 0
+    assert len(results) == 6
+    assert list(results.columns['resume_index']) == [0, 0, 1, 1, 2, 2]
+    for row, (i, j) in enumerate((i, j) for i in range(3) for j in range(2)): 
+        assert_same_match(results[row], store.match_resume_to_job(resumes[i], jobs[j]))
+    subset = store.match_batch(resumes, jobs, pairs=[(2, 1), (0, 1)])
+    assert list(subset.columns['resume_index']) == [2, 0] and list(subset.columns['job_index']) == [1, 1]
+    assert_same_match(subset[1], results[1])
+    #compact binary round trip
+    path = str(tmp_path / 'batch.npz')
+    results.save(path)
+    loaded = BatchMatchResults.load(path)
+    assert loaded.strings == results.strings
+    for row in range(len(results)): 
+        assert_same_match(loaded[row], results[row])
+
+def test_failed_matches_are_kept_as_empty_rows() -> None: 
+    builder = BatchMatchBuilder()
+    builder.add(ResumeJobMatch(0.0, {}, {}, [], [], [], 0.0), 3, 4)
+    results = builder.build()
+    assert not results.columns['valid'][0] and results[0].skills_analysis == {}
+    assert BatchMatchResults.from_bytes(results.to_bytes())[0].overall_match_score == 0.0
@@ -0,0 +1,19 @@
+#This file, test_sharded_embedding.py, tests sharded_embedding.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_database/test_sharded_embedding.py
+import sys
+sys.path.append('.')
+import numpy as np
+from src.database.sharded_embedding import embed_sharded
+from src.models.embeddings import HashingEncoder
+
+def test_sharded_output_matches_single_process(tmp_path) -> None: 
+    texts = [f"engineer {i} with python and {'aws' if i % 2 else 'gcp'}" for i in range(250)]
+    stats = {}
+    output = embed_sharded(
+        texts, "hashing-64", str(tmp_path / 'embeddings.npy'), workers=2, 
+        threads_per_worker=1, shard_size=32, stats=stats
+    )
+    assert isinstance(output, np.memmap) and output.shape == (250, 64)
+    assert np.allclose(output, HashingEncoder(dim=64).encode(texts))
+    assert stats['shards'] == 8 and stats['workers'] == 2
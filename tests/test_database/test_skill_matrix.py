@@ -0,0 +1,47 @@
+#This file, test_skill_matrix.py, tests skill_matrix.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_database/test_skill_matrix.py
+import sys
+sys.path.append('.')
+import numpy as np
+from src.database.skill_matrix import SkillMatrix
+from src.database.vector_store import VectorStore
+from src.models.embeddings import HashingEncoder
+
+class CountingEncoder(HashingEncoder): 
+    """Hashing encoder that records how many texts it encoded."""
+    def __init__(self): 
+        super().__init__(dim=64)
+        self.encoded = 0
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs): 
+        self.encoded += len(texts)
+        return super().encode(texts)
+
+def test_build_load_and_rebuild_on_change(tmp_path) -> None: 
+    encoder = CountingEncoder()
+    skills = ['python', 'PostgreSQL', 'postgres', 'sql  server']
+    built = SkillMatrix.load_or_build(str(tmp_path), skills, encoder.encode, 'hashing-64')
+    assert encoder.encoded == 4 and 'sql server' in built and 'postgresql' in built
+    #same model and taxonomy: memory-mapped load, no encoding
+    loaded = SkillMatrix.load_or_build(str(tmp_path), reversed(skills), encoder.encode, 'hashing-64')
+    assert encoder.encoded == 4 and isinstance(loaded.matrix, np.memmap)
+    similarities = loaded.similarity(['postgresql'], ['postgres', 'python'])
+    assert np.allclose(similarities, built.similarity(['postgresql'], ['postgres', 'python']))
+    assert similarities[0, 0] > similarities[0, 1]
+    #a taxonomy change or a different model triggers a rebuild
+    SkillMatrix.load_or_build(str(tmp_path), skills + ['rust'], encoder.encode, 'hashing-64')
+    assert encoder.encoded == 9
+    rebuilt = SkillMatrix.load_or_build(str(tmp_path), skills + ['rust'], encoder.encode, 'other-model')
+    assert encoder.encoded == 14 and rebuilt.model_name == 'other-model'
+
+def test_skill_similarity_needs_no_model_call_for_taxonomy_skills(tmp_path) -> None: 
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=str(tmp_path))
+    assert 'node.js' in store.skill_taxonomy() and 'sql server' in store.skill_taxonomy()
+    store.skill_matrix #build step
+    misses = store.get_cache_stats()['misses']
+    similarities = store._skill_similarity(['postgresql', 'kubernetes'], ['mysql', 'docker'])
+    assert store.get_cache_stats()['misses'] == misses
+    assert np.allclose(similarities, store.similarity_matrix(['postgresql', 'kubernetes'], ['mysql', 'docker']), atol=1e-5)
+    #skills outside the taxonomy still work (embedded once through the cache)
+    assert store._skill_similarity(['k8s'], ['kubernetes']).shape == (1, 1)
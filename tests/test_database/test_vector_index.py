@@ -0,0 +1,87 @@
+#This file, test_vector_index.py, tests vector_index.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_database/test_vector_index.py
+import sys
+sys.path.append('.')
+import numpy as np
+from src.database.vector_index import FlatIndex, IVFIndex, load_index
+from src.models.embeddings import l2_normalize
+
+def make_data(n: int = 5000, dim: int = 32, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(50, dim))
+    vectors = centers[rng.integers(0, 50, size=n)] + 0.4 * rng.normal(size=(n, dim))
+    queries = centers[rng.integers(0, 50, size=25)] + 0.4 * rng.normal(size=(25, dim))
+    ids = [f"doc-{i}" for i in range(n)]
+    return ids, l2_normalize(vectors), l2_normalize(queries)
+
+def recall(approximate, exact) -> float:
+    return float(np.mean([
+        len({i for i, _ in a} & {i for i, _ in e}) / len(e) for a, e in zip(approximate, exact)
+    ]))
+
+def test_flat_index_is_exact_and_skips_known_ids() -> None:
+    ids, vectors, queries = make_data(500)
+    index = FlatIndex()
+    index.add(ids, vectors, metadatas=[{'row': i} for i in range(500)])
+    index.add(ids[:10], vectors[:10] * 0) #same ids again: ignored
+    assert len(index) == 500
+    top = index.search(vectors[:3], k=1)
+    assert [hits[0][0] for hits in top] == ids[:3]
+    assert index.get_metadata("doc-7") == {'row': 7}
+
+def test_ivf_recall_against_exact_search() -> None:
+    ids, vectors, queries = make_data()
+    exact = FlatIndex()
+    exact.add(ids, vectors)
+    ivf = IVFIndex(nprobe=8)
+    ivf.add(ids, vectors)
+    assert ivf.is_trained
+    expected = exact.search(queries, k=10)
+    assert recall(ivf.search(queries, k=10), expected) >= 0.9
+    #probing every bucket is exact
+    assert recall(ivf.search(queries, k=10, nprobe=ivf.nlist), expected) == 1.0
+
+def test_save_and_load_round_trip(tmp_path) -> None:
+    ids, vectors, queries = make_data(3000)
+    ivf = IVFIndex(storage_dtype='float16')
+    ivf.add(ids, vectors)
+    before = ivf.search(queries, k=5)
+    ivf.save(str(tmp_path))
+    loaded = load_index(str(tmp_path))
+    assert isinstance(loaded, IVFIndex) and isinstance(loaded.codes, np.memmap)
+    assert [[i for i, _ in hits] for hits in loaded.search(queries, k=5)] == \
+        [[i for i, _ in hits] for hits in before]
+    #a memory-mapped index can be extended and saved back to the same directory
+    loaded.add(["new-doc"], queries[:1])
+    loaded.save(str(tmp_path))
+    assert load_index(str(tmp_path)).search(queries[:1], k=1)[0][0][0] == "new-doc"
+
+def test_ivf_retrains_as_the_corpus_grows() -> None:
+    ids, vectors, queries = make_data(20000)
+    ivf = IVFIndex(nprobe=8, min_train_size=2000)
+    frozen = IVFIndex(nprobe=8, min_train_size=2000, retrain_growth=None)
+    for start in range(0, 20000, 500):
+        ivf.add(ids[start:start + 500], vectors[start:start + 500])
+        frozen.add(ids[start:start + 500], vectors[start:start + 500])
+    #trained at 2000 (44 buckets), retrained at 8000 (89); 4x growth keeps lists ~sqrt(n)
+    assert frozen.nlist == 44 and ivf.nlist == 89 and ivf.trained_size == 8000
+    assert len(ivf) / ivf.nlist < 0.6 * len(frozen) / frozen.nlist #shorter lists to scan per probe
+    exact = FlatIndex()
+    exact.add(ids, vectors)
+    assert recall(ivf.search(queries, k=10), exact.search(queries, k=10)) >= 0.9
+    frozen.rebuild()
+    assert frozen.nlist == int(np.sqrt(20000)) and frozen.trained_size == 20000
+
+def test_delete_removes_rows_from_flat_and_ivf() -> None:
+    ids, vectors, queries = make_data(3000)
+    for index in (FlatIndex(), IVFIndex(storage_dtype='int8')):
+        index.add(ids, vectors, metadatas=[{'row': i} for i in range(3000)])
+        index.delete(ids[:3] + ['unknown'])
+        assert len(index) == 2997 and index.contains(ids[:4]) == [False, False, False, True]
+        assert index.get_metadata(ids[0]) is None and index.find_ids({'row': 3}) == [ids[3]]
+        assert [hits[0][0] for hits in index.search(vectors[:4], k=1)][3] == ids[3]
+        assert ids[0] not in {item_id for hits in index.search(vectors[:3], k=5) for item_id, _ in hits}
+        #a deleted id can be added again with a new vector
+        index.add(ids[:1], vectors[5:6])
+        assert index.search(vectors[5:6], k=2)[0][0][0] in (ids[0], ids[5])
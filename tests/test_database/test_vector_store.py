@@ -0,0 +1,246 @@
+#This file, test_vector_store.py, tests vector_store.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_database/test_vector_store.py
+#note: these tests use a tiny deterministic stand-in for the sentence transformer, 
+#so they run without downloading all-MiniLM-L6-v2
+import sys
+sys.path.append('.')
+import numpy as np
+from src.database.vector_store import VectorStore, get_vector_store
+
+class CountingModel: 
+    """Deterministic fake encoder that records how many texts it encoded."""
+    def __init__(self): 
+        self.encoded_texts = []
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs): 
+        self.encoded_texts.extend(texts)
+        vectors = np.zeros((len(texts), 8), dtype=np.float32)
+        for row, text in enumerate(texts): 
+            for char in text: 
+                vectors[row, ord(char) % 8] += 1.0
+        return vectors
+
+def make_store() -> VectorStore: 
+    store = VectorStore(cache_dir=None)
+    store._embedding_model = CountingModel()
+    return store
+
+def test_construction_is_lazy() -> None: 
+    store = VectorStore(cache_dir=None)
+    assert store._embedding_model is None
+    assert store._chroma_client is None
+    assert store.get_metrics()['model_loaded'] is False
+
+def test_cache_misses_are_encoded_once() -> None: 
+    store = make_store()
+    store.generate_embeddings(["python", "docker", "python"])
+    store.generate_embeddings(["docker", "sql"])
+    assert store.embedding_model.encoded_texts == ["python", "docker", "sql"]
+    stats = store.get_cache_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 4
+    assert store.get_metrics()['time_to_first_request_seconds'] is not None
+
+def test_similarity_matrix_and_wrapper_agree() -> None: 
+    store = make_store()
+    left = ["python developer", "aws"]
+    right = ["python", "amazon web services", "aws"]
+    matrix = store.similarity_matrix(left, right)
+    assert matrix.shape == (2, 3)
+    assert abs(store.calculate_similarity("aws", "python") - matrix[1, 0]) < 1e-6
+    assert store.top_k_similar(left, right, k=1)[1][0][0] == 2
+    assert store.similarity_matrix([], right).shape == (0, 3)
+
+def test_get_vector_store_is_a_singleton() -> None: 
+    first = get_vector_store("singleton-test-model", cache_dir=None)
+    assert get_vector_store("singleton-test-model") is first
+
+def test_in_process_index_backend(tmp_path) -> None: 
+    store = VectorStore(cache_dir=None, index_backend='flat', index_dir=str(tmp_path))
+    store._embedding_model = CountingModel()
+    texts = ["python developer", "registered nurse", "sql analyst"]
+    store.index.add([f"id-{i}" for i in range(3)], store.generate_embeddings(texts))
+    assert store.search_index(["nurse"], k=1)[0][0][0] == "id-1"
+    store.save_index()
+    reloaded = VectorStore(cache_dir=None, index_backend='flat', index_dir=str(tmp_path))
+    assert len(reloaded.index) == 3
+    assert reloaded._chroma_client is None
+
+def test_hashing_model_name_needs_no_torch() -> None: 
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    matrix = store.similarity_matrix(["python developer"], ["python engineer", "nurse"])
+    assert matrix[0, 0] > matrix[0, 1]
+    assert store.embedding_model.dim == 384
+    assert 'torch' not in sys.modules
+
+def test_bulk_upsert_is_idempotent() -> None: 
+    from src.database.job_analyzer import JobAnalyzer
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None, index_backend='flat')
+    sections = {
+        'skills': "Python, SQL, Docker, Kubernetes",
+        'experience': "Backend engineer at Acme building data pipelines"
+    }
+    first = store.upsert_resume_sections(sections, 'r1', chunk_size=1)
+    assert first['inserted'] == 2 and first['chunks'] == 2
+    again = store.upsert_resume_sections(sections, 'r1')
+    assert again['inserted'] == 0 and again['skipped'] == 2
+    assert store.get_cache_stats()['misses'] == 2 #unchanged items are never re-encoded
+    job = JobAnalyzer().analyze_job_description(
+        "Job title: Data Engineer. Requirements: experience with python, sql and aws."
+    )
+    job_stats = store.upsert_job_requirements(job, 'j1')
+    assert job_stats['inserted'] >= 3
+    assert store.upsert_job_requirements(job, 'j1')['inserted'] == 0
+    hit_id = store.search_index(["kubernetes docker"], k=1)[0][0][0]
+    assert store.index.get_metadata(hit_id)['section'] == 'skills'
+
+def test_upsert_replaces_edited_items() -> None: 
+    from src.database.job_analyzer import JobAnalyzer
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None, index_backend='flat')
+    sections = {'skills': "Python, SQL", 'experience': "Backend engineer at Acme", 'education': "B.S. Physics"}
+    store.upsert_resume_sections(sections, 'r1')
+    store.upsert_resume_sections(sections, 'r2')
+    stats = store.upsert_resume_sections({**sections, 'skills': "Java, Go"}, 'r1')
+    assert (stats['inserted'], stats['updated'], stats['skipped']) == (0, 1, 2)
+    #still exactly one skills row for r1, holding the new text; r2 is untouched
+    skills_rows = store.index.find_ids({'resume_id': 'r1', 'section': 'skills'})
+    assert len(store.index) == 6 and len(skills_rows) == 1
+    hits = dict(store.search_index(["Python, SQL"], k=6)[0])
+    assert hits[skills_rows[0]] < 0.99
+    assert hits[store.make_item_id('resume_section', 'skills', 'r2')] > 0.99
+    #a section that is gone is deleted
+    assert store.upsert_resume_sections({'skills': "Java, Go"}, 'r1')['deleted'] == 2
+    assert len(store.index.find_ids({'resume_id': 'r1'})) == 1
+    #a job whose skills changed keeps only its current items
+    for skills in ("python and sql", "python and java"): 
+        job = JobAnalyzer().analyze_job_description(f"Requirements: experience with {skills}.")
+        store.upsert_job_requirements(job, 'j1')
+    skill_ids = set(store.index.find_ids({'job_id': 'j1', 'field': 'required_skills'}))
+    assert skill_ids == {store.make_item_id('job_requirement', 'required_skills', 'j1', skill) 
+                         for skill in ('python', 'java')}
+
+def test_rank_resumes_agrees_with_single_pair_matching() -> None: 
+    from src.database.job_analyzer import JobRequirements
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    job = JobRequirements(
+        required_skills=['python', 'aws', 'postgresql', 'terraform'], preferred_skills=['docker'],
+        experience_years=5, experience_level='senior', education_requirements=[], 
+        certifications=[], responsibilities=['build backend services'], company_info={}, 
+        salary_range=None, job_title='Backend Engineer', industry='technology'
+    )
+    resumes = [
+        "Senior backend engineer 2014 - 2024. Python, AWS, PostgreSQL, Terraform and Docker.",
+        "Junior web developer, 1 year of experience with javascript and react.",
+        "Data scientist with 6 years of python, sql and machine learning on gcp.",
+        "Backend developer, 3 years of java, spring and mysql. Some docker.",
+        "Cloud engineer: terraform, aws, kubernetes, docker. 7 years experience."
+    ]
+    expected = [store.match_resume_to_job(text, job).overall_match_score for text in resumes]
+    corpus = store.prepare_resume_corpus(resumes, ids=[f"r{i}" for i in range(5)])
+    ranked = store.rank_resumes(job, corpus, k=3, batch_size=2)
+    assert [entry['resume_id'] for entry in ranked] == \
+        [f"r{i}" for i in np.argsort(expected)[::-1][:3]]
+    for entry in ranked: 
+        assert abs(entry['overall_match_score'] - expected[int(entry['resume_id'][1:])]) < 1e-5
+    #streaming plain texts gives the same ranking (ids are positions)
+    streamed = store.rank_resumes(job, iter(resumes), k=3, batch_size=2)
+    assert [entry['resume_id'] for entry in streamed] == [int(entry['resume_id'][1:]) for entry in ranked]
+
+def test_recommend_jobs_agrees_with_single_pair_matching() -> None: 
+    from src.database.job_analyzer import JobRequirements
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    store.moderate_match_threshold = 0.3 #low enough that some skills match only semantically
+    def make_job(title, required, preferred, years, level): 
+        return JobRequirements(
+            required_skills=required, preferred_skills=preferred, experience_years=years, 
+            experience_level=level, education_requirements=[], certifications=[], 
+            responsibilities=[], company_info={}, salary_range=None, job_title=title, 
+            industry='technology'
+        )
+    jobs = [
+        make_job('Backend Engineer', ['python', 'postgresql', 'aws'], ['docker'], 5, 'senior'),
+        make_job('Frontend Developer', ['javascript', 'react', 'css'], [], 2, 'mid'),
+        make_job('Data Engineer', ['python', 'sql', 'spark'], ['aws', 'python'], None, 'not specified'),
+        make_job('Platform Engineer', ['kubernetes', 'terraform'], ['go'], 7, 'senior'),
+        make_job('Intern', [], [], None, 'entry')
+    ]
+    resume = "Senior engineer since 2016: python, postgres, mysql, aws and docker. Some react."
+    index = store.build_job_index(jobs, ids=['be', 'fe', 'de', 'pe', 'in'])
+    expected = {job_id: store.match_resume_to_job(resume, job).overall_match_score 
+                for job_id, job in zip(index.ids, jobs)}
+    recommended = store.recommend_jobs(resume, index, k=3)
+    assert [entry['job_id'] for entry in recommended] == \
+        sorted(expected, key=expected.get, reverse=True)[:3]
+    for entry in recommended: 
+        assert abs(entry['overall_match_score'] - expected[entry['job_id']]) < 1e-5
+        assert abs(entry['match'].overall_match_score - entry['overall_match_score']) < 1e-5
+
+def test_cascade_bounds_ranking_quality_loss() -> None: 
+    #evaluation: the lexical stage may drop resumes before embedding, but the top-k it 
+    #returns must stay close to the full (embed everything) ranking
+    import random
+    from src.database.job_analyzer import JobRequirements
+    skills = ['python', 'java', 'sql', 'aws', 'docker', 'kubernetes', 'react', 'spark', 
+              'terraform', 'pytorch', 'postgresql', 'postgres', 'redis', 'kafka', 'go', 
+              'javascript', 'azure', 'gcp', 'django', 'flask']
+    rng = random.Random(0)
+    resumes = [
+        f"{rng.choice(['Senior', 'Junior', 'Staff', ''])} engineer with {rng.randint(0, 12)} years "
+        f"of experience using {', '.join(rng.sample(skills, rng.randint(1, 6)))}." 
+        for _ in range(400)
+    ]
+    job = JobRequirements(
+        required_skills=['python', 'aws', 'postgresql', 'docker'], 
+        preferred_skills=['kubernetes', 'terraform'], experience_years=5, experience_level='senior', 
+        education_requirements=[], certifications=[], responsibilities=['build backend services'], 
+        company_info={}, salary_range=None, job_title='Backend Engineer', industry='technology'
+    )
+    full_store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    full = full_store.rank_resumes(job, resumes, k=20, batch_size=100)
+    for threshold, top_fraction in [(0.3, None), (None, 0.2)]: 
+        store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+        cascade = store.rank_resumes(
+            job, resumes, k=20, batch_size=100, 
+            lexical_threshold=threshold, lexical_top_fraction=top_fraction
+        )
+        recall = len({e['resume_id'] for e in full} & {e['resume_id'] for e in cascade}) / 20
+        score_loss = np.mean([e['overall_match_score'] for e in full]) - \
+            np.mean([e['overall_match_score'] for e in cascade])
+        assert recall >= 0.9
+        assert score_loss <= 0.01
+        stats = store.get_metrics()['cascade']
+        assert stats['candidates'] == 400 and stats['lexical_pass_rate'] <= 0.3
+        #dropped resumes were never embedded
+        assert store.get_cache_stats()['misses'] < full_store.get_cache_stats()['misses'] / 2
+
+    #the precomputed corpus path filters on skill bitsets the same way
+    corpus = full_store.prepare_resume_corpus(resumes)
+    cascade = full_store.rank_resumes(job, corpus, k=20, lexical_top_fraction=0.2)
+    assert len({e['resume_id'] for e in full} & {e['resume_id'] for e in cascade}) / 20 >= 0.9
+
+def _embed_in_child(store: VectorStore) -> None: 
+    #every lock the parent held at fork time is a fresh one here
+    assert store.generate_embeddings(["written by the child"]).shape == (1, 64)
+    assert store.batcher.get_stats()['batches'] == 2 #one in the parent, one here
+    store.match_cache.get_stats()
+    store.job_duplicates.get_stats()
+
+def test_forked_child_gets_fresh_locks_and_shares_the_disk_cache(tmp_path) -> None: 
+    import multiprocessing
+    store = VectorStore(model_name="hashing-64", cache_dir=str(tmp_path), skill_matrix_dir=None, batching=True)
+    store.generate_embeddings(["written by the parent"])
+    held = [store.embedding_cache._lock, store.match_cache._stats_lock, store.match_cache.backend._lock, 
+            store.job_duplicates._lock, store.batcher._stats_lock]
+    for lock in held: 
+        lock.acquire()
+    try: 
+        child = multiprocessing.get_context('fork').Process(target=_embed_in_child, args=(store,))
+        child.start()
+        child.join(timeout=30)
+        assert child.exitcode == 0
+    finally: 
+        for lock in held: 
+            lock.release()
+    #the child's vector went to the shared store, and the parent picks it up on a miss
+    found, missing = store.embedding_cache.lookup(["written by the child"])
+    assert missing == [] and store.get_cache_stats()['disk_hits'] == 1
@@ -0,0 +1,53 @@
+#This file, test_gradio_app.py, tests gradio_app.py (the streaming generator; gradio itself is not needed).
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_interface/test_gradio_app.py
+import sys
+sys.path.append('.')
+import fitz
+from interface.gradio_app import STAGES, analyze_resume_stream
+from src.database.knowledge_base import DEFAULT_BEST_PRACTICES, KnowledgeBase
+from src.database.vector_store import VectorStore
+
+RESUME = ("Jane Doe\nEXPERIENCE\nBackend engineer, 6 years of Python, Django and PostgreSQL. "
+          "Built REST APIs on AWS with Docker.\nSKILLS\nPython, Django, SQL, Docker")
+JOB = ("Job Title: Senior Backend Engineer\n"
+       "Requirements: 5+ years of experience with python, postgresql and kubernetes. "
+       "Preferred skills: docker.")
+
+def make_pdf(text: str) -> bytes:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text, fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def test_each_stage_is_yielded_as_it_completes(tmp_path) -> None:
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    path = tmp_path / 'resume.pdf'
+    path.write_bytes(make_pdf(RESUME))
+    knowledge_base = KnowledgeBase.from_documents(DEFAULT_BEST_PRACTICES, store)
+    states = list(analyze_resume_stream(str(path), JOB, store, knowledge_base))
+    assert [state['stage'] for state in states] == list(STAGES)
+    extraction, sections, ats, skills, recommendations = states
+    #the first update only has extraction stats, later ones add to it
+    assert extraction['extraction']['page_count'] == 1 and extraction['ats_score'] is None
+    assert sections['sections'] is not None and sections['skill_matches'] is None
+    assert 0.0 <= ats['ats_score'] <= 1.0 and ats['overall_score'] is None
+    assert ['kubernetes', 'required', 'missing', 0.0, ''] in skills['skill_matches']
+    assert skills['recommendations'] is None
+    assert ['python', 'required', 'exact', 1.0, 'python'] in skills['skill_matches']
+    assert recommendations['recommendations'] and 'Best practices' in recommendations['recommendations']
+    assert recommendations['ats_score'] == ats['ats_score'] and recommendations['error'] is None
+    assert set(recommendations['stage_seconds']) == set(STAGES)
+    #every snapshot keeps the timings it was yielded with
+    assert [list(state['stage_seconds']) for state in states] == [list(STAGES[:n]) for n in range(1, 6)]
+
+def test_stream_stops_with_an_error(tmp_path) -> None:
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    states = list(analyze_resume_stream(str(tmp_path / 'missing.pdf'), JOB, store))
+    assert [state['stage'] for state in states] == ['failed'] and 'could not open' in states[0]['status']
+    assert [state['stage'] for state in analyze_resume_stream(None, JOB, store)] == ['failed']
+    states = list(analyze_resume_stream(b'not a pdf', JOB, store))
+    assert states[-1]['stage'] == 'failed' and 'could not read the PDF' in states[-1]['status']
+    states = list(analyze_resume_stream(make_pdf(RESUME), '', store))
+    assert [state['stage'] for state in states] == ['extraction', 'sections', 'failed']
@@ -0,0 +1,43 @@
+#This file, test_ats_engine.py, tests ats_engine.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_models/test_ats_engine.py
+import sys
+sys.path.append('.')
+import numpy as np
+from src.database.job_analyzer import JobRequirements
+from src.database.vector_store import VectorStore
+from src.models.ats_engine import ATSEngine
+
+def make_job(title, required, preferred): 
+    return JobRequirements(
+        required_skills=required, preferred_skills=preferred, experience_years=None,
+        experience_level='not specified', education_requirements=[], certifications=[],
+        responsibilities=[], company_info={}, salary_range=None, job_title=title, industry='technology'
+    )
+
+def test_matches_single_pair_ats_score() -> None: 
+    jobs = [
+        make_job('Backend Engineer', ['python', 'google cloud', 'PostgreSQL'], ['docker', 'python']),
+        make_job('Frontend Developer', ['javascript', 'react', 'node.js', 'c++'], []),
+        make_job('', [], []), #no keywords and no title
+        make_job('Data Engineer', ['sql server', 'spark'], ['google cloud platform'])
+    ]
+    resumes = [
+        "Backend Engineer. Python and PostgreSQL on Google Cloud; python, docker.",
+        "Frontend developer: JavaScript, React, Node.js and some C++ and c++ again.",
+        "",
+        "Data engineer using SQL Server, Spark and Google Cloud Platform (google cloud).",
+        "Nothing relevant here at all."
+    ]
+    store = VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+    matrix = store.ats_score_matrix(resumes, jobs)
+    assert matrix.shape == (5, 4)
+    for i, resume in enumerate(resumes): 
+        for j, job in enumerate(jobs): 
+            assert abs(matrix[i, j] - store._calculate_ats_score(resume, job)) < 1e-6
+
+def test_term_counts_are_sparse() -> None: 
+    engine = ATSEngine([make_job('ML Engineer', ['python', 'pytorch'], [])])
+    counts = engine.term_counts(["python python pytorch", "java only", "ml engineer"])
+    assert list(np.diff(counts.indptr)) == [2, 0, 1]
+    assert sorted(counts.data[:2].tolist()) == [1, 2]
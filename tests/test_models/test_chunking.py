@@ -0,0 +1,41 @@
+#This file, test_chunking.py, tests chunking.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_models/test_chunking.py
+import sys
+sys.path.append('.')
+import numpy as np
+from src.models.chunking import (
+    approximate_token_count, chunk_text, encode_sections, length_sorted_batches, padded_tokens
+)
+from src.models.embeddings import HashingEncoder, l2_normalize
+
+def test_chunks_are_sentence_aligned_and_under_the_limit() -> None: 
+    text = ("Built data pipelines in Python. Led a team of five engineers!\n"
+            "• Migrated services to AWS • Cut costs by 30%. " + "word " * 50)
+    chunks = chunk_text(text, max_tokens=12)
+    assert all(approximate_token_count(chunk) <= 12 for chunk in chunks)
+    assert chunks[0] == "Built data pipelines in Python."
+    #nothing is dropped
+    assert sum(approximate_token_count(chunk) for chunk in chunks) == approximate_token_count(text) - 2
+
+def test_length_buckets_reduce_padding() -> None: 
+    lengths = [200, 5, 6, 7, 180, 4, 5, 190]
+    caller_order = [np.arange(start, min(start + 2, 8)) for start in range(0, 8, 2)]
+    assert padded_tokens(lengths, length_sorted_batches(lengths, 2)) < padded_tokens(lengths, caller_order)
+
+def test_encode_sections_pools_in_original_order() -> None: 
+    encoder = HashingEncoder(dim=64)
+    calls = []
+    def encode(texts): 
+        calls.append([approximate_token_count(text) for text in texts])
+        return encoder.encode(texts)
+    sections = ["Python developer.", "", "Long section. " * 40, "Docker and Kubernetes."]
+    stats = {}
+    vectors = encode_sections(sections, encode, max_tokens=16, batch_size=2, stats=stats)
+    assert vectors.shape == (4, 64) and not vectors[1].any()
+    #short sections fit in one chunk, so their pooled vector is just their embedding
+    assert np.allclose(vectors[0], l2_normalize(encoder.encode(["Python developer."]))[0])
+    assert np.allclose(vectors[3], l2_normalize(encoder.encode(["Docker and Kubernetes."]))[0])
+    #batches were encoded shortest first
+    assert [max(batch) for batch in calls] == sorted(max(batch) for batch in calls)
+    assert stats['sections'] == 4 and stats['chunks'] > 3 and stats['padded_tokens'] >= stats['tokens']
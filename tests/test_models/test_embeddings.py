@@ -0,0 +1,46 @@
+#This file, test_embeddings.py, tests embeddings.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_models/test_embeddings.py
+import sys
+sys.path.append('.')
+import numpy as np
+from src.models.embeddings import l2_normalize, cosine_similarity_matrix, top_k_per_row
+
+def test_cosine_matrix_matches_pairwise_cosine() -> None:
+    rng = np.random.default_rng(0)
+    left = rng.normal(size=(4, 8))
+    right = rng.normal(size=(6, 8))
+    matrix = cosine_similarity_matrix(left, right)
+    assert matrix.shape == (4, 6)
+    for i in range(4):
+        for j in range(6):
+            expected = left[i] @ right[j] / (np.linalg.norm(left[i]) * np.linalg.norm(right[j]))
+            assert abs(matrix[i, j] - expected) < 1e-5
+
+def test_zero_vectors_do_not_produce_nan() -> None:
+    normalized = l2_normalize(np.zeros((2, 3)))
+    assert not np.isnan(normalized).any()
+
+def test_top_k_per_row() -> None:
+    scores = np.array([[0.1, 0.9, 0.5], [0.7, 0.2, 0.3]])
+    top = top_k_per_row(scores, 2)
+    assert [index for index, _ in top[0]] == [1, 2]
+    assert [index for index, _ in top[1]] == [0, 2]
+    #k larger than the number of columns returns every column, sorted
+    assert [index for index, _ in top_k_per_row(scores, 10)[0]] == [1, 2, 0]
+
+def test_hashing_encoder_is_deterministic_and_normalized() -> None:
+    from src.models.embeddings import HashingEncoder, get_encoder
+    encoder = get_encoder("hashing-128")
+    assert isinstance(encoder, HashingEncoder) and encoder.dim == 128
+    first = encoder.encode(["Senior Python developer", ""])
+    second = HashingEncoder(dim=128).encode(["Senior Python developer", ""])
+    assert np.array_equal(first, second)
+    assert abs(np.linalg.norm(first[0]) - 1.0) < 1e-5
+    assert not first[1].any() #empty text -> zero vector
+
+def test_hashing_encoder_reflects_lexical_overlap() -> None:
+    from src.models.embeddings import HashingEncoder
+    vectors = HashingEncoder().encode(["python developer", "python programmer", "registered nurse"])
+    similarity = vectors @ vectors.T
+    assert similarity[0, 1] > similarity[0, 2]
@@ -0,0 +1,36 @@
+#This file, test_scoring.py, tests scoring.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_models/test_scoring.py
+import sys
+sys.path.append('.')
+import numpy as np
+from src.models.scoring import (
+    SkillBitsets, count_phrases, experience_score, match_ratio, overall_score
+)
+
+def test_formulas_agree_for_scalars_and_arrays() -> None:
+    years = np.array([0.0, 3.0, 6.0], dtype=np.float32)
+    ranks = np.array([0, 1, 2])
+    batch = experience_score(years, ranks, 5, 'senior')
+    for i in range(3):
+        assert abs(batch[i] - experience_score(float(years[i]), int(ranks[i]), 5, 'senior')) < 1e-6
+    assert experience_score(0.0, 0, None, 'not specified') == 1.0
+    assert match_ratio(0.0, 0) == 1.0 #nothing required -> fully matched
+    assert abs(overall_score(1.0, 1.0, 1.0) - 1.0) < 1e-9
+
+def test_skill_bitsets_round_trip_and_popcount() -> None:
+    bitsets = SkillBitsets(['aws', 'docker', 'python'] + [f"skill{i}" for i in range(10)])
+    skill_sets = [{'aws', 'python'}, set(), {'skill9', 'docker', 'unknown'}]
+    bits = bitsets.pack(skill_sets)
+    assert bits.shape == (3, 2)
+    unpacked = bitsets.unpack(bits)
+    assert [set(np.array(bitsets.skills)[row]) for row in unpacked] == [
+        {'aws', 'python'}, set(), {'skill9', 'docker'}
+    ]
+    mask = bitsets.mask(['python', 'skill9'])
+    assert list(SkillBitsets.popcount(bits & mask)) == [1, 0, 1]
+
+def test_count_phrases() -> None:
+    tokens = "google cloud and aws and google cloud".split()
+    counts = count_phrases(tokens, [('google', 'cloud'), ('aws',), ('azure',)])
+    assert counts == {('google', 'cloud'): 2, ('aws',): 1, ('azure',): 0}
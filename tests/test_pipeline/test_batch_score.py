@@ -0,0 +1,59 @@
+#This file, test_batch_score.py, tests batch_score.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_pipeline/test_batch_score.py
+import sys
+sys.path.append('.')
+import json
+import fitz
+from src.pipeline.batch_score import find_resumes, load_done_pairs, main
+
+RESUME = "Backend engineer, 6 years of Python, Django and PostgreSQL. Built REST APIs on AWS with Docker."
+JOBS = {
+    'python.txt': "Senior Python Developer. Required: Python, Django, Kubernetes. 5+ years of experience.",
+    'data.txt': "Data Analyst. Required: SQL, Excel and Tableau. 2+ years of experience."
+}
+
+def make_inputs(tmp_path):
+    resumes = tmp_path / 'resumes'
+    resumes.mkdir()
+    for number in range(3):
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), f"Candidate {number}. {RESUME}", fontsize=10)
+        doc.save(str(resumes / f"resume_{number}.pdf"))
+        doc.close()
+    (resumes / 'broken.pdf').write_bytes(b'not a pdf')
+    (resumes / 'notes.txt').write_text('ignored')
+    jobs = []
+    for name, text in JOBS.items():
+        (tmp_path / name).write_text(text)
+        jobs.append(str(tmp_path / name))
+    return str(resumes), jobs
+
+def read_jsonl(path):
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+def test_find_resumes(tmp_path) -> None:
+    resumes, _ = make_inputs(tmp_path)
+    assert [path.rsplit('/', 1)[1] for path in find_resumes(resumes)] == \
+        ['broken.pdf', 'resume_0.pdf', 'resume_1.pdf', 'resume_2.pdf']
+    assert len(find_resumes(str(tmp_path / '**' / 'resume_*.pdf'))) == 3
+
+def test_batch_scoring_streams_pairs_and_resumes(tmp_path, capsys) -> None:
+    resumes, jobs = make_inputs(tmp_path)
+    output = str(tmp_path / 'results.jsonl')
+    arguments = [resumes, '--jobs', *jobs, '--output', output, '--workers', '0', '--model', 'hashing', '--no-cache']
+    assert main(arguments) == 1 #broken.pdf fails
+    records = read_jsonl(output)
+    assert len(records) == 8 and {(record['resume'].rsplit('/', 1)[1], record['job']) for record in records} == \
+        {(f"{name}.pdf", job) for name in ['broken', 'resume_0', 'resume_1', 'resume_2'] for job in jobs}
+    good = [record for record in records if record['error'] is None]
+    assert len(good) == 6 and all(0.0 <= record['overall_match_score'] <= 1.0 for record in good)
+    summary = capsys.readouterr().err
+    assert 'Scored 8 resume-job pairs (4 resumes x 2 jobs)' in summary and 'extraction failed: 2' in summary
+    assert len(load_done_pairs(output)) == 6
+    #a second run only retries the failed pairs, appending to the same file
+    assert main(arguments + ['--resume-from', output]) == 1
+    records = read_jsonl(output)
+    assert len(records) == 10 and all('broken.pdf' in record['resume'] for record in records[8:])
+    assert 'Skipped 6 pairs already scored' in capsys.readouterr().err
@@ -0,0 +1,103 @@
+#This file, test_orchestrator.py, tests orchestrator.py.
+#To run this file, ensure you are in the project root:
+#python -m pytest tests/test_pipeline/test_orchestrator.py
+import sys
+sys.path.append('.')
+import multiprocessing
+import threading
+import time
+import fitz
+import pytest
+from src.database.job_analyzer import JobAnalyzer
+from src.database.vector_store import VectorStore
+from src.pipeline.orchestrator import ResumePipeline, parse_document
+
+RESUME = ("Jane Doe\njane@example.com\n\nEXPERIENCE\nBackend engineer, 6 years of Python, Django "
+          "and PostgreSQL. Built REST APIs on AWS with Docker.\n\nEDUCATION\nB.S. Computer Science\n\n"
+          "SKILLS\nPython, Django, SQL, Docker")
+JOB = "Senior Python Developer. Required: Python, Django, Kubernetes. 5+ years of experience."
+
+def make_pdf(text: str) -> bytes:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text, fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def make_store() -> VectorStore:
+    return VectorStore(model_name="hashing", cache_dir=None, skill_matrix_dir=None)
+
+def test_parse_document() -> None:
+    document = parse_document(('resume.pdf', make_pdf(RESUME)))
+    assert document['error'] is None and document['extraction']['page_count'] == 1
+    assert 'python' in document['text'].lower() and isinstance(document['sections'], dict)
+    assert 'full_text' not in document['extraction']
+    assert parse_document('missing.pdf')['error'].startswith('extraction failed')
+
+def test_pipeline_with_worker_processes(tmp_path) -> None:
+    path = tmp_path / 'resume.pdf'
+    path.write_bytes(make_pdf(RESUME))
+    job = JobAnalyzer().analyze_job_description(JOB)
+    store = make_store()
+    pipeline = ResumePipeline(store, [job], parse_workers=1)
+    inputs = [str(path), ('upload.pdf', make_pdf(RESUME)), str(tmp_path / 'missing.pdf')]
+    results = {result.name: result for result in pipeline.run(inputs)}
+    assert set(results) == {str(path), 'upload.pdf', str(tmp_path / 'missing.pdf')}
+    assert not results[str(tmp_path / 'missing.pdf')].ok
+    result = results['upload.pdf']
+    assert result.ok and result.embedding is not None and len(result.matches) == 1
+    #same numbers as chaining the classes by hand
+    expected = store.match_resume_to_job(result.text, job)
+    assert result.matches[0].to_dict() == expected.to_dict()
+    stats = pipeline.get_stats()
+    assert stats['documents'] == 3 and stats['errors'] == 1 and stats['stages']['parse']['errors'] == 1
+
+def make_slow_store() -> VectorStore:
+    store = make_store()
+    embed_resumes = store.embed_resumes
+    def slow_embed(texts):
+        time.sleep(0.02)
+        return embed_resumes(texts)
+    store.embed_resumes = slow_embed
+    return store
+
+def test_backpressure_bounds_memory() -> None:
+    store = make_slow_store()
+    pdf = make_pdf(RESUME)
+    consumed = []
+    def inputs():
+        for number in range(40):
+            consumed.append(number)
+            yield (f"resume_{number}.pdf", pdf)
+    pipeline = ResumePipeline(store, [JobAnalyzer().analyze_job_description(JOB)], parse_workers=0,
+                              queue_size=2, parse_in_flight=2, embed_batch_size=2, embed_wait_ms=1)
+    bound = 2 + 2 + 1 + 3 * 2 #parse_in_flight + embed_batch_size + match_workers + 3 * queue_size
+    results = []
+    for result in pipeline.run(inputs()):
+        time.sleep(0.01) #a slow consumer
+        assert len(consumed) - len(results) <= bound + 1
+        results.append(result)
+    assert len(results) == 40 and all(result.ok for result in results)
+    stats = pipeline.get_stats()
+    for stage in stats['stages'].values():
+        assert stage['processed'] == 40 and stage['max_queue_depth'] <= stage['queue_size']
+
+def test_stages_overlap() -> None:
+    pipeline = ResumePipeline(make_slow_store(), parse_workers=0, queue_size=4, embed_batch_size=4, embed_wait_ms=1)
+    pdf = make_pdf(RESUME)
+    assert len(pipeline.run_all((f"resume_{number}.pdf", pdf) for number in range(60))) == 60
+    stats = pipeline.get_stats()
+    #parsing went on while the model was busy: wall time is below the sum of the busy times
+    assert stats['seconds'] < stats['stages']['parse']['busy_seconds'] + stats['stages']['embed']['busy_seconds']
+
+@pytest.mark.parametrize('parse_workers', [0, 1])
+def test_closing_early_stops_every_stage(parse_workers) -> None:
+    pdf = make_pdf(RESUME)
+    pipeline = ResumePipeline(make_store(), parse_workers=parse_workers, queue_size=1)
+    results = pipeline.run((f"resume_{number}.pdf", pdf) for number in range(1000))
+    next(results)
+    results.close()
+    assert pipeline.get_stats()['stages']['parse']['processed'] < 20
+    #nothing is left running once close() returns, not even a parse that was in flight
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith('pipeline-')]
+    assert not multiprocessing.active_children()